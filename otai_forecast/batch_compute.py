@@ -0,0 +1,464 @@
+"""Vectorized simulation over many assumption draws at once.
+
+Mirrors ``compute.calculate_new_monthly_data`` / ``calculate_new_state`` with
+NumPy arrays of shape ``(n_draws,)`` so that one decision plan can be evaluated
+against a whole set of sampled assumptions in a single call.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from .models import Assumptions, MonthlyDecisions
+
+# Columns returned by ``simulate_batch``; each maps to a (months, n_draws) array.
+BATCH_COLUMNS = (
+    "cash",
+    "debt",
+    "product_value",
+    "domain_rating",
+    "free_active",
+    "pro_active",
+    "ent_active",
+    "partners_active",
+    "revenue_total",
+    "costs_ex_tax",
+    "profit_bt",
+    "tax",
+    "net_cashflow",
+    "leads_total",
+)
+
+# Mirrors the pydantic bounds that make the scalar simulation raise ValueError.
+_MAX_ABS_FINANCIAL = 1_000_000_000
+_MAX_USERS = 100_000_000
+_MAX_PARTNERS = 10_000
+_MAX_DOMAIN_RATING = 100
+
+
+def _field(draws: Sequence[Assumptions], name: str) -> np.ndarray:
+    return np.array([getattr(a, name) for a in draws], dtype=float)
+
+
+def _milestone_index(product_value: np.ndarray, thresholds: np.ndarray) -> np.ndarray:
+    return np.maximum((product_value[:, None] >= thresholds).sum(axis=1) - 1, 0)
+
+
+def _safe_ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    return np.divide(
+        numerator,
+        denominator,
+        out=np.zeros_like(numerator, dtype=float),
+        where=denominator > 0,
+    )
+
+
+def _effective_interest_rate_annual(
+    debt: np.ndarray,
+    annual_revenue_ttm: np.ndarray,
+    new_credit_draw: np.ndarray,
+    base_rate: np.ndarray,
+    max_rate: np.ndarray,
+) -> np.ndarray:
+    total_debt = debt + new_credit_draw
+    risk_ratio = _safe_ratio(total_debt, total_debt + annual_revenue_ttm)
+    rate = base_rate + (max_rate - base_rate) * risk_ratio
+    rate = np.where(annual_revenue_ttm <= 0, max_rate, rate)
+    return np.where(total_debt <= 0, 0.0, rate)
+
+
+def simulate_batch(
+    draws: Sequence[Assumptions],
+    decisions: MonthlyDecisions,
+) -> dict[str, np.ndarray]:
+    """Simulate one decision plan against every assumption draw.
+
+    All draws must share ``months`` and the number of pricing milestones.
+
+    Returns:
+        Dict mapping each name in ``BATCH_COLUMNS`` to a ``(months, n_draws)``
+        array, plus ``"valid"``: a ``(n_draws,)`` bool array that is False where
+        the scalar simulation would have raised a validation error.
+    """
+    if not draws:
+        raise ValueError("At least one assumption draw is required.")
+    months = draws[0].months
+    milestone_count = len(draws[0].pricing_milestones)
+    if any(a.months != months for a in draws):
+        raise ValueError("All assumption draws must use the same number of months.")
+    if any(len(a.pricing_milestones) != milestone_count for a in draws):
+        raise ValueError("All assumption draws must use the same pricing milestones.")
+    if len(decisions) < months:
+        raise ValueError("Not enough decisions for the simulated months.")
+
+    p = {
+        name: _field(draws, name)
+        for name in (
+            "starting_cash",
+            "cpc_base",
+            "cpc_sensitivity_factor",
+            "cpc_ref_spend",
+            "seo_users_per_eur",
+            "domain_rating_init",
+            "domain_rating_max",
+            "domain_rating_spend_sensitivity",
+            "domain_rating_reference_spend_eur",
+            "domain_rating_decay",
+            "conv_web_to_lead",
+            "conv_website_lead_to_free",
+            "conv_website_lead_to_pro",
+            "conv_website_lead_to_ent",
+            "direct_contacted_demo_conversion",
+            "direct_demo_appointment_conversion_to_free",
+            "direct_demo_appointment_conversion_to_pro",
+            "direct_demo_appointment_conversion_to_ent",
+            "conv_free_to_pro",
+            "conv_pro_to_ent",
+            "churn_free",
+            "churn_pro",
+            "churn_ent",
+            "tax_rate",
+            "sales_cost_per_new_pro",
+            "sales_cost_per_new_ent",
+            "support_cost_per_pro",
+            "support_cost_per_ent",
+            "support_subscription_fee_pct_pro",
+            "support_subscription_fee_pct_ent",
+            "support_subscription_take_rate_pro",
+            "support_subscription_take_rate_ent",
+            "partner_spend_ref",
+            "partner_product_value_ref",
+            "partner_commission_rate",
+            "partner_churn_per_month",
+            "partner_saturation_scale",
+            "partner_pro_deals_per_partner_per_month",
+            "partner_ent_deals_per_partner_per_month",
+            "operating_baseline",
+            "operating_per_user",
+            "operating_per_dev",
+            "qualified_pool_total",
+            "outreach_leads_per_1000_eur",
+            "cost_per_direct_lead",
+            "cost_per_direct_demo",
+            "debt_interest_rate_annual",
+            "debt_interest_rate_max_annual",
+            "credit_draw_factor",
+            "debt_repay_factor",
+            "min_months_cash_reserve",
+            "pv_init",
+            "pv_min",
+            "product_value_depreciation_rate",
+            "milestone_achieved_renewal_percentage",
+            "product_renewal_discount_percentage",
+            "payment_processing_rate",
+            "dev_capex_ratio",
+        )
+    }
+    thresholds = np.array(
+        [[m.product_value_min for m in a.pricing_milestones] for a in draws]
+    )
+    pro_prices = np.array([[m.pro_price for m in a.pricing_milestones] for a in draws])
+    ent_prices = np.array([[m.ent_price for m in a.pricing_milestones] for a in draws])
+
+    n = len(draws)
+    rows = np.arange(n)
+    cash = p["starting_cash"].copy()
+    debt = np.zeros(n)
+    domain_rating = p["domain_rating_init"].copy()
+    product_value = p["pv_init"].copy()
+    free_active = np.zeros(n)
+    pro_active = np.zeros(n)
+    ent_active = np.zeros(n)
+    partners_active = np.zeros(n)
+    qualified_pool = p["qualified_pool_total"].copy()
+    website_leads_prev = np.zeros(n)
+    demo_appointments_prev = np.zeros(n)
+    revenue_history = np.zeros((months, n))
+    renewed = np.zeros((n, milestone_count), dtype=bool)
+    valid = np.ones(n, dtype=bool)
+
+    out = {name: np.empty((months, n)) for name in BATCH_COLUMNS}
+
+    for t in range(months):
+        d = decisions[t]
+
+        # Product value and pricing
+        pv_after = product_value * (1.0 - p["product_value_depreciation_rate"])
+        effective_dev = np.where(
+            pv_after > 0,
+            pv_after * np.log1p(_safe_ratio(np.full(n, d.dev_budget), pv_after)),
+            d.dev_budget,
+        )
+        pv_next = np.maximum(p["pv_min"], pv_after + effective_dev)
+        milestone_current = _milestone_index(product_value, thresholds)
+        milestone_next = _milestone_index(pv_next, thresholds)
+        pro_price = pro_prices[rows, milestone_next]
+        ent_price = ent_prices[rows, milestone_next]
+
+        # Domain rating
+        dr_ref = p["domain_rating_reference_spend_eur"]
+        growth_rate = 1.0 - np.exp(
+            -p["domain_rating_spend_sensitivity"] * np.log1p(d.seo_budget / dr_ref)
+        )
+        domain_rating_next = np.clip(
+            domain_rating
+            - domain_rating * p["domain_rating_decay"]
+            + (p["domain_rating_max"] - domain_rating) * growth_rate,
+            0.0,
+            p["domain_rating_max"],
+        )
+
+        # Website traffic
+        seo_authority = np.clip(domain_rating_next / p["domain_rating_max"], 0.0, 1.0)
+        if d.ads_budget > 0:
+            cpc = p["cpc_base"] * (
+                1.0
+                + p["cpc_sensitivity_factor"]
+                * np.log1p(d.ads_budget / p["cpc_ref_spend"])
+            )
+            ads_clicks = _safe_ratio(np.full(n, d.ads_budget), cpc)
+        else:
+            ads_clicks = np.zeros(n)
+        seo_users = (
+            dr_ref
+            * np.log1p(d.seo_budget / dr_ref)
+            * p["seo_users_per_eur"]
+            * (0.4 + 1.2 * seo_authority**1.2)
+        )
+        website_users = seo_users + ads_clicks
+        website_leads = website_users * p["conv_web_to_lead"]
+
+        # Direct outreach
+        if d.outreach_budget > 0:
+            raw_leads = d.outreach_budget * p["outreach_leads_per_1000_eur"] / 1000.0
+            direct_contacted = np.where(
+                qualified_pool > 0,
+                qualified_pool
+                * (1.0 - np.exp(-_safe_ratio(raw_leads, qualified_pool))),
+                0.0,
+            )
+        else:
+            direct_contacted = np.zeros(n)
+        direct_contacted_cost = direct_contacted * p["cost_per_direct_lead"]
+        new_demo_appointments = direct_contacted * p["direct_contacted_demo_conversion"]
+        demo_cost = demo_appointments_prev * p["cost_per_direct_demo"]
+        leads_total = website_leads + direct_contacted
+
+        # Conversions
+        new_pro_from_website = website_leads_prev * p["conv_website_lead_to_pro"]
+        new_ent_from_website = website_leads_prev * p["conv_website_lead_to_ent"]
+        new_pro_from_outreach = (
+            demo_appointments_prev * p["direct_demo_appointment_conversion_to_pro"]
+        )
+        new_ent_from_outreach = (
+            demo_appointments_prev * p["direct_demo_appointment_conversion_to_ent"]
+        )
+        new_free_all = (
+            website_leads_prev * p["conv_website_lead_to_free"]
+            + demo_appointments_prev * p["direct_demo_appointment_conversion_to_free"]
+        )
+        new_pro_all = new_pro_from_website + new_pro_from_outreach
+        new_ent_all = new_ent_from_website + new_ent_from_outreach
+
+        churned_free = free_active * np.clip(p["churn_free"], 0.0, 1.0)
+        churned_pro = pro_active * np.clip(p["churn_pro"], 0.0, 1.0)
+        churned_ent = ent_active * np.clip(p["churn_ent"], 0.0, 1.0)
+
+        # Partners
+        new_partners = np.log1p(
+            np.log1p(d.partner_budget / p["partner_spend_ref"])
+            * np.log1p(product_value / p["partner_product_value_ref"])
+        ) / (1.0 + partners_active / p["partner_saturation_scale"])
+        churned_partners = partners_active * p["partner_churn_per_month"]
+        partners_next = np.maximum(0.0, partners_active - churned_partners + new_partners)
+        partner_pro_deals = partners_next * p["partner_pro_deals_per_partner_per_month"]
+        partner_ent_deals = partners_next * p["partner_ent_deals_per_partner_per_month"]
+
+        # Users after churn and upgrades
+        free_after_churn = np.maximum(0.0, free_active - churned_free)
+        pro_after_churn = np.maximum(0.0, pro_active - churned_pro)
+        ent_after_churn = np.maximum(0.0, ent_active - churned_ent)
+        upgraded_to_pro = free_after_churn * p["conv_free_to_pro"]
+        upgraded_to_ent = pro_after_churn * p["conv_pro_to_ent"]
+        pro_next = np.maximum(
+            0.0,
+            np.maximum(
+                0.0,
+                pro_after_churn + new_pro_all + partner_pro_deals + upgraded_to_pro,
+            )
+            - upgraded_to_ent,
+        )
+        ent_next = np.maximum(
+            0.0, ent_after_churn + new_ent_all + partner_ent_deals + upgraded_to_ent
+        )
+
+        # Milestone renewals
+        renew_now = (milestone_next > milestone_current) & ~renewed[rows, milestone_next]
+        renewal_multiplier = np.where(
+            renew_now,
+            p["milestone_achieved_renewal_percentage"]
+            * (1.0 - p["product_renewal_discount_percentage"]),
+            0.0,
+        )
+        monthly_renewal_fee = (
+            pro_next * pro_price + ent_next * ent_price
+        ) * renewal_multiplier
+
+        # Support subscriptions
+        pro_support = pro_next * p["support_subscription_take_rate_pro"]
+        ent_support = ent_next * p["support_subscription_take_rate_ent"]
+        support_revenue = (
+            pro_support * pro_price * p["support_subscription_fee_pct_pro"]
+            + ent_support * ent_price * p["support_subscription_fee_pct_ent"]
+        )
+        partner_commission = p["partner_commission_rate"] * (
+            partner_pro_deals * pro_price + partner_ent_deals * ent_price
+        )
+
+        new_pro = new_pro_all + upgraded_to_pro
+        new_ent = new_ent_all + upgraded_to_ent
+        sales_spend = (
+            new_pro * p["sales_cost_per_new_pro"] + new_ent * p["sales_cost_per_new_ent"]
+        )
+        support_spend = (
+            pro_support * p["support_cost_per_pro"]
+            + ent_support * p["support_cost_per_ent"]
+        )
+        annual_revenue_ttm = revenue_history[max(0, t - 12) : t].sum(axis=0)
+
+        revenue_pro = (
+            new_pro_from_website + new_pro_from_outreach + partner_pro_deals
+        ) * pro_price
+        revenue_ent = (
+            new_ent_from_website + new_ent_from_outreach + partner_ent_deals
+        ) * ent_price
+        revenue_total = revenue_pro + revenue_ent + monthly_renewal_fee + support_revenue
+
+        # Costs
+        cogs = revenue_total * p["payment_processing_rate"]
+        cost_sales_marketing = (
+            d.ads_budget
+            + d.seo_budget
+            + d.partner_budget
+            + d.outreach_budget
+            + sales_spend
+            + direct_contacted_cost
+            + demo_cost
+        )
+        operating_expenses = (
+            cost_sales_marketing
+            + d.dev_budget * (1 - p["dev_capex_ratio"])
+            + p["operating_baseline"]
+            + p["operating_per_user"] * (free_active + pro_active + ent_active)
+            + support_spend
+            + p["operating_per_dev"] * d.dev_budget
+        )
+        capital_expenditure = d.dev_budget * p["dev_capex_ratio"]
+
+        # Financing
+        profit_pre_interest = revenue_total - (
+            cogs + operating_expenses + capital_expenditure + partner_commission
+        )
+        net_cashflow_pre_financing = profit_pre_interest - (
+            np.maximum(0.0, profit_pre_interest) * p["tax_rate"]
+        )
+
+        def _after_interest(
+            credit_draw: np.ndarray,
+        ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+            rate = _effective_interest_rate_annual(
+                debt,
+                annual_revenue_ttm,
+                credit_draw,
+                p["debt_interest_rate_annual"],
+                p["debt_interest_rate_max_annual"],
+            )
+            interest = (debt + credit_draw) * (rate / 12.0)
+            costs = (
+                cogs
+                + operating_expenses
+                + capital_expenditure
+                + interest
+                + partner_commission
+            )
+            profit = revenue_total - costs
+            tax = np.maximum(0.0, profit) * p["tax_rate"]
+            return costs, profit, tax, profit - tax
+
+        new_credit_draw = np.maximum(
+            0.0, -net_cashflow_pre_financing * p["credit_draw_factor"]
+        )
+        costs_ex_tax, profit_bt, tax, net_cashflow = _after_interest(new_credit_draw)
+        required_draw = np.maximum(0.0, -(cash + net_cashflow))
+        needs_more = required_draw > new_credit_draw
+        if needs_more.any():
+            new_credit_draw = np.where(needs_more, required_draw, new_credit_draw)
+            redrawn = _after_interest(new_credit_draw)
+            costs_ex_tax, profit_bt, tax, net_cashflow = (
+                np.where(needs_more, new, old)
+                for new, old in zip(
+                    redrawn, (costs_ex_tax, profit_bt, tax, net_cashflow), strict=True
+                )
+            )
+
+        min_cash_required = (
+            np.maximum(0.0, -net_cashflow_pre_financing) * p["min_months_cash_reserve"]
+        )
+        max_payable = np.maximum(
+            0.0, cash + net_cashflow + new_credit_draw - min_cash_required
+        )
+        debt_repayment = np.minimum(debt * p["debt_repay_factor"], max_payable)
+
+        # Next state
+        cash = cash + net_cashflow + new_credit_draw - debt_repayment
+        debt = np.maximum(0.0, debt + new_credit_draw - debt_repayment)
+        domain_rating = domain_rating_next
+        product_value = pv_next
+        free_active = np.maximum(0.0, free_active - churned_free + new_free_all - upgraded_to_pro)
+        pro_active = np.maximum(
+            0.0, pro_active - churned_pro + new_pro + partner_pro_deals - upgraded_to_ent
+        )
+        ent_active = np.maximum(0.0, ent_active - churned_ent + new_ent + partner_ent_deals)
+        partners_active = partners_next
+        qualified_pool = np.maximum(0.0, qualified_pool - direct_contacted)
+        website_leads_prev = website_leads
+        demo_appointments_prev = new_demo_appointments
+        revenue_history[t] = revenue_total
+        renewed[rows, milestone_next] |= monthly_renewal_fee > 0
+
+        valid &= (
+            np.isfinite(net_cashflow)
+            & (np.abs(cash) <= _MAX_ABS_FINANCIAL)
+            & (debt <= _MAX_ABS_FINANCIAL)
+            & (product_value <= _MAX_ABS_FINANCIAL)
+            & (np.abs(revenue_total) <= _MAX_ABS_FINANCIAL)
+            & (np.abs(costs_ex_tax) <= _MAX_ABS_FINANCIAL)
+            & (np.abs(profit_bt) <= _MAX_ABS_FINANCIAL)
+            & (np.maximum(free_active, np.maximum(pro_active, ent_active)) <= _MAX_USERS)
+            & (qualified_pool <= _MAX_USERS)
+            & (partners_active <= _MAX_PARTNERS)
+            & (domain_rating <= _MAX_DOMAIN_RATING)
+        )
+
+        out["cash"][t] = cash
+        out["debt"][t] = debt
+        out["product_value"][t] = product_value
+        out["domain_rating"][t] = domain_rating
+        out["free_active"][t] = free_active
+        out["pro_active"][t] = pro_active
+        out["ent_active"][t] = ent_active
+        out["partners_active"][t] = partners_active
+        out["revenue_total"][t] = revenue_total
+        out["costs_ex_tax"][t] = costs_ex_tax
+        out["profit_bt"][t] = profit_bt
+        out["tax"][t] = tax
+        out["net_cashflow"][t] = net_cashflow
+        out["leads_total"][t] = leads_total
+
+    out["valid"] = valid
+    return out
@@ -0,0 +1,306 @@
+"""Reproducible optimizer benchmark over scenarios, samplers, seeds and budgets.
+
+Run the default matrix and write the curves to ``data/benchmarks``::
+
+    python -m otai_forecast.benchmark
+
+Every run uses ``n_jobs=1`` and a seeded sampler, so the trial sequence (and
+thus the best-so-far market cap per evaluation) is identical between runs of
+the same commit. Wall time is recorded alongside for speed comparisons.
+Compare two result files with::
+
+    python -m otai_forecast.benchmark --compare old.json new.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+import optuna
+
+from .config import (
+    OPTIMIZER_KNOT_CONFIG,
+    OPTIMIZER_NUM_KNOTS,
+    RUN_BASE_DECISION,
+    SCENARIO_ASSUMPTIONS,
+    WARM_START_KNOTS,
+    build_base_decisions,
+)
+from .decision_optimizer import (
+    constrained_tpe_sampler,
+    feasibility_stats,
+    is_feasible,
+    optimize_study,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+BENCHMARK_DIR = Path(__file__).resolve().parent.parent / "data" / "benchmarks"
+
+SAMPLERS: dict[str, Callable[[int], optuna.samplers.BaseSampler]] = {
+    "tpe": lambda seed: optuna.samplers.TPESampler(seed=seed),
+    "tpe_multivariate": lambda seed: optuna.samplers.TPESampler(
+        seed=seed, multivariate=True
+    ),
+    "tpe_constrained": constrained_tpe_sampler,
+    "random": lambda seed: optuna.samplers.RandomSampler(seed=seed),
+}
+
+DEFAULT_SEEDS = (0, 1, 2)
+DEFAULT_BUDGETS = (100, 250, 500)
+
+
+def best_so_far_curve(
+        study: optuna.Study,
+) -> tuple[list[float | None], list[float]]:
+    """Best feasible value and elapsed seconds after each evaluation.
+
+    Pruned and failed trials count as evaluations; entries before the first
+    feasible trial are ``None``.
+    """
+    trials = sorted(study.get_trials(deepcopy=False), key=lambda t: t.number)
+    started = min(t.datetime_start for t in trials if t.datetime_start is not None)
+    best: float | None = None
+    best_so_far: list[float | None] = []
+    elapsed: list[float] = []
+    for trial in trials:
+        if (
+            trial.state == optuna.trial.TrialState.COMPLETE
+            and is_feasible(trial)
+            and (best is None or trial.value > best)
+        ):
+            best = float(trial.value)
+        best_so_far.append(best)
+        finished = trial.datetime_complete or trial.datetime_start
+        elapsed.append((finished - started).total_seconds())
+    return best_so_far, elapsed
+
+
+def run_case(
+        scenario: str,
+        sampler: str,
+        seed: int,
+        budget: int,
+) -> dict:
+    """Run one deterministic optimization and return its curves."""
+    return run_cases(scenario, sampler, seed, [budget])[0]
+
+
+def run_cases(
+        scenario: str,
+        sampler: str,
+        seed: int,
+        budgets: list[int],
+) -> list[dict]:
+    """Curves of one optimization at each of ``budgets``, in the given order.
+
+    With a fixed seed and ``n_jobs=1`` a smaller budget is an exact prefix of
+    a larger one, so only ``max(budgets)`` trials are run and each budget
+    reads its prefix of that study.
+    """
+    a = SCENARIO_ASSUMPTIONS[scenario].assumptions
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    wall_start = time.perf_counter()
+    study = optimize_study(
+        a,
+        build_base_decisions(a.months, RUN_BASE_DECISION),
+        max_evals=max(budgets),
+        seed=seed,
+        n_jobs=1,
+        num_knots=OPTIMIZER_NUM_KNOTS,
+        knot_config=OPTIMIZER_KNOT_CONFIG,
+        warm_start_knots=WARM_START_KNOTS,
+        sampler=SAMPLERS[sampler](seed),
+    )
+    wall_time = time.perf_counter() - wall_start
+    best_so_far, elapsed = best_so_far_curve(study)
+    trials = sorted(study.get_trials(deepcopy=False), key=lambda t: t.number)
+    # Study setup before the first trial is charged to every budget
+    setup_time = wall_time - elapsed[-1]
+    results = []
+    for budget in budgets:
+        prefix = optuna.create_study(direction="maximize")
+        prefix.add_trials(trials[:budget])
+        results.append(
+            {
+                "scenario": scenario,
+                "sampler": sampler,
+                "seed": seed,
+                "budget": budget,
+                "wall_time_s": setup_time + elapsed[budget - 1],
+                "best_so_far": best_so_far[:budget],
+                "elapsed_s": elapsed[:budget],
+                "final_best": best_so_far[budget - 1],
+                "feasibility": feasibility_stats(prefix),
+            }
+        )
+    return results
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(
+        *,
+        scenarios: list[str] | None = None,
+        samplers: list[str] | None = None,
+        seeds: list[int] | None = None,
+        budgets: list[int] | None = None,
+) -> dict:
+    """Run the full matrix sequentially and return the results document."""
+    scenarios = scenarios or list(SCENARIO_ASSUMPTIONS)
+    samplers = samplers or list(SAMPLERS)
+    seeds = list(DEFAULT_SEEDS) if seeds is None else seeds
+    budgets = budgets or list(DEFAULT_BUDGETS)
+    unknown = (set(scenarios) - set(SCENARIO_ASSUMPTIONS)) | (
+        set(samplers) - set(SAMPLERS)
+    )
+    if unknown:
+        raise ValueError(f"Unknown scenarios or samplers: {sorted(unknown)}")
+
+    runs = []
+    for scenario in scenarios:
+        for sampler in samplers:
+            for seed in seeds:
+                for result in run_cases(scenario, sampler, seed, budgets):
+                    best = result["final_best"]
+                    best_text = "n/a" if best is None else f"{best:,.0f}"
+                    print(
+                        f"{scenario:<22} {sampler:<16} seed={seed}"
+                        f" budget={result['budget']:<5} best={best_text:>16}"
+                        f" {result['wall_time_s']:6.1f}s"
+                    )
+                    runs.append(result)
+
+    return {
+        "created_at": datetime.now(UTC).isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "optuna": optuna.__version__,
+        "matrix": {
+            "scenarios": scenarios,
+            "samplers": samplers,
+            "seeds": seeds,
+            "budgets": budgets,
+        },
+        "runs": runs,
+    }
+
+
+def write_results(results: dict, out_path: Path | None = None) -> Path:
+    if out_path is None:
+        stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%SZ")
+        commit = results["git_commit"] or "nogit"
+        out_path = BENCHMARK_DIR / f"benchmark_{stamp}_{commit}.json"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(results, indent=1), encoding="utf-8")
+    return out_path
+
+
+def summarize(results: dict) -> dict[tuple[str, str, int], dict[str, float]]:
+    """Median final best value and wall time per (scenario, sampler, budget)."""
+    groups: dict[tuple[str, str, int], list[dict]] = {}
+    for run in results["runs"]:
+        key = (run["scenario"], run["sampler"], run["budget"])
+        groups.setdefault(key, []).append(run)
+    return {
+        key: {
+            "median_best": float(
+                np.median([np.nan if r["final_best"] is None else r["final_best"]
+                           for r in runs])
+            ),
+            "median_wall_time_s": float(np.median([r["wall_time_s"] for r in runs])),
+        }
+        for key, runs in groups.items()
+    }
+
+
+def compare(old: dict, new: dict) -> list[dict]:
+    """Per (scenario, sampler, budget) change of median best value and wall time.
+
+    ``best_change`` is relative to the old median, or None when that is zero.
+    """
+    old_summary = summarize(old)
+    rows = []
+    for key, stats in summarize(new).items():
+        if key not in old_summary:
+            continue
+        before = old_summary[key]
+        old_best = before["median_best"]
+        best_change = (
+            (stats["median_best"] - old_best) / abs(old_best) if old_best else None
+        )
+        rows.append(
+            {
+                "scenario": key[0],
+                "sampler": key[1],
+                "budget": key[2],
+                "old_best": old_best,
+                "new_best": stats["median_best"],
+                "best_change": best_change,
+                "old_wall_time_s": before["median_wall_time_s"],
+                "new_wall_time_s": stats["median_wall_time_s"],
+            }
+        )
+    return rows
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", default=None)
+    parser.add_argument("--samplers", nargs="+", default=None, choices=list(SAMPLERS))
+    parser.add_argument("--seeds", nargs="+", type=int, default=None)
+    parser.add_argument("--budgets", nargs="+", type=int, default=None)
+    parser.add_argument("--out", type=Path, default=None)
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        type=Path,
+        metavar=("OLD", "NEW"),
+        help="compare two result files instead of running the benchmark",
+    )
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        old, new = (json.loads(p.read_text(encoding="utf-8")) for p in args.compare)
+        for row in compare(old, new):
+            change = row["best_change"]
+            change_text = "n/a" if change is None else f"{change:+.1%}"
+            print(
+                f"{row['scenario']:<22} {row['sampler']:<16} budget={row['budget']:<5}"
+                f" {row['old_best']:>14,.0f} -> {row['new_best']:>14,.0f}"
+                f" ({change_text})"
+                f" {row['old_wall_time_s']:6.1f}s -> {row['new_wall_time_s']:6.1f}s"
+            )
+        return
+
+    results = run_benchmark(
+        scenarios=args.scenarios,
+        samplers=args.samplers,
+        seeds=args.seeds,
+        budgets=args.budgets,
+    )
+    print(f"Wrote {write_results(results, args.out)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+"""Two-tier cache of simulation results: a memory LRU in front of a disk LRU.
+
+``cached_run_simulation_df`` is a drop-in for ``run_simulation_df``. Results
+are keyed by the assumptions fingerprint, the decisions fingerprint and
+``ENGINE_VERSION``, kept in a bounded in-process LRU and written to
+``data/cache/simulations`` (or ``$OTAI_SIMULATION_CACHE_DIR``), where the
+least recently used entries are evicted once the directory grows past its size
+budget. The disk tier is shared by all processes, so results survive
+restarts::
+
+    df = cached_run_simulation_df(assumptions, decisions)
+    simulation_cache.stats()  # {"memory_hits": ..., "disk_hits": ..., ...}
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+from .fileio import atomic_write_bytes, file_lock
+from .fingerprint import assumptions_fingerprint, decisions_fingerprint
+from .simulator import ENGINE_VERSION, run_simulation_df
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+
+    from .models import Assumptions, MonthlyDecision
+
+SIMULATION_CACHE_DIR = Path(
+    os.environ.get("OTAI_SIMULATION_CACHE_DIR")
+    or Path(__file__).resolve().parent.parent / "data" / "cache" / "simulations"
+)
+SIMULATION_CACHE_MAX_BYTES = 256 * 2**20
+SIMULATION_CACHE_MEMORY_ENTRIES = 128
+
+
+def frame_to_npz(
+    df: pd.DataFrame, meta: dict[str, Any], *, compress: bool = False
+) -> bytes:
+    """Serialize ``df`` and a JSON-able ``meta`` dict to npz bytes.
+
+    Columns are grouped by dtype into one ``(columns, rows)`` array each,
+    which loads much faster than one array per column. Object columns must
+    hold strings or missing values; they are stored as a string array plus a
+    null mask, so the file loads without pickle and missing values come back
+    as ``None``.
+    """
+    groups: dict[str, list[str]] = {}
+    for column in df.columns:
+        groups.setdefault(df[column].dtype.str, []).append(column)
+    meta = {
+        **meta,
+        "columns": [str(column) for column in df.columns],
+        "groups": {
+            dtype: [str(column) for column in columns]
+            for dtype, columns in groups.items()
+        },
+    }
+    arrays = {}
+    for i, (dtype, columns) in enumerate(groups.items()):
+        if dtype == "|O":
+            arrays[f"g{i}"], arrays[f"m{i}"] = _object_group_arrays(df[columns])
+        else:
+            arrays[f"g{i}"] = df[columns].to_numpy(dtype=dtype).T
+    buffer = io.BytesIO()
+    save = np.savez_compressed if compress else np.savez
+    save(buffer, __meta__=np.array(json.dumps(meta)), **arrays)
+    return buffer.getvalue()
+
+
+def _object_group_arrays(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    for column in df.columns:
+        if not all(isinstance(value, str) for value in df[column].dropna()):
+            raise TypeError(f"object column {column!r} holds non-string values")
+    values = df.to_numpy().T
+    mask = pd.isna(values)
+    return np.where(mask, "", values).astype(str), mask
+
+
+def frame_from_npz(source: Path | bytes) -> tuple[pd.DataFrame, dict[str, Any]]:
+    """Inverse of ``frame_to_npz``; ``source`` is a path or the npz bytes."""
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    with np.load(source, allow_pickle=False) as data:
+        meta = json.loads(str(data["__meta__"]))
+        columns = {}
+        for i, names in enumerate(meta["groups"].values()):
+            values = data[f"g{i}"]
+            if f"m{i}" in data:
+                values = np.where(data[f"m{i}"], None, values.astype(object))
+            columns.update(zip(names, values, strict=True))
+    df = pd.DataFrame({column: columns[column] for column in meta["columns"]})
+    return df, meta
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU holding at most ``max_entries`` values."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskLRUCache:
+    """Byte blobs stored as ``<key><suffix>`` files under a size budget.
+
+    A hit touches the file's mtime, which serves as its last-use time. When a
+    write pushes the (approximate) directory size past ``max_bytes``, the least
+    recently used files are deleted until it is back under ``low_water`` of
+    the budget. Files are written atomically and eviction runs under a file
+    lock, so several processes can share one directory.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int,
+        *,
+        suffix: str = ".bin",
+        low_water: float = 0.8,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.low_water = low_water
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Size as seen by this process; rescanned whenever it exceeds the budget
+        self._size: int | None = None
+        self._lock = threading.Lock()
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}{self.suffix}"
+
+    def get(self, key: str) -> bytes | None:
+        path = self.path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(self.path(key), data)
+        with self._lock:
+            if self._size is None:
+                self._size = self.size()
+            else:
+                self._size += len(data)
+            over_budget = self._size > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def _files(self) -> list[tuple[float, int, Path]]:
+        files = []
+        for path in self.directory.glob(f"*{self.suffix}"):
+            try:
+                stat = path.stat()
+            except OSError:  # Evicted by another process meanwhile
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def size(self) -> int:
+        """Total size of the cached files in bytes."""
+        return sum(size for _, size, _ in self._files())
+
+    def evict(self, target_bytes: int | None = None) -> int:
+        """Delete least recently used files down to ``target_bytes``.
+
+        Defaults to ``low_water`` of the budget; returns the number deleted.
+        """
+        if target_bytes is None:
+            target_bytes = int(self.max_bytes * self.low_water)
+        removed = 0
+        with file_lock(self.directory / ".lock"):
+            files = sorted(self._files())
+            total = sum(size for _, size, _ in files)
+            for _, size, path in files:
+                if total <= target_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+        with self._lock:
+            self._size = total
+            self.evictions += removed
+        return removed
+
+    def clear(self) -> None:
+        self.evict(0)
+
+
+class SimulationCache:
+    """Simulation results keyed by (assumptions, decisions, engine version)."""
+
+    def __init__(
+        self,
+        directory: Path = SIMULATION_CACHE_DIR,
+        *,
+        max_bytes: int = SIMULATION_CACHE_MAX_BYTES,
+        memory_entries: int = SIMULATION_CACHE_MEMORY_ENTRIES,
+    ):
+        self.memory = LRUCache(memory_entries)
+        self.disk = DiskLRUCache(directory, max_bytes, suffix=".npz")
+
+    @staticmethod
+    def key(assumptions: Assumptions, decisions: list[MonthlyDecision]) -> str:
+        parts = (
+            assumptions_fingerprint(assumptions),
+            decisions_fingerprint(decisions),
+            str(ENGINE_VERSION),
+        )
+        return hashlib.sha256(":".join(parts).encode("ascii")).hexdigest()
+
+    def get(
+        self, assumptions: Assumptions, decisions: list[MonthlyDecision]
+    ) -> pd.DataFrame | None:
+        key = self.key(assumptions, decisions)
+        df = self.memory.get(key)
+        if df is None:
+            data = self.disk.get(key)
+            if data is None:
+                return None
+            try:
+                df, meta = frame_from_npz(data)
+            except (KeyError, ValueError):  # Truncated or foreign file
+                return None
+            if meta.get("key") != key:
+                return None
+            self.memory.put(key, df)
+        # Callers may modify the frame they get back
+        return df.copy()
+
+    def put(
+        self,
+        assumptions: Assumptions,
+        decisions: list[MonthlyDecision],
+        df: pd.DataFrame,
+    ) -> None:
+        key = self.key(assumptions, decisions)
+        df = df.copy()
+        self.memory.put(key, df)
+        self.disk.put(key, frame_to_npz(df, {"key": key}))
+
+    def clear(self) -> None:
+        self.memory.clear()
+        self.disk.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "memory_hits": self.memory.hits,
+            "disk_hits": self.disk.hits,
+            "misses": self.disk.misses,
+            "memory_entries": len(self.memory),
+            "disk_evictions": self.disk.evictions,
+        }
+
+
+simulation_cache = SimulationCache()
+
+
+def cached_run_simulation_df(
+    a: Assumptions,
+    decisions: list[MonthlyDecision],
+    *,
+    cache: SimulationCache | None = None,
+) -> pd.DataFrame:
+    """``run_simulation_df`` that reuses results from ``cache``.
+
+    Uses the process-wide ``simulation_cache`` by default. Failed simulations
+    raise as usual and are not cached.
+    """
+    cache = simulation_cache if cache is None else cache
+    df = cache.get(a, decisions)
+    if df is None:
+        df = run_simulation_df(a, decisions)
+        cache.put(a, decisions, df)
+    return df
@@ -1,3 +1,11 @@
+"""Month-by-month simulation formulas for a single assumption set.
+
+``batch_compute.simulate_batch`` reimplements these formulas over arrays of
+assumption draws. Any change here must be mirrored there (and bump
+``simulator.ENGINE_VERSION``); tests/test_batch_compute.py checks that both
+engines agree on every output column.
+"""
+
 from __future__ import annotations
 
 import math
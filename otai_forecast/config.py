@@ -131,6 +131,10 @@ OPTIMIZER_KNOT_CONFIG: dict[str, dict[str, list[float]]] = {
                  "highs": [40 * (i+1) / OPTIMIZER_NUM_KNOTS for i in range(OPTIMIZER_NUM_KNOTS)]},
 }
 
+# Coarse-to-fine refinement: (num_knots, trials) per stage. Each stage starts
+# from the previous stage's best solution re-interpolated onto its knots.
+OPTIMIZER_REFINEMENT_STAGES: list[tuple[int, int]] = [(3, 200), (5, 300), (9, 500)]
+
 # Warm-start knots: set to a known-good solution to give TPE a strong baseline.
 # Each list has OPTIMIZER_NUM_KNOTS values (multipliers on the base decision).
 # Set to None to disable warm-starting.
@@ -142,6 +146,25 @@ WARM_START_KNOTS: dict[str, list[float]] = {
     "outreach": [2.0, 5.0, 3.0, 2.0, 1.5, 1.0, 0.8, 0.5, 0.1],
 }
 
+# Robust optimization: lognormal sigma per uncertain assumption. Draws are sampled
+# once per run with ROBUST_SEED so all trials see the same futures.
+ROBUST_UNCERTAINTY: dict[str, float] = {
+    "conv_web_to_lead": 0.3,
+    "conv_website_lead_to_pro": 0.4,
+    "conv_website_lead_to_ent": 0.4,
+    "direct_contacted_demo_conversion": 0.3,
+    "conv_free_to_pro": 0.4,
+    "churn_pro": 0.3,
+    "churn_ent": 0.3,
+    "cpc_base": 0.25,
+    "seo_users_per_eur": 0.3,
+    "partner_pro_deals_per_partner_per_month": 0.4,
+}
+ROBUST_NUM_DRAWS = 32
+ROBUST_SEED = 0
+ROBUST_METRIC = "cvar"
+ROBUST_LEVEL = 0.1
+
 
 def build_base_decisions(months: int, base_decision: MonthlyDecision) -> list[MonthlyDecision]:
     return [base_decision.model_copy() for _ in range(months)]
@@ -0,0 +1,152 @@
+"""Streaming XLSX writing on top of openpyxl's write-only mode.
+
+Rows are appended to a ``Workbook(write_only=True)`` one at a time and are
+flushed to disk as they go, so memory stays flat however long a table is.
+Styles are registered once per workbook as named styles and assigned per
+column, so no code walks the cells to format them::
+
+    wb = Workbook(write_only=True)
+    add_named_styles(wb, [NamedStyle("header", ...), NamedStyle("money", ...)])
+    ws = wb.create_sheet("Monthly")
+    set_column_widths(ws, column_widths(df, min_width=10, max_width=42))
+    append_table(
+        ws,
+        df,
+        header=cell_factory(ws, "header"),
+        body=cell_factory(ws),
+        columns={"cash": cell_factory(ws, "money")},
+    )
+    wb.save(path)
+
+Every cell then only copies its column's resolved style indices. Row
+heights, column widths, merged cells and freeze panes must be set before the
+first row is appended.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Callable, Iterable, Mapping
+from copy import copy
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
+
+if TYPE_CHECKING:
+    from openpyxl import Workbook
+    from openpyxl.styles import NamedStyle
+    from openpyxl.worksheet._write_only import WriteOnlyWorksheet
+
+CellFactory = Callable[[Any], WriteOnlyCell]
+
+
+def add_named_styles(wb: Workbook, styles: Iterable[NamedStyle]) -> None:
+    """Register ``styles`` with ``wb``, skipping names it already has."""
+    for style in styles:
+        if style.name not in wb.named_styles:
+            wb.add_named_style(style)
+
+
+def cell_factory(
+    ws: WriteOnlyWorksheet, style: str | None = None, **attrs: Any
+) -> CellFactory:
+    """Cells for ``ws`` in the named ``style``, with optional overrides.
+
+    ``attrs`` are cell style attributes (``font``, ``number_format``, ...).
+    """
+    template = WriteOnlyCell(ws)
+    if style is not None:
+        template.style = style
+    for attr, value in attrs.items():
+        setattr(template, attr, value)
+    style_array = template._style
+
+    def make(value: Any) -> WriteOnlyCell:
+        cell = WriteOnlyCell(ws, excel_value(value))
+        cell._style = copy(style_array)
+        return cell
+
+    return make
+
+
+def excel_value(value: Any) -> Any:
+    """``value`` as openpyxl accepts it; missing values become empty cells."""
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, np.generic):
+        return excel_value(value.item())
+    if isinstance(value, (list, tuple, dict)):
+        return str(value)
+    return value
+
+
+def _max_str_len(values: pd.Series) -> int:
+    if values.empty:
+        return 0
+    if isinstance(values.dtype, np.dtype) and values.dtype.kind in "biuf":
+        # numpy formats numbers like str() does, without a Python call per value
+        array = values.to_numpy()
+        lengths = np.char.str_len(array.astype(str))
+        if values.dtype.kind == "f":
+            lengths = np.where(np.isnan(array), 0, lengths)
+        return int(lengths.max())
+    lengths = values.astype(str).str.len().where(values.notna(), 0)
+    return int(lengths.max())
+
+
+def column_widths(
+    df: pd.DataFrame, *, min_width: float, max_width: float
+) -> list[float]:
+    """Widths fitting the longest header or value of each column, clamped."""
+    widths = []
+    for i, column in enumerate(df.columns):
+        longest = max(len(str(column)), _max_str_len(df.iloc[:, i]))
+        widths.append(min(max_width, max(min_width, longest + 2)))
+    return widths
+
+
+def set_column_widths(
+    ws: WriteOnlyWorksheet, widths: Iterable[float], start: int = 1
+) -> None:
+    for i, width in enumerate(widths, start=start):
+        ws.column_dimensions[get_column_letter(i)].width = width
+
+
+def append_frame(
+    ws: WriteOnlyWorksheet, df: pd.DataFrame, cells: list[CellFactory]
+) -> None:
+    """Append the rows of ``df``, column ``i`` styled by ``cells[i]``."""
+    for row in df.itertuples(index=False, name=None):
+        ws.append([make(value) for make, value in zip(cells, row, strict=True)])
+
+
+def append_table(
+    ws: WriteOnlyWorksheet,
+    df: pd.DataFrame,
+    *,
+    header: CellFactory,
+    body: CellFactory,
+    columns: Mapping[Any, CellFactory] | None = None,
+) -> int:
+    """Append a header row and the rows of ``df``; returns the rows written.
+
+    ``columns`` overrides the ``body`` style per column name.
+    """
+    columns = columns or {}
+    ws.append([header(str(column)) for column in df.columns])
+    append_frame(ws, df, [columns.get(column, body) for column in df.columns])
+    return len(df) + 1
+
+
+def append_sparse_rows(
+    ws: WriteOnlyWorksheet, rows: dict[int, dict[int, WriteOnlyCell]]
+) -> None:
+    """Append ``rows`` (row -> column -> cell, 1-based), leaving gaps empty."""
+    for row in range(1, max(rows, default=0) + 1):
+        columns = rows.get(row, {})
+        ws.append([columns.get(col) for col in range(1, max(columns, default=0) + 1)])
@@ -1,16 +1,47 @@
 from __future__ import annotations
 
-from concurrent.futures import ThreadPoolExecutor
-from dataclasses import asdict, is_dataclass
+import html
+import json
+from dataclasses import asdict, dataclass, is_dataclass
+from datetime import UTC, datetime
+from functools import partial
 from io import BytesIO
-from typing import Any
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
+import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
-import plotly.io as pio
+import plotly
+from openpyxl import Workbook
 from openpyxl.drawing.image import Image
-from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
 from openpyxl.utils import get_column_letter
+from plotly.offline import get_plotlyjs
+
+from . import rendering
+from .cache import frame_to_npz
+from .excel import (
+    add_named_styles,
+    append_sparse_rows,
+    append_table,
+    cell_factory,
+    column_widths,
+    set_column_widths,
+)
+from .fileio import atomic_write_bytes, atomic_write_text
+from .fingerprint import assumptions_fingerprint, canonical_json
+from .kpis import (
+    INTEGER_KPIS,
+    KPI_LABELS,
+    REPORT_KPIS,
+    compute_kpis,
+    kpis_from_frames,
+)
+from .models import Assumptions
+from .simulator import ENGINE_VERSION
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
 
 
 def _maybe_asdict(x: Any) -> Any:
@@ -121,108 +152,8 @@ def _decisions_df(monthly_decisions: Any | None) -> pd.DataFrame | None:
 
 
 def _kpi_rows(df: pd.DataFrame) -> list[tuple[str, float | int | None]]:
-    def first_neg_month(series_month: pd.Series, series_cash: pd.Series):
-        m = series_month[series_cash < 0]
-        return int(m.iloc[0]) if len(m) else None
-
-    return [
-        (
-            "Months",
-            int(df["month"].max() + 1) if "month" in df.columns and len(df) else None,
-        ),
-        (
-            "Starting cash (€)",
-            float(df["cash"].iloc[0]) if "cash" in df.columns and len(df) else None,
-        ),
-        (
-            "Ending cash (€)",
-            float(df["cash"].iloc[-1]) if "cash" in df.columns and len(df) else None,
-        ),
-        (
-            "Ending debt (€)",
-            float(df["debt"].iloc[-1]) if "debt" in df.columns and len(df) else None,
-        ),
-        (
-            "Min cash (€)",
-            float(df["cash"].min()) if "cash" in df.columns and len(df) else None,
-        ),
-        (
-            "Month of min cash",
-            int(df.loc[df["cash"].idxmin(), "month"])
-            if "cash" in df.columns and len(df)
-            else None,
-        ),
-        (
-            "First month cash < 0",
-            first_neg_month(df["month"], df["cash"])
-            if "cash" in df.columns and len(df)
-            else None,
-        ),
-        (
-            "Total revenue (€)",
-            float(df["revenue_total"].sum())
-            if "revenue_total" in df.columns and len(df)
-            else None,
-        ),
-        (
-            "Avg revenue last 3 months (€)",
-            float(df["revenue_total"].tail(3).mean())
-            if "revenue_total" in df.columns and len(df) >= 3
-            else None,
-        ),
-        (
-            "Total costs ex tax (€)",
-            float(df["costs_ex_tax"].sum())
-            if "costs_ex_tax" in df.columns and len(df)
-            else None,
-        ),
-        (
-            "Total tax (€)",
-            float(df["tax"].sum()) if "tax" in df.columns and len(df) else None,
-        ),
-        (
-            "Total profit after tax (€)",
-            float((df["profit_bt"] - df["tax"]).sum())
-            if "profit_bt" in df.columns and "tax" in df.columns and len(df)
-            else None,
-        ),
-        (
-            "End Free active",
-            float(df["free_active"].iloc[-1])
-            if "free_active" in df.columns and len(df)
-            else None,
-        ),
-        (
-            "End Pro active",
-            float(df["pro_active"].iloc[-1])
-            if "pro_active" in df.columns and len(df)
-            else None,
-        ),
-        (
-            "End Enterprise active",
-            float(df["ent_active"].iloc[-1])
-            if "ent_active" in df.columns and len(df)
-            else None,
-        ),
-        (
-            "Total Ads spend (€)",
-            float(df["ads_spend"].sum())
-            if "ads_spend" in df.columns and len(df)
-            else None,
-        ),
-        (
-            "Total SEO spend (€)",
-            float(df["organic_marketing_spend"].sum())
-            if "organic_marketing_spend" in df.columns and len(df)
-            else None,
-        ),
-        (
-            "Total Direct outreach spend (€)",
-            float(df["direct_candidate_outreach_spend"].sum())
-            if "direct_candidate_outreach_spend" in df.columns and len(df)
-            else None,
-        ),
-    ]
+    kpis = compute_kpis(df)
+    return [(KPI_LABELS[key], kpis[key]) for key in REPORT_KPIS]
 
 
 def _kpis_df(df: pd.DataFrame) -> pd.DataFrame:
@@ -328,7 +259,7 @@ def _build_tables(
     ]
 
     def pick(cols: list[str]) -> pd.DataFrame:
-        return df[[c for c in cols if c in df.columns]].copy()
+        return df[[c for c in cols if c in df.columns]]
 
     df_a = _assumptions_df(assumptions)
     df_d = _decisions_df(monthly_decisions)
@@ -340,7 +271,7 @@ def _build_tables(
         "Acquisition": pick(acq_cols),
         "Funnel": pick(funnel_cols),
         "Product": pick(product_cols),
-        "Monthly_Full": df.copy(),
+        "Monthly_Full": df,
     }
     if df_a is not None:
         tables["Assumptions"] = df_a
@@ -350,13 +281,217 @@ def _build_tables(
     return tables
 
 
-def _write_excel_report(
-    *,
-    tables: dict[str, pd.DataFrame],
-    df_for_plots: pd.DataFrame | None,
-    out_path: str,
-    plot_scenarios: list[tuple[str, pd.DataFrame]] | None = None,
-) -> str:
+_SHEET_ORDER = [
+    "Dashboard_KPIs",
+    "Dashboard_Overview",
+    "Overview_Comparison",
+    "Finance",
+    "Acquisition",
+    "Funnel",
+    "Product",
+    "Assumptions",
+    "Monthly_Decisions",
+    "Monthly_Full",
+]
+
+_SHEET_SUBTITLES = {
+    "Dashboard_Overview": "Business Overview - Key Metrics Summary",
+    "Overview_Comparison": "Scenario Comparison - KPI Overview",
+    "Finance": "Financial Performance - Revenue, Costs & Cash Flow",
+    "Acquisition": "Customer Acquisition - Marketing & Sales Channels",
+    "Funnel": "Conversion Funnel - User Journey Analytics",
+    "Product": "Product Metrics - Value, Pricing & Conversions",
+    "Assumptions": "Model Assumptions - Input Parameters",
+    "Monthly_Decisions": "Monthly Decisions - Strategic Choices",
+    "Monthly_Full": "Complete Monthly Data - All Variables",
+}
+
+# Sheets whose euro columns get a currency format
+_MONEY_SHEETS = {
+    "Dashboard_Overview",
+    "Overview_Comparison",
+    "Finance",
+    "Acquisition",
+    "Funnel",
+    "Product",
+    "Monthly_Decisions",
+    "Monthly_Full",
+}
+
+_MONEY_COLUMNS = {
+    "cash",
+    "debt",
+    "revenue_total",
+    "costs_ex_tax",
+    "net_cashflow",
+    "tax",
+    "profit_bt",
+    "revenue_pro",
+    "revenue_ent",
+    "ads_spend",
+    "organic_marketing_spend",
+    "dev_spend",
+    "operating_spend",
+    "direct_candidate_outreach_spend",
+    "sales_spend",
+    "support_spend",
+    "interest_payment",
+}
+
+# (sheet prefix, title, plot names, rows per plot, image width, image height)
+_PLOT_SHEETS = [
+    (
+        "Plots_Basic",
+        "Basic Visualization Plots",
+        [
+            "User_Growth",
+            "Revenue_Cashflow",
+            "Cash_Position",
+            "Market_Cap",
+            "Product_Value",
+            "Net_Cashflow",
+            "TTM_Revenue",
+        ],
+        40,
+        600,
+        350,
+    ),
+    (
+        "Plots_Enhanced",
+        "Enhanced Analytics Plots",
+        [
+            "User_Growth_Stacked",
+            "Revenue_Breakdown",
+            "Cash_Burn_Rate",
+            "Conversion_Funnel",
+            "LTV_CAC_Analysis",
+            "Unit_Economics",
+            "Growth_Heatmap",
+            "Acquisition_Channels",
+        ],
+        40,
+        600,
+        350,
+    ),
+    (
+        "Plots_Dashboards",
+        "Comprehensive Dashboard Views",
+        [
+            "Enhanced_Dashboard",
+            "Growth_Insights",
+            "Cash_Debt_Spend",
+            "Costs_Breakdown",
+            "Revenue_Split",
+            "Financial_Health",
+        ],
+        45,
+        700,
+        450,
+    ),
+]
+
+_THIN = Side(style="thin")
+_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+_CENTER = Alignment(horizontal="center")
+_HEADER_ALIGN = Alignment(horizontal="center", vertical="center", wrap_text=True)
+
+
+def _report_styles() -> list[NamedStyle]:
+    return [
+        NamedStyle(
+            "report_header",
+            fill=PatternFill("solid", fgColor="1F2937"),
+            font=Font(color="FFFFFF", bold=True, size=12),
+            alignment=_HEADER_ALIGN,
+            border=_BORDER,
+        ),
+        NamedStyle("report_body", border=_BORDER),
+        NamedStyle("report_money", border=_BORDER, number_format='#,##0.00" €"'),
+        NamedStyle(
+            "report_metric", border=_BORDER, font=Font(bold=True, color="374151")
+        ),
+        NamedStyle(
+            "report_title",
+            font=Font(size=16, bold=True, color="1F2937"),
+            alignment=_CENTER,
+        ),
+        NamedStyle(
+            "report_subtitle",
+            font=Font(size=14, bold=True, color="374151"),
+            alignment=_CENTER,
+        ),
+        NamedStyle(
+            "report_plot_title", font=Font(size=14, bold=True), alignment=_CENTER
+        ),
+    ]
+
+
+def _write_table_sheet(wb: Workbook, name: str, table: pd.DataFrame) -> None:
+    """Stream ``table`` into a new sheet below a title row and a styled header."""
+    ws = wb.create_sheet(name)
+    is_kpi = name == "Dashboard_KPIs"
+    n_cols = max(len(table.columns), 1)
+    set_column_widths(ws, column_widths(table, min_width=10, max_width=42))
+    ws.row_dimensions[1].height = 40 if is_kpi else 35
+    ws.row_dimensions[2].height = 30 if is_kpi else 24
+    ws.merged_cells.add(f"A1:{get_column_letter(2 if is_kpi else n_cols)}1")
+    ws.freeze_panes = "A3"
+
+    if is_kpi:
+        title = cell_factory(ws, "report_title")(
+            "OTAI Financial Simulation - Key Performance Indicators"
+        )
+    else:
+        title = cell_factory(ws, "report_subtitle")(
+            _SHEET_SUBTITLES.get(name, f"{name} Report")
+        )
+    ws.append([title])
+
+    columns = {}
+    if is_kpi and len(table.columns):
+        columns[table.columns[0]] = cell_factory(ws, "report_metric")
+    elif name in _MONEY_SHEETS:
+        money = cell_factory(ws, "report_money")
+        columns = {c: money for c in table.columns if c in _MONEY_COLUMNS}
+    append_table(
+        ws,
+        table,
+        header=cell_factory(ws, "report_header"),
+        body=cell_factory(ws, "report_body"),
+        columns=columns,
+    )
+
+
+def _write_plot_sheets(
+    wb: Workbook,
+    image_bytes: dict[str, BytesIO],
+    scenario_label: str | None,
+    sheet_suffix: str,
+) -> None:
+    for prefix, base_title, plot_names, row_step, width, height in _PLOT_SHEETS:
+        ws = wb.create_sheet(f"{prefix}{sheet_suffix}")
+        for col in "ABCDEFGH":
+            ws.column_dimensions[col].width = 15
+        ws.row_dimensions[1].height = 40
+        ws.merged_cells.add("A1:H1")
+        title = f"{base_title} - {scenario_label}" if scenario_label else base_title
+        plot_title = cell_factory(ws, "report_plot_title")
+
+        rows = {1: {1: cell_factory(ws, "report_title")(title)}}
+        for i, plot_name in enumerate(plot_names):
+            if plot_name not in image_bytes:
+                continue
+            row = (i // 2) * row_step + 3
+            col = (i % 2) * 8 + 1
+            rows.setdefault(row - 1, {})[col] = plot_title(plot_name.replace("_", " "))
+            img = Image(image_bytes[plot_name])
+            img.width = width
+            img.height = height
+            ws.add_image(img, f"{get_column_letter(col)}{row}")
+        append_sparse_rows(ws, rows)
+
+
+def _report_plot_fns() -> dict[str, Any]:
     # Import all plotting functions
     from .plots import (
         plot_cash_burn_rate,
@@ -383,349 +518,69 @@ def _write_excel_report(
         plot_user_growth_stacked,
     )
 
-    def generate_plot_images(df: pd.DataFrame) -> dict[str, BytesIO]:
-        plot_images = {}
-
+    return {
         # Basic plots
-        plot_images["User_Growth"] = plot_results(df, save_path=None)
-        plot_images["User_Growth_2"] = plot_user_growth(df)
-        plot_images["Revenue_Cashflow"] = plot_revenue_cashflow(df)
-        plot_images["Cash_Position"] = plot_cash_position(df)
-        plot_images["Market_Cap"] = plot_market_cap(df)
-        plot_images["Product_Value"] = plot_product_value(df)
-        plot_images["Net_Cashflow"] = plot_net_cashflow(df)
-        plot_images["TTM_Revenue"] = plot_ttm_revenue(df)
-
+        "User_Growth": partial(plot_results, save_path=None),
+        "User_Growth_2": plot_user_growth,
+        "Revenue_Cashflow": plot_revenue_cashflow,
+        "Cash_Position": plot_cash_position,
+        "Market_Cap": plot_market_cap,
+        "Product_Value": plot_product_value,
+        "Net_Cashflow": plot_net_cashflow,
+        "TTM_Revenue": plot_ttm_revenue,
         # Enhanced plots
-        plot_images["User_Growth_Stacked"] = plot_user_growth_stacked(df)
-        plot_images["Revenue_Breakdown"] = plot_revenue_breakdown(df)
-        plot_images["Cash_Burn_Rate"] = plot_cash_burn_rate(df)
-        plot_images["Conversion_Funnel"] = plot_conversion_funnel(df)
-        plot_images["LTV_CAC_Analysis"] = plot_ltv_cac_analysis(df)
-        plot_images["Unit_Economics"] = plot_unit_economics(df)
-        plot_images["Growth_Heatmap"] = plot_growth_metrics_heatmap(df)
-        plot_images["Acquisition_Channels"] = plot_customer_acquisition_channels(df)
-        plot_images["Financial_Health"] = plot_financial_health_score(df)
-
+        "User_Growth_Stacked": plot_user_growth_stacked,
+        "Revenue_Breakdown": plot_revenue_breakdown,
+        "Cash_Burn_Rate": plot_cash_burn_rate,
+        "Conversion_Funnel": plot_conversion_funnel,
+        "LTV_CAC_Analysis": plot_ltv_cac_analysis,
+        "Unit_Economics": plot_unit_economics,
+        "Growth_Heatmap": plot_growth_metrics_heatmap,
+        "Acquisition_Channels": plot_customer_acquisition_channels,
+        "Financial_Health": plot_financial_health_score,
         # Dashboard plots
-        plot_images["Enhanced_Dashboard"] = plot_enhanced_dashboard(df, save_path=None)
-        plot_images["Growth_Insights"] = plot_growth_insights(df, save_path=None)
-        plot_images["Cash_Debt_Spend"] = plot_cash_debt_spend(df)
-        plot_images["Costs_Breakdown"] = plot_costs_breakdown(df)
-        plot_images["Revenue_Split"] = plot_revenue_split(df)
-
-        def _render(name_fig: tuple[str, go.Figure]) -> tuple[str, BytesIO]:
-            name, fig = name_fig
-            buf = BytesIO()
-            buf.write(pio.to_image(fig, format="png", scale=2))
-            buf.seek(0)
-            return name, buf
-
-        items = [(n, f) for n, f in plot_images.items() if f is not None]
-        image_bytes = {}
-        with ThreadPoolExecutor() as pool:
-            for result in pool.map(_render, items):
-                image_bytes[result[0]] = result[1]
-        return image_bytes
-
-    sheet_order = [
-        "Dashboard_KPIs",
-        "Dashboard_Overview",
-        "Overview_Comparison",
-        "Finance",
-        "Acquisition",
-        "Funnel",
-        "Product",
-        "Assumptions",
-        "Monthly_Decisions",
-        "Monthly_Full",
-    ]
+        "Enhanced_Dashboard": partial(plot_enhanced_dashboard, save_path=None),
+        "Growth_Insights": partial(plot_growth_insights, save_path=None),
+        "Cash_Debt_Spend": plot_cash_debt_spend,
+        "Costs_Breakdown": plot_costs_breakdown,
+        "Revenue_Split": plot_revenue_split,
+    }
 
-    w = pd.ExcelWriter(out_path, engine="openpyxl")
-    for sheet_name in sheet_order:
-        df_sheet = tables.get(sheet_name)
-        if df_sheet is not None:
-            df_sheet.to_excel(w, index=False, sheet_name=sheet_name)
-
-    wb = w.book
-
-    # Define styles
-    header_fill = PatternFill("solid", fgColor="1F2937")
-    header_font = Font(color="FFFFFF", bold=True, size=12)
-    header_align = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    border = Border(
-        left=Side(style="thin"),
-        right=Side(style="thin"),
-        top=Side(style="thin"),
-        bottom=Side(style="thin"),
-    )
-    title_font = Font(size=16, bold=True, color="1F2937")
-    subtitle_font = Font(size=14, bold=True, color="374151")
-
-    def autosize(ws):
-        for i, col in enumerate(
-            ws.iter_cols(
-                min_row=1, max_row=ws.max_row, min_col=1, max_col=ws.max_column
-            ),
-            start=1,
-        ):
-            max_len = 0
-            for cell in col:
-                v = "" if cell.value is None else str(cell.value)
-                max_len = max(max_len, len(v))
-            ws.column_dimensions[get_column_letter(i)].width = min(
-                42, max(10, max_len + 2)
-            )
 
-    def style_sheet(ws, is_kpi=False):
-        ws.freeze_panes = "A2"
-        ws.row_dimensions[1].height = 30 if is_kpi else 24
-
-        # Style headers
-        for cell in ws[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = header_align
-            cell.border = border
-
-        # Style data cells
-        for row in ws.iter_rows(min_row=2):
-            for cell in row:
-                cell.border = border
-                if is_kpi and cell.column == 1:  # Metric names in KPI sheet
-                    cell.font = Font(bold=True, color="374151")
-
-        autosize(ws)
-
-        # Add title to KPI sheet
-        if is_kpi:
-            ws.insert_rows(1)
-            ws.merge_cells("A1:B1")
-            ws["A1"] = "OTAI Financial Simulation - Key Performance Indicators"
-            ws["A1"].font = title_font
-            ws["A1"].alignment = Alignment(horizontal="center")
-            ws.row_dimensions[1].height = 40
-
-    # Style all sheets
-    for name in wb.sheetnames:
-        is_kpi = name == "Dashboard_KPIs"
-        style_sheet(wb[name], is_kpi=is_kpi)
-
-        # Add subtitles to sheets
-        if name != "Dashboard_KPIs":
-            ws = wb[name]
-            ws.insert_rows(1)
-            ws.merge_cells(f"A1:{get_column_letter(ws.max_column)}1")
-
-            subtitle_map = {
-                "Dashboard_Overview": "Business Overview - Key Metrics Summary",
-                "Overview_Comparison": "Scenario Comparison - KPI Overview",
-                "Finance": "Financial Performance - Revenue, Costs & Cash Flow",
-                "Acquisition": "Customer Acquisition - Marketing & Sales Channels",
-                "Funnel": "Conversion Funnel - User Journey Analytics",
-                "Product": "Product Metrics - Value, Pricing & Conversions",
-                "Assumptions": "Model Assumptions - Input Parameters",
-                "Monthly_Decisions": "Monthly Decisions - Strategic Choices",
-                "Monthly_Full": "Complete Monthly Data - All Variables",
-            }
+def _render_report_plots(dfs: Sequence[pd.DataFrame]) -> list[dict[str, bytes]]:
+    """PNGs of the report plots per frame, rendered as one batch.
 
-            ws["A1"] = subtitle_map.get(name, f"{name} Report")
-            ws["A1"].font = subtitle_font
-            ws["A1"].alignment = Alignment(horizontal="center")
-            ws.row_dimensions[1].height = 35
-
-    for name in [
-        "Dashboard_Overview",
-        "Overview_Comparison",
-        "Finance",
-        "Acquisition",
-        "Funnel",
-        "Product",
-        "Monthly_Decisions",
-        "Monthly_Full",
-    ]:
-        if name in wb.sheetnames:
-            ws = wb[name]
-            for col_name in [
-                "cash",
-                "debt",
-                "revenue_total",
-                "costs_ex_tax",
-                "net_cashflow",
-                "tax",
-                "profit_bt",
-                "revenue_pro",
-                "revenue_ent",
-                "ads_spend",
-                "organic_marketing_spend",
-                "dev_spend",
-                "operating_spend",
-                "direct_candidate_outreach_spend",
-                "sales_spend",
-                "support_spend",
-                "interest_payment",
-            ]:
-                idx = None
-                for j in range(1, ws.max_column + 1):
-                    if ws.cell(row=1, column=j).value == col_name:
-                        idx = j
-                        break
-                if idx:
-                    for r in range(2, ws.max_row + 1):
-                        ws.cell(row=r, column=idx).number_format = '#,##0.00" €"'
-
-    if plot_scenarios is None and df_for_plots is None:
-        w.close()
-        return out_path
-
-    def add_plot_sheets(
-        *,
-        image_bytes: dict[str, BytesIO],
-        scenario_label: str | None,
-        sheet_suffix: str,
-    ) -> None:
-        sheet_names = [
-            f"Plots_Basic{sheet_suffix}",
-            f"Plots_Enhanced{sheet_suffix}",
-            f"Plots_Dashboards{sheet_suffix}",
-        ]
-        for sheet_name in sheet_names:
-            if sheet_name in wb.sheetnames:
-                wb.remove(wb[sheet_name])
-
-        base_title = "Basic Visualization Plots"
-        title = (
-            f"{base_title} - {scenario_label}"
-            if scenario_label
-            else base_title
-        )
-        ws_plots_basic = wb.create_sheet(f"Plots_Basic{sheet_suffix}")
-        ws_plots_basic["A1"] = title
-        ws_plots_basic["A1"].font = title_font
-        ws_plots_basic["A1"].alignment = Alignment(horizontal="center")
-        ws_plots_basic.merge_cells("A1:H1")
-        ws_plots_basic.row_dimensions[1].height = 40
-
-        basic_plot_names = [
-            "User_Growth",
-            "Revenue_Cashflow",
-            "Cash_Position",
-            "Market_Cap",
-            "Product_Value",
-            "Net_Cashflow",
-            "TTM_Revenue",
-        ]
-        for i, plot_name in enumerate(basic_plot_names):
-            if plot_name in image_bytes:
-                row = (i // 2) * 40 + 3
-                col = (i % 2) * 8 + 1
-
-                img = Image(image_bytes[plot_name])
-                img.width = 600
-                img.height = 350
-                ws_plots_basic.add_image(img, f"{get_column_letter(col)}{row}")
-
-                title_cell = f"{get_column_letter(col)}{row - 1}"
-                ws_plots_basic[title_cell] = plot_name.replace("_", " ")
-                ws_plots_basic[title_cell].font = Font(size=14, bold=True)
-                ws_plots_basic[title_cell].alignment = Alignment(horizontal="center")
-
-        base_title = "Enhanced Analytics Plots"
-        title = (
-            f"{base_title} - {scenario_label}"
-            if scenario_label
-            else base_title
-        )
-        ws_plots_enhanced = wb.create_sheet(f"Plots_Enhanced{sheet_suffix}")
-        ws_plots_enhanced["A1"] = title
-        ws_plots_enhanced["A1"].font = title_font
-        ws_plots_enhanced["A1"].alignment = Alignment(horizontal="center")
-        ws_plots_enhanced.merge_cells("A1:H1")
-        ws_plots_enhanced.row_dimensions[1].height = 40
-
-        enhanced_plot_names = [
-            "User_Growth_Stacked",
-            "Revenue_Breakdown",
-            "Cash_Burn_Rate",
-            "Conversion_Funnel",
-            "LTV_CAC_Analysis",
-            "Unit_Economics",
-            "Growth_Heatmap",
-            "Acquisition_Channels",
-        ]
-        for i, plot_name in enumerate(enhanced_plot_names):
-            if plot_name in image_bytes:
-                row = (i // 2) * 40 + 3
-                col = (i % 2) * 8 + 1
-
-                img = Image(image_bytes[plot_name])
-                img.width = 600
-                img.height = 350
-                ws_plots_enhanced.add_image(img, f"{get_column_letter(col)}{row}")
-
-                title_cell = f"{get_column_letter(col)}{row - 1}"
-                ws_plots_enhanced[title_cell] = plot_name.replace("_", " ")
-                ws_plots_enhanced[title_cell].font = Font(size=14, bold=True)
-                ws_plots_enhanced[title_cell].alignment = Alignment(horizontal="center")
-
-        base_title = "Comprehensive Dashboard Views"
-        title = (
-            f"{base_title} - {scenario_label}"
-            if scenario_label
-            else base_title
-        )
-        ws_plots_dash = wb.create_sheet(f"Plots_Dashboards{sheet_suffix}")
-        ws_plots_dash["A1"] = title
-        ws_plots_dash["A1"].font = title_font
-        ws_plots_dash["A1"].alignment = Alignment(horizontal="center")
-        ws_plots_dash.merge_cells("A1:H1")
-        ws_plots_dash.row_dimensions[1].height = 40
-
-        dashboard_plot_names = [
-            "Enhanced_Dashboard",
-            "Growth_Insights",
-            "Cash_Debt_Spend",
-            "Costs_Breakdown",
-            "Revenue_Split",
-            "Financial_Health",
-        ]
-        for i, plot_name in enumerate(dashboard_plot_names):
-            if plot_name in image_bytes:
-                row = (i // 2) * 45 + 3
-                col = (i % 2) * 8 + 1
+    Unchanged data is served from the chart cache.
+    """
+    return rendering.render_plot_sets_png(_report_plot_fns(), dfs, scale=2)
 
-                img = Image(image_bytes[plot_name])
-                img.width = 700
-                img.height = 450
-                ws_plots_dash.add_image(img, f"{get_column_letter(col)}{row}")
 
-                title_cell = f"{get_column_letter(col)}{row - 1}"
-                ws_plots_dash[title_cell] = plot_name.replace("_", " ")
-                ws_plots_dash[title_cell].font = Font(size=14, bold=True)
-                ws_plots_dash[title_cell].alignment = Alignment(horizontal="center")
-
-        for ws_name in sheet_names:
-            ws = wb[ws_name]
-            for col in ["A", "B", "C", "D", "E", "F", "G", "H"]:
-                ws.column_dimensions[col].width = 15
-
-    if plot_scenarios is None:
-        plot_scenarios = [("", df_for_plots)] if df_for_plots is not None else []
+def _write_excel_report(
+    *,
+    tables: dict[str, pd.DataFrame],
+    out_path: str,
+    plot_sheets: Sequence[tuple[str, str | None, dict[str, bytes]]] = (),
+) -> str:
+    """Write the report workbook in openpyxl's write-only (streaming) mode.
+
+    Table rows are styled as they are written and flushed to disk, so memory
+    does not grow with the number of rows. ``plot_sheets`` holds pre-rendered
+    images as (sheet suffix, scenario label, PNG per plot name).
+    """
+    wb = Workbook(write_only=True)
+    add_named_styles(wb, _report_styles())
+    for sheet_name in _SHEET_ORDER:
+        table = tables.get(sheet_name)
+        if table is not None:
+            _write_table_sheet(wb, sheet_name, table)
 
     all_bufs: list[BytesIO] = []
-    for i, (scenario_label, df) in enumerate(plot_scenarios):
-        if df is None:
-            continue
-        image_bytes = generate_plot_images(df)
-        sheet_suffix = "" if plot_scenarios == [("", df_for_plots)] else f"_S{i + 1}"
-        add_plot_sheets(
-            image_bytes=image_bytes,
-            scenario_label=scenario_label or None,
-            sheet_suffix=sheet_suffix,
-        )
+    for sheet_suffix, scenario_label, images in plot_sheets:
+        image_bytes = {name: BytesIO(png) for name, png in images.items()}
+        _write_plot_sheets(wb, image_bytes, scenario_label, sheet_suffix)
         all_bufs.extend(image_bytes.values())
 
-    w.close()
+    wb.save(out_path)
     for buf in all_bufs:
         buf.close()
     return out_path
@@ -745,39 +600,67 @@ def export(
 
     tables = _build_tables(df, assumptions, monthly_decisions)
 
-    return _write_excel_report(tables=tables, df_for_plots=df, out_path=out_path)
+    return _write_excel_report(
+        tables=tables,
+        out_path=out_path,
+        plot_sheets=[("", None, _render_report_plots([df])[0])],
+    )
+
+
+@dataclass(frozen=True)
+class _ScenarioParts:
+    name: str
+    tables: dict[str, pd.DataFrame]
+    kpis: list[tuple[str, float | int | None]]
+
+
+def _prepare_scenario(scenario: dict[str, Any]) -> _ScenarioParts:
+    """Tables and KPIs of one scenario of ``export_scenarios``."""
+    name = scenario["name"]
+    df = scenario["df"]
+    tables = _build_tables(df, scenario.get("assumptions"), scenario.get("decisions"))
+    return _ScenarioParts(
+        name=name,
+        tables={
+            sheet_name: _with_scenario_column(table, name)
+            for sheet_name, table in tables.items()
+        },
+        kpis=_kpi_rows(df),
+    )
+
+
+def _combine_tables(parts: Sequence[_ScenarioParts]) -> dict[str, pd.DataFrame]:
+    """Each table of all scenarios, stacked in scenario order."""
+    combined: dict[str, list[pd.DataFrame]] = {}
+    for part in parts:
+        for sheet_name, table in part.tables.items():
+            combined.setdefault(sheet_name, []).append(table)
+    return {
+        sheet_name: pd.concat(frames, ignore_index=True)
+        for sheet_name, frames in combined.items()
+    }
 
 
 def export_scenarios(
     scenario_results: list[dict[str, Any]],
     out_path: str = "OTAI_Simulation_Report.xlsx",
 ) -> str:
+    """Export several scenarios into one report with per-scenario plot sheets.
+
+    The plots of all scenarios are rendered as one batch by the shared
+    ``rendering.chart_renderer``, so its worker pool renders every scenario
+    at once; unchanged plots come from the chart cache.
+    """
     if not scenario_results:
         raise ValueError("scenario_results must contain at least one scenario")
 
-    combined_tables: dict[str, list[pd.DataFrame]] = {}
-    comparison_rows: dict[str, dict[str, float | int | None]] = {}
+    parts = [_prepare_scenario(scenario) for scenario in scenario_results]
+    images = _render_report_plots([scenario["df"] for scenario in scenario_results])
 
-    for scenario in scenario_results:
-        scenario_name = scenario["name"]
-        df = scenario["df"]
-        assumptions = scenario.get("assumptions")
-        decisions = scenario.get("decisions")
-        tables = _build_tables(df, assumptions, decisions)
-        for sheet_name, table in tables.items():
-            combined_tables.setdefault(sheet_name, []).append(
-                _with_scenario_column(table, scenario_name)
-            )
-        comparison_rows[scenario_name] = {
-            metric: value for metric, value in _kpi_rows(df)
-        }
-
-    final_tables: dict[str, pd.DataFrame] = {
-        sheet_name: pd.concat(frames, ignore_index=True)
-        for sheet_name, frames in combined_tables.items()
-    }
+    final_tables = _combine_tables(parts)
 
-    metric_order = [metric for metric, _ in _kpi_rows(scenario_results[0]["df"])]
+    comparison_rows = {part.name: dict(part.kpis) for part in parts}
+    metric_order = [metric for metric, _ in parts[0].kpis]
     comparison_df = pd.DataFrame(
         [
             {
@@ -791,10 +674,315 @@ def export_scenarios(
 
     return _write_excel_report(
         tables=final_tables,
-        df_for_plots=None,
         out_path=out_path,
-        plot_scenarios=[(scenario["name"], scenario["df"]) for scenario in scenario_results],
+        plot_sheets=[
+            (f"_S{i + 1}", part.name or None, part_images)
+            for i, (part, part_images) in enumerate(zip(parts, images, strict=True))
+        ],
+    )
+
+
+_HTML_STYLE = """
+body { font-family: system-ui, sans-serif; margin: 0 auto; max-width: 1400px;
+  padding: 0 24px 48px; color: #1f2937; }
+h1 { margin-top: 32px; }
+nav a { margin-right: 16px; }
+.meta { color: #6b7280; }
+.grid { display: grid; gap: 16px;
+  grid-template-columns: repeat(auto-fit, minmax(560px, 1fr)); }
+.grid.wide { grid-template-columns: 1fr; }
+figure { margin: 0; border: 1px solid #e5e7eb; border-radius: 6px; padding: 8px; }
+figcaption { font-weight: bold; margin-bottom: 4px; }
+.plot { min-height: 450px; }
+.table { overflow-x: auto; }
+table { border-collapse: collapse; font-size: 13px; }
+th, td { border: 1px solid #d1d5db; padding: 4px 8px; text-align: right;
+  white-space: nowrap; }
+th { background: #366092; color: #fff; position: sticky; top: 0; }
+td:first-child, th:first-child { text-align: left; }
+details { margin: 12px 0; }
+summary { cursor: pointer; font-weight: bold; }
+"""
+
+# Draws each figure when it first scrolls into view
+_HTML_SCRIPT = """
+(function () {
+  function draw(el) {
+    var fig = JSON.parse(document.getElementById(el.dataset.figure).textContent);
+    Plotly.newPlot(el, fig.data, fig.layout, {responsive: true, displaylogo: false});
+  }
+  var plots = document.querySelectorAll(".plot[data-figure]");
+  if (!("IntersectionObserver" in window)) {
+    plots.forEach(draw);
+    return;
+  }
+  var observer = new IntersectionObserver(function (entries) {
+    entries.forEach(function (entry) {
+      if (entry.isIntersecting) {
+        observer.unobserve(entry.target);
+        draw(entry.target);
+      }
+    });
+  }, {rootMargin: "300px"});
+  plots.forEach(function (el) { observer.observe(el); });
+})();
+"""
+
+
+def _html_kpi_table(names: list[str], dfs: list[pd.DataFrame]) -> str:
+    kpis = kpis_from_frames(dfs)
+    header = "".join(f"<th>{html.escape(name)}</th>" for name in names)
+    rows = []
+    for key, label in KPI_LABELS.items():
+        cells = "".join(
+            "<td></td>"
+            if np.isnan(value)
+            else f"<td>{value:,.0f}</td>"
+            if key in INTEGER_KPIS
+            else f"<td>{value:,.2f}</td>"
+            for value in kpis[key]
+        )
+        rows.append(f"<tr><td>{html.escape(label)}</td>{cells}</tr>")
+    return (
+        f"<table><thead><tr><th>Metric</th>{header}</tr></thead>"
+        f"<tbody>{''.join(rows)}</tbody></table>"
+    )
+
+
+def _script_json(data: str) -> str:
+    # A literal "</" would end the surrounding <script> element
+    return data.replace("</", "<\\/")
+
+
+def export_html(
+    scenario_results: list[dict[str, Any]],
+    out_path: str = "OTAI_Simulation_Report.html",
+    *,
+    include_plotlyjs: bool | str = True,
+) -> str:
+    """Export scenarios as one interactive, self-contained HTML report.
+
+    ``scenario_results`` has the same shape as for ``export_scenarios``. The
+    report holds the KPI comparison, every report plot per scenario and the
+    report tables. Figures are embedded as plotly JSON (cached per
+    DataFrame in ``rendering.figure_cache``) and drawn in the browser when
+    they scroll into view, so nothing is rasterized here. plotly.js is
+    inlined once; pass ``include_plotlyjs="cdn"`` to load it from the CDN
+    instead.
+    """
+    if not scenario_results:
+        raise ValueError("scenario_results must contain at least one scenario")
+
+    placed = {name for _, _, plot_names, _, _, _ in _PLOT_SHEETS for name in plot_names}
+    plot_fns = {
+        name: fn for name, fn in _report_plot_fns().items() if name in placed
+    }
+    parts = [_prepare_scenario(scenario) for scenario in scenario_results]
+    names = [part.name for part in parts]
+
+    body = [
+        "<h1>OTAI Financial Simulation Report</h1>",
+        (
+            f'<p class="meta">Generated {datetime.now(UTC):%Y-%m-%d %H:%M} UTC'
+            f" &middot; engine version {ENGINE_VERSION}</p>"
+        ),
+        '<nav><a href="#kpis">KPIs</a>'
+        + "".join(
+            f'<a href="#scenario-{i + 1}">{html.escape(name)}</a>'
+            for i, name in enumerate(names)
+        )
+        + '<a href="#tables">Tables</a></nav>',
+        '<section id="kpis"><h2>Key Performance Indicators</h2>'
+        '<div class="table">'
+        + _html_kpi_table(names, [s["df"] for s in scenario_results])
+        + "</div></section>",
+    ]
+    figure_scripts = []
+    for i, scenario in enumerate(scenario_results):
+        figures = rendering.figures_json(plot_fns, scenario["df"])
+        body.append(
+            f'<section id="scenario-{i + 1}"><h2>{html.escape(names[i])}</h2>'
+        )
+        for _, title, plot_names, _, _, _ in _PLOT_SHEETS:
+            grid = "grid wide" if title == "Comprehensive Dashboard Views" else "grid"
+            body.append(f'<h3>{html.escape(title)}</h3><div class="{grid}">')
+            for plot_name in plot_names:
+                if plot_name not in figures:
+                    continue
+                figure_id = f"fig-{i + 1}-{plot_name}"
+                body.append(
+                    f"<figure><figcaption>{plot_name.replace('_', ' ')}</figcaption>"
+                    f'<div class="plot" data-figure="{figure_id}"></div></figure>'
+                )
+                figure_scripts.append(
+                    f'<script type="application/json" id="{figure_id}">'
+                    f"{_script_json(figures[plot_name])}</script>"
+                )
+            body.append("</div>")
+        body.append("</section>")
+
+    tables = _combine_tables(parts)
+    body.append('<section id="tables"><h2>Tables</h2>')
+    for sheet_name in _SHEET_ORDER:
+        table = tables.get(sheet_name)
+        if table is None or sheet_name == "Dashboard_KPIs":
+            continue
+        table_html = table.to_html(
+            index=False, border=0, na_rep="", float_format="{:,.2f}".format
+        )
+        title = _SHEET_SUBTITLES.get(sheet_name, sheet_name)
+        body.append(
+            f"<details><summary>{html.escape(title)}</summary>"
+            f'<div class="table">{table_html}</div></details>'
+        )
+    body.append("</section>")
+
+    if include_plotlyjs == "cdn":
+        plotlyjs = (
+            '<script src="https://cdn.plot.ly/plotly-'
+            f'{plotly.offline.get_plotlyjs_version()}.min.js"></script>'
+        )
+    elif include_plotlyjs:
+        plotlyjs = f"<script>{get_plotlyjs()}</script>"
+    else:
+        plotlyjs = ""
+    document = "\n".join(
+        [
+            "<!DOCTYPE html>",
+            '<html lang="en"><head><meta charset="utf-8">',
+            "<title>OTAI Simulation Report</title>",
+            f"<style>{_HTML_STYLE}</style>",
+            plotlyjs,
+            "</head><body>",
+            *body,
+            *figure_scripts,
+            f"<script>{_HTML_SCRIPT}</script>",
+            "</body></html>",
+        ]
     )
+    atomic_write_text(Path(out_path), document)
+    return out_path
+
+
+BUNDLE_FORMAT_VERSION = 2
+BUNDLE_FORMATS = ("csv.gz", "npz")
+
+
+def _assumptions_row(assumptions: Any) -> dict[str, Any]:
+    if hasattr(assumptions, "model_dump"):
+        a = assumptions.model_dump(mode="json")
+    else:
+        a = _maybe_asdict(assumptions)
+    # Nested values (e.g. pricing milestones) become one JSON string column
+    return {
+        k: canonical_json(v) if isinstance(v, (list, dict)) else v
+        for k, v in a.items()
+    }
+
+
+def _write_bundle_table(
+    out_dir: Path, name: str, table: pd.DataFrame, formats: Sequence[str]
+) -> dict[str, Any]:
+    files = {}
+    if "csv.gz" in formats:
+        buffer = BytesIO()
+        table.to_csv(
+            buffer,
+            index=False,
+            # Formatting the floats dominates; a higher level barely shrinks them
+            compression={"method": "gzip", "compresslevel": 1, "mtime": 0},
+        )
+        files["csv.gz"] = f"{name}.csv.gz"
+        atomic_write_bytes(out_dir / files["csv.gz"], buffer.getvalue())
+    if "npz" in formats:
+        files["npz"] = f"{name}.npz"
+        atomic_write_bytes(
+            out_dir / files["npz"],
+            frame_to_npz(table, {"table": name}, compress=True),
+        )
+    return {
+        "rows": len(table),
+        "columns": {str(column): str(dtype) for column, dtype in table.dtypes.items()},
+        "files": files,
+    }
+
+
+def export_bundle(
+    scenario_results: list[dict[str, Any]],
+    out_dir: str = "OTAI_Simulation_Bundle",
+    *,
+    formats: Sequence[str] = BUNDLE_FORMATS,
+) -> str:
+    """Export scenarios as compressed columnar files for downstream tooling.
+
+    ``scenario_results`` has the same shape as for ``export_scenarios``. Each
+    table is written as ``<table>.csv.gz`` and/or ``<table>.npz`` (readable
+    with ``cache.frame_from_npz``):
+
+    - ``monthly``: the simulation results, one row per scenario and month
+    - ``kpis``: one row per scenario, one column per ``kpis.KPI_LABELS`` key
+    - ``decisions``: the monthly decisions, where scenarios have them
+    - ``assumptions``: one row per scenario, nested values as JSON strings
+
+    Every table starts with a ``scenario`` column indexing the
+    ``scenarios`` list of ``manifest.json``, which also lists the tables'
+    files, row counts and column dtypes. The manifest is written last, so a
+    bundle without one is incomplete. No plots are rendered.
+    """
+    if not scenario_results:
+        raise ValueError("scenario_results must contain at least one scenario")
+    unknown = set(formats) - set(BUNDLE_FORMATS)
+    if unknown:
+        raise ValueError(f"Unknown bundle formats: {sorted(unknown)}")
+
+    columns = list(scenario_results[0]["df"].columns)
+    monthly, decisions, assumptions, scenarios = [], [], [], []
+    for i, scenario in enumerate(scenario_results):
+        df = scenario["df"]
+        if list(df.columns) != columns:
+            raise ValueError(
+                f"Scenario {scenario['name']!r} has different result columns"
+            )
+        monthly.append(df)
+        entry = {"index": i, "name": scenario["name"], "months": len(df)}
+
+        a = scenario.get("assumptions")
+        if a is not None:
+            assumptions.append({"scenario": i, **_assumptions_row(a)})
+            if isinstance(a, Assumptions):
+                entry["assumptions_hash"] = assumptions_fingerprint(a)
+        # One frame for all decisions is much cheaper than one per scenario
+        for month, decision in enumerate(scenario.get("decisions") or []):
+            decisions.append(
+                {"scenario": i, "month": month, **_maybe_asdict(decision)}
+            )
+        scenarios.append(entry)
+
+    lengths = [len(df) for df in monthly]
+    monthly_df = pd.concat(monthly, ignore_index=True)
+    monthly_df.insert(0, "scenario", np.repeat(np.arange(len(monthly)), lengths))
+    kpis = kpis_from_frames(monthly)
+    kpis.insert(0, "scenario", np.arange(len(monthly)))
+    tables = {"monthly": monthly_df, "kpis": kpis}
+    if decisions:
+        tables["decisions"] = pd.DataFrame(decisions)
+    if assumptions:
+        tables["assumptions"] = pd.DataFrame(assumptions)
+
+    path = Path(out_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    manifest = {
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "engine_version": ENGINE_VERSION,
+        "created_at": datetime.now(UTC).isoformat(),
+        "scenarios": scenarios,
+        "tables": {
+            name: _write_bundle_table(path, name, table, formats)
+            for name, table in tables.items()
+        },
+    }
+    atomic_write_text(path / "manifest.json", json.dumps(manifest, indent=2))
+    return str(path)
 
 
 def _month_labels(n: int, start_year: int = 2026, start_month: int = 2) -> list[str]:
@@ -806,6 +994,31 @@ def _month_labels(n: int, start_year: int = 2026, start_month: int = 2) -> list[
     ]
 
 
+def _budget_styles() -> list[NamedStyle]:
+    purple = "4A1A6B"
+    return [
+        NamedStyle(
+            "budget_header",
+            fill=PatternFill("solid", fgColor=purple),
+            font=Font(color="FFFFFF", bold=True, size=11),
+            alignment=_HEADER_ALIGN,
+        ),
+        NamedStyle(
+            "budget_title",
+            font=Font(size=16, bold=True, color=purple),
+            alignment=_CENTER,
+        ),
+        NamedStyle(
+            "budget_section",
+            font=Font(size=14, bold=True, color=purple),
+            alignment=_CENTER,
+        ),
+        NamedStyle("budget_chart_title", font=Font(size=13, bold=True, color=purple)),
+        NamedStyle("budget_money", number_format='#,##0" €"'),
+        NamedStyle("budget_count", number_format="#,##0.0"),
+    ]
+
+
 def export_simple_budget(
     df: pd.DataFrame,
     assumptions: Any,
@@ -891,141 +1104,124 @@ def export_simple_budget(
         }
     )
 
-    # Money columns in plan (columns B through V = indices 2–22)
-    plan_money_cols = list(range(2, 23))
-    # Count columns (W onward = indices 23–32)
-    plan_count_cols = list(range(23, 33))
-
     # --- Sheet 3: Assumptions ---
     assumptions_table = _assumptions_df(assumptions)
 
-    # --- Write sheets ---
-    w = pd.ExcelWriter(out_path, engine="openpyxl")
-    kpis.to_excel(w, index=False, sheet_name="Overview")
-    plan.to_excel(w, index=False, sheet_name="Detailed Monthly Plan")
-    if assumptions_table is not None:
-        assumptions_table.to_excel(w, index=False, sheet_name="Assumptions")
-
-    # --- Styling ---
-    wb = w.book
-    header_fill = PatternFill("solid", fgColor="4A1A6B")
-    header_font = Font(color="FFFFFF", bold=True, size=11)
-    header_align = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    title_font = Font(size=16, bold=True, color="4A1A6B")
-    section_font = Font(size=14, bold=True, color="4A1A6B")
-
-    for ws in wb.worksheets:
-        for i, col in enumerate(
-            ws.iter_cols(min_row=1, max_row=ws.max_row, min_col=1, max_col=ws.max_column),
-            start=1,
-        ):
-            max_len = max((len(str(c.value or "")) for c in col), default=10)
-            ws.column_dimensions[get_column_letter(i)].width = min(42, max(12, max_len + 2))
-        for cell in ws[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = header_align
-        ws.freeze_panes = "A2"
-
-    # --- Detailed Monthly Plan formatting ---
-    ws_plan = wb["Detailed Monthly Plan"]
-    for col_idx in plan_money_cols:
-        for row_idx in range(2, ws_plan.max_row + 1):
-            ws_plan.cell(row=row_idx, column=col_idx).number_format = '#,##0" €"'
-    for col_idx in plan_count_cols:
-        for row_idx in range(2, ws_plan.max_row + 1):
-            ws_plan.cell(row=row_idx, column=col_idx).number_format = '#,##0.0'
-
-    # Plan title row
-    ws_plan.insert_rows(1)
-    ws_plan.merge_cells(f"A1:{get_column_letter(ws_plan.max_column)}1")
-    ws_plan["A1"] = "Detailed Monthly Plan — Feb 2026 to Jan 2028"
-    ws_plan["A1"].font = title_font
-    ws_plan["A1"].alignment = Alignment(horizontal="center")
-    ws_plan.row_dimensions[1].height = 40
+    # --- Plots on Overview page ---
+    plot_fns = {
+        "Simulation Overview": partial(plot_results, save_path=None),
+        "Revenue & Cashflow": plot_revenue_cashflow,
+        "Cash Position": plot_cash_position,
+        "Net Cashflow": plot_net_cashflow,
+        "Product Value": plot_product_value,
+        "TTM Revenue": plot_ttm_revenue,
+        "Market Cap": plot_market_cap,
+        "User Growth (Stacked)": plot_user_growth_stacked,
+        "Revenue Breakdown": plot_revenue_breakdown,
+        "Revenue Split by Source": partial(plot_revenue_split, embedded=True),
+        "Costs Breakdown": plot_costs_breakdown,
+        "Cash & Burn Rate": plot_cash_burn_rate,
+        "Debt, Cash & Interest Rate": plot_debt_interest_cash,
+        "Acquisition Channels": plot_customer_acquisition_channels,
+    }
 
-    # --- Overview sheet ---
-    ws_ov = wb["Overview"]
+    # Figures are only built and rendered for images not in the chart cache
+    rendered_plots = [
+        (plot_title, BytesIO(png))
+        for plot_title, png in rendering.render_plots_png(
+            plot_fns, df, width=1400, height=800, scale=2
+        ).items()
+    ]
+
+    # --- Write sheets ---
+    wb = Workbook(write_only=True)
+    add_named_styles(wb, _budget_styles())
 
-    # Title row
-    ws_ov.insert_rows(1)
-    ws_ov.merge_cells("A1:B1")
-    ws_ov["A1"] = "OTAI Conservative Budget Plan (24 Months)"
-    ws_ov["A1"].font = title_font
-    ws_ov["A1"].alignment = Alignment(horizontal="center")
+    # --- Overview sheet: KPIs, monthly summary and charts ---
+    ws_ov = wb.create_sheet("Overview")
+    set_column_widths(ws_ov, column_widths(kpis, min_width=12, max_width=42))
     ws_ov.row_dimensions[1].height = 40
+    ws_ov.merged_cells.add("A1:B1")
+    ws_ov.freeze_panes = "A3"
+    section = cell_factory(ws_ov, "budget_section")
+    header = cell_factory(ws_ov, "budget_header")
+    plain = cell_factory(ws_ov)
 
-    # Simple summary table below KPIs
-    sum_start = ws_ov.max_row + 3
-    ws_ov.merge_cells(f"A{sum_start}:E{sum_start}")
-    ws_ov[f"A{sum_start}"] = "Monthly Summary"
-    ws_ov[f"A{sum_start}"].font = section_font
-    ws_ov[f"A{sum_start}"].alignment = Alignment(horizontal="center")
-
-    hdr_row = sum_start + 1
-    for ci, hdr in enumerate(summary.columns, start=1):
-        cell = ws_ov.cell(row=hdr_row, column=ci, value=hdr)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = header_align
-    for ri, row_data in enumerate(summary.itertuples(index=False), start=hdr_row + 1):
-        for ci, val in enumerate(row_data, start=1):
-            cell = ws_ov.cell(row=ri, column=ci, value=val)
-            if ci >= 2:
-                cell.number_format = '#,##0" €"'
+    title = cell_factory(ws_ov, "budget_title")
+    ws_ov.append([title("OTAI Conservative Budget Plan (24 Months)")])
+    row = 1 + append_table(ws_ov, kpis, header=header, body=plain)
 
-    # --- Plots on Overview page ---
-    plot_fns = {
-        "Simulation Overview": lambda: plot_results(df, save_path=None),
-        "Revenue & Cashflow": lambda: plot_revenue_cashflow(df),
-        "Cash Position": lambda: plot_cash_position(df),
-        "Net Cashflow": lambda: plot_net_cashflow(df),
-        "Product Value": lambda: plot_product_value(df),
-        "TTM Revenue": lambda: plot_ttm_revenue(df),
-        "Market Cap": lambda: plot_market_cap(df),
-        "User Growth (Stacked)": lambda: plot_user_growth_stacked(df),
-        "Revenue Breakdown": lambda: plot_revenue_breakdown(df),
-        "Revenue Split by Source": lambda: plot_revenue_split(df, embedded=True),
-        "Costs Breakdown": lambda: plot_costs_breakdown(df),
-        "Cash & Burn Rate": lambda: plot_cash_burn_rate(df),
-        "Debt, Cash & Interest Rate": lambda: plot_debt_interest_cash(df),
-        "Acquisition Channels": lambda: plot_customer_acquisition_channels(df),
-    }
+    # Simple summary table below KPIs
+    ws_ov.append([])
+    ws_ov.append([])
+    row += 3
+    ws_ov.merged_cells.add(f"A{row}:E{row}")
+    ws_ov.append([section("Monthly Summary")])
+    row += append_table(
+        ws_ov,
+        summary,
+        header=header,
+        body=cell_factory(ws_ov, "budget_money"),
+        columns={"Month": plain},
+    )
 
-    # Generate all figures first, then render to PNG in parallel
-    plot_items = []
-    for plot_title, plot_fn in plot_fns.items():
-        fig = plot_fn()
-        if fig is not None:
-            plot_items.append((plot_title, fig))
-
-    def _render_budget(title_fig: tuple[str, go.Figure]) -> tuple[str, BytesIO]:
-        title, fig = title_fig
-        buf = BytesIO()
-        buf.write(pio.to_image(fig, format="png", width=1400, height=800, scale=2))
-        buf.seek(0)
-        return title, buf
-
-    rendered_plots: list[tuple[str, BytesIO]] = []
-    with ThreadPoolExecutor() as pool:
-        rendered_plots = list(pool.map(_render_budget, plot_items))
-
-    current_row = ws_ov.max_row + 3
-    ws_ov.merge_cells(f"A{current_row}:L{current_row}")
-    ws_ov[f"A{current_row}"] = "Key Charts"
-    ws_ov[f"A{current_row}"].font = section_font
-    ws_ov[f"A{current_row}"].alignment = Alignment(horizontal="center")
-    current_row += 2
+    ws_ov.append([])
+    ws_ov.append([])
+    row += 3
+    ws_ov.merged_cells.add(f"A{row}:L{row}")
+    ws_ov.append([section("Key Charts")])
+    ws_ov.append([])
+    row += 1
 
+    chart_title = cell_factory(ws_ov, "budget_chart_title")
     for plot_title, buf in rendered_plots:
-        ws_ov.cell(row=current_row, column=1, value=plot_title).font = Font(
-            size=13, bold=True, color="4A1A6B",
-        )
+        ws_ov.append([chart_title(plot_title)])
+        row += 1
         img = Image(buf)
         img.width = 900
         img.height = 500
-        ws_ov.add_image(img, f"A{current_row + 1}")
-        current_row += 28
+        ws_ov.add_image(img, f"A{row + 1}")
+        # Leave the rows under the image empty up to the next chart title
+        for _ in range(27):
+            ws_ov.append([])
+        row += 27
+
+    # --- Detailed Monthly Plan ---
+    ws_plan = wb.create_sheet("Detailed Monthly Plan")
+    set_column_widths(ws_plan, column_widths(plan, min_width=12, max_width=42))
+    ws_plan.row_dimensions[1].height = 40
+    ws_plan.merged_cells.add(f"A1:{get_column_letter(len(plan.columns))}1")
+    ws_plan.freeze_panes = "A3"
+    title = cell_factory(ws_plan, "budget_title")
+    ws_plan.append([title("Detailed Monthly Plan — Feb 2026 to Jan 2028")])
+    # Euro amounts get a currency format, user and lead counts one decimal
+    money = cell_factory(ws_plan, "budget_money")
+    append_table(
+        ws_plan,
+        plan,
+        header=cell_factory(ws_plan, "budget_header"),
+        body=cell_factory(ws_plan, "budget_count"),
+        columns={
+            "Month": cell_factory(ws_plan),
+            **{c: money for c in plan.columns if c.endswith("(€)")},
+        },
+    )
 
-    w.close()
+    # --- Assumptions ---
+    if assumptions_table is not None:
+        ws_a = wb.create_sheet("Assumptions")
+        set_column_widths(
+            ws_a, column_widths(assumptions_table, min_width=12, max_width=42)
+        )
+        ws_a.freeze_panes = "A2"
+        append_table(
+            ws_a,
+            assumptions_table,
+            header=cell_factory(ws_a, "budget_header"),
+            body=cell_factory(ws_a),
+        )
+
+    wb.save(out_path)
+    for _, buf in rendered_plots:
+        buf.close()
     return out_path
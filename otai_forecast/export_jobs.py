@@ -0,0 +1,176 @@
+"""Excel report exports as background jobs, deduplicated and cached.
+
+The Streamlit app submits an export only when the user asks for one and
+polls the job until the file is ready::
+
+    job = export_queue.submit(df, assumptions, decisions)
+    if job.status == "done":
+        data = job.read_bytes()
+
+Jobs are keyed by a fingerprint of the results, assumptions, decisions and
+export code, so submitting the same export twice returns the same job.
+Finished reports are kept in ``data/cache/exports`` and survive restarts.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import tempfile
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
+from . import excel, kpis, plots, rendering
+from . import export as export_module
+from .cache import DiskLRUCache
+from .fingerprint import (
+    assumptions_fingerprint,
+    dataframe_fingerprint,
+    decisions_fingerprint,
+    json_fingerprint,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .models import Assumptions, MonthlyDecision
+
+EXPORT_CACHE_DIR = (
+    Path(__file__).resolve().parent.parent / "data" / "cache" / "exports"
+)
+EXPORT_CACHE_MAX_BYTES = 512 * 2**20
+
+JobStatus = Literal["queued", "running", "done", "failed"]
+
+# Reports change with the code that builds them, not only with the data
+_EXPORT_SOURCE_MODULES = (excel, export_module, kpis, plots, rendering)
+_EXPORT_SOURCE_HASH = hashlib.sha256(
+    b"".join(Path(module.__file__).read_bytes() for module in _EXPORT_SOURCE_MODULES)
+).hexdigest()
+
+
+@dataclass
+class ExportJob:
+    key: str
+    path: Path
+    status: JobStatus = "queued"
+    error: str | None = None
+    submitted_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    @property
+    def duration_s(self) -> float | None:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    def read_bytes(self) -> bytes:
+        return self.path.read_bytes()
+
+
+class ExportJobQueue:
+    """Runs exports on a small fixed pool of background threads."""
+
+    def __init__(
+        self,
+        cache: DiskLRUCache | None = None,
+        *,
+        workers: int = 1,
+    ):
+        self.cache = cache or DiskLRUCache(
+            EXPORT_CACHE_DIR, EXPORT_CACHE_MAX_BYTES, suffix=".xlsx"
+        )
+        self._jobs: dict[str, ExportJob] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="export"
+        )
+
+    @staticmethod
+    def key(
+        df: pd.DataFrame,
+        assumptions: Assumptions | None = None,
+        decisions: list[MonthlyDecision] | None = None,
+    ) -> str:
+        return json_fingerprint(
+            {
+                "kind": "report",
+                "code": _EXPORT_SOURCE_HASH,
+                "df": dataframe_fingerprint(df),
+                "assumptions": (
+                    None
+                    if assumptions is None
+                    else assumptions_fingerprint(assumptions)
+                ),
+                "decisions": (
+                    None if decisions is None else decisions_fingerprint(decisions)
+                ),
+            }
+        )
+
+    def get(self, key: str) -> ExportJob | None:
+        """The job for ``key``; a report cached on disk counts as a done job."""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None and self.cache.path(key).exists():
+                job = ExportJob(key, self.cache.path(key), status="done")
+                self._jobs[key] = job
+            return job
+
+    def submit(
+        self,
+        df: pd.DataFrame,
+        assumptions: Assumptions | None = None,
+        decisions: list[MonthlyDecision] | None = None,
+    ) -> ExportJob:
+        """Queue an export unless the same one is queued, running or done."""
+        key = self.key(df, assumptions, decisions)
+        job = self.get(key)
+        with self._lock:
+            if job is not None and job.status == "done" and not job.path.exists():
+                job = None  # Evicted from the cache since
+            if job is not None and job.status != "failed":
+                return job
+            job = ExportJob(key, self.cache.path(key))
+            self._jobs[key] = job
+        decisions = None if decisions is None else list(decisions)
+        self._pool.submit(self._run, job, df.copy(), assumptions, decisions)
+        return job
+
+    def _run(
+        self,
+        job: ExportJob,
+        df: pd.DataFrame,
+        assumptions: Assumptions | None,
+        decisions: list[MonthlyDecision] | None,
+    ) -> None:
+        job.started_at = time.time()
+        job.status = "running"
+        try:
+            with tempfile.TemporaryDirectory() as td:
+                out_path = Path(td) / "OTAI_Simulation_Report.xlsx"
+                export_module.export(
+                    df,
+                    out_path=str(out_path),
+                    assumptions=assumptions,
+                    monthly_decisions=decisions,
+                )
+                self.cache.put(job.key, out_path.read_bytes())
+        except Exception:
+            job.error = traceback.format_exc()
+            job.status = "failed"
+        else:
+            job.status = "done"
+        finally:
+            job.finished_at = time.time()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+export_queue = ExportJobQueue()
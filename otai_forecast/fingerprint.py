@@ -0,0 +1,68 @@
+"""Stable content fingerprints used as cache and storage keys."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import weakref
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .models import Assumptions, MonthlyDecision
+
+# Assumptions are frozen, so a fingerprint never changes for an instance.
+# Keyed by id() and dropped when the instance is garbage collected, before
+# its id can be reused.
+_ASSUMPTIONS_FINGERPRINTS: dict[int, str] = {}
+
+_DECISION_FIELDS = tuple(MonthlyDecision.model_fields)
+
+
+def canonical_json(data: Any) -> str:
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+
+
+def json_fingerprint(data: Any) -> str:
+    """SHA-256 of the canonical (sorted, compact, ASCII) JSON of ``data``."""
+    return hashlib.sha256(canonical_json(data).encode("utf-8")).hexdigest()
+
+
+def _compute_assumptions_fingerprint(assumptions: Assumptions) -> str:
+    return json_fingerprint(assumptions.model_dump(mode="json"))
+
+
+def assumptions_fingerprint(assumptions: Assumptions) -> str:
+    """SHA-256 of the canonical JSON of ``assumptions``, memoized per instance."""
+    key = id(assumptions)
+    fingerprint = _ASSUMPTIONS_FINGERPRINTS.get(key)
+    if fingerprint is None:
+        fingerprint = _compute_assumptions_fingerprint(assumptions)
+        if _ASSUMPTIONS_FINGERPRINTS.setdefault(key, fingerprint) is fingerprint:
+            weakref.finalize(assumptions, _ASSUMPTIONS_FINGERPRINTS.pop, key, None)
+    return fingerprint
+
+
+def decisions_fingerprint(decisions: list[MonthlyDecision]) -> str:
+    """SHA-256 of the decisions' budgets as one float64 array."""
+    budgets = np.array(
+        [[getattr(d, field) for field in _DECISION_FIELDS] for d in decisions],
+        dtype=np.float64,
+    )
+    return hashlib.sha256(budgets.tobytes()).hexdigest()
+
+
+def dataframe_fingerprint(df: pd.DataFrame) -> str:
+    """SHA-256 of a DataFrame's column names, dtypes, index and values."""
+    digest = hashlib.sha256()
+    header = [[str(column), dtype.str] for column, dtype in df.dtypes.items()]
+    digest.update(canonical_json(header).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df.index).to_numpy().tobytes())
+    for i in range(df.shape[1]):
+        column = df.iloc[:, i]
+        values = column.to_numpy()
+        if values.dtype.kind not in "biufcmM":
+            values = pd.util.hash_pandas_object(column, index=False).to_numpy()
+        digest.update(np.ascontiguousarray(values).tobytes())
+    return digest.hexdigest()
@@ -0,0 +1,200 @@
+"""Scenario KPIs computed in one vectorized pass, for one run or many.
+
+The report, the Streamlit results tab and stored optimization summaries all
+read their KPIs from here::
+
+    compute_kpis(df)["end_cash"]
+    kpis_from_frames([df_a, df_b])  # one row per scenario
+    kpis_from_arrays(run_simulation_batch(draws, decisions), months_axis=0)
+
+``kpis_from_arrays`` is the core: it takes ``(runs, months)`` arrays keyed
+like the result columns and reduces all of them at once. KPIs whose columns
+are missing come out as NaN (None from ``compute_kpis``).
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+KPI_LABELS = {
+    "months": "Months",
+    "start_cash": "Starting cash (€)",
+    "end_cash": "Ending cash (€)",
+    "end_debt": "Ending debt (€)",
+    "min_cash": "Min cash (€)",
+    "min_cash_month": "Month of min cash",
+    "first_negative_cash_month": "First month cash < 0",
+    "total_revenue": "Total revenue (€)",
+    "avg_revenue_last_3_months": "Avg revenue last 3 months (€)",
+    "total_costs_ex_tax": "Total costs ex tax (€)",
+    "total_tax": "Total tax (€)",
+    "total_profit_after_tax": "Total profit after tax (€)",
+    "end_free_active": "End Free active",
+    "end_pro_active": "End Pro active",
+    "end_ent_active": "End Enterprise active",
+    "total_ads_spend": "Total Ads spend (€)",
+    "total_seo_spend": "Total SEO spend (€)",
+    "total_direct_outreach_spend": "Total Direct outreach spend (€)",
+    "end_product_value": "End product value",
+    "end_revenue_ttm": "End TTM revenue (€)",
+    "end_market_cap": "End market cap (€)",
+    "total_leads": "Total leads",
+}
+
+# The KPI rows of the Excel report, in order
+REPORT_KPIS = tuple(KPI_LABELS)[:18]
+
+# Months are reported as whole numbers
+INTEGER_KPIS = frozenset({"months", "min_cash_month", "first_negative_cash_month"})
+
+# Result columns the KPIs are computed from
+KPI_COLUMNS = (
+    "month",
+    "cash",
+    "debt",
+    "revenue_total",
+    "costs_ex_tax",
+    "tax",
+    "profit_bt",
+    "free_active",
+    "pro_active",
+    "ent_active",
+    "ads_spend",
+    "organic_marketing_spend",
+    "direct_candidate_outreach_spend",
+    "product_value",
+    "revenue_ttm",
+    "market_cap",
+    "leads_total",
+)
+
+
+def kpis_from_arrays(
+    columns: Mapping[str, np.ndarray], *, months_axis: int = 1
+) -> dict[str, np.ndarray]:
+    """All KPIs for a batch of runs, one ``(runs,)`` array per KPI.
+
+    ``columns`` maps result column names to 2-D arrays with the months along
+    ``months_axis``; use ``months_axis=0`` for ``run_simulation_batch``
+    output. Entries that are not result columns (e.g. ``valid``) are ignored.
+    """
+    arrays = {
+        name: np.asarray(columns[name], dtype=float)
+        for name in KPI_COLUMNS
+        if name in columns
+    }
+    if months_axis == 0:
+        arrays = {name: values.T for name, values in arrays.items()}
+    if not arrays:
+        raise ValueError("columns contains none of the KPI result columns")
+    n_runs, n_months = next(iter(arrays.values())).shape
+    rows = np.arange(n_runs)
+    missing = np.full(n_runs, np.nan)
+    if n_months == 0:
+        return {key: missing.copy() for key in KPI_LABELS}
+
+    month = arrays.get("month")
+    if month is None:
+        month = np.broadcast_to(np.arange(n_months, dtype=float), (n_runs, n_months))
+
+    def first(name: str) -> np.ndarray:
+        values = arrays.get(name)
+        return missing if values is None else values[:, 0]
+
+    def last(name: str) -> np.ndarray:
+        values = arrays.get(name)
+        return missing if values is None else values[:, -1]
+
+    def total(name: str) -> np.ndarray:
+        values = arrays.get(name)
+        return missing if values is None else values.sum(axis=1)
+
+    kpis = {
+        "months": month.max(axis=1) + 1,
+        "start_cash": first("cash"),
+        "end_cash": last("cash"),
+        "end_debt": last("debt"),
+        "min_cash": missing,
+        "min_cash_month": missing,
+        "first_negative_cash_month": missing,
+        "total_revenue": total("revenue_total"),
+        "avg_revenue_last_3_months": missing,
+        "total_costs_ex_tax": total("costs_ex_tax"),
+        "total_tax": total("tax"),
+        "total_profit_after_tax": missing,
+        "end_free_active": last("free_active"),
+        "end_pro_active": last("pro_active"),
+        "end_ent_active": last("ent_active"),
+        "total_ads_spend": total("ads_spend"),
+        "total_seo_spend": total("organic_marketing_spend"),
+        "total_direct_outreach_spend": total("direct_candidate_outreach_spend"),
+        "end_product_value": last("product_value"),
+        "end_revenue_ttm": last("revenue_ttm"),
+        "end_market_cap": last("market_cap"),
+        "total_leads": total("leads_total"),
+    }
+
+    cash = arrays.get("cash")
+    if cash is not None:
+        kpis["min_cash"] = cash.min(axis=1)
+        kpis["min_cash_month"] = month[rows, cash.argmin(axis=1)]
+        negative = cash < 0
+        kpis["first_negative_cash_month"] = np.where(
+            negative.any(axis=1), month[rows, negative.argmax(axis=1)], np.nan
+        )
+    revenue = arrays.get("revenue_total")
+    if revenue is not None and n_months >= 3:
+        kpis["avg_revenue_last_3_months"] = revenue[:, -3:].mean(axis=1)
+    if "profit_bt" in arrays and "tax" in arrays:
+        kpis["total_profit_after_tax"] = (arrays["profit_bt"] - arrays["tax"]).sum(
+            axis=1
+        )
+    return kpis
+
+
+def _frame_arrays(dfs: Sequence[pd.DataFrame]) -> dict[str, np.ndarray]:
+    return {
+        name: np.stack([df[name].to_numpy(dtype=float) for df in dfs])
+        for name in KPI_COLUMNS
+        if all(name in df.columns for df in dfs)
+    }
+
+
+def kpis_from_frames(dfs: Sequence[pd.DataFrame]) -> pd.DataFrame:
+    """One row of KPIs per result frame, columns in ``KPI_LABELS`` order.
+
+    Frames of equal length are stacked and reduced together; otherwise each
+    length is reduced as its own batch.
+    """
+    if not dfs:
+        return pd.DataFrame(columns=list(KPI_LABELS), dtype=float)
+    by_length: dict[int, list[int]] = {}
+    for i, df in enumerate(dfs):
+        by_length.setdefault(len(df), []).append(i)
+    out = pd.DataFrame(index=range(len(dfs)), columns=list(KPI_LABELS), dtype=float)
+    for indices in by_length.values():
+        kpis = kpis_from_arrays(_frame_arrays([dfs[i] for i in indices]))
+        out.loc[indices, list(kpis)] = np.column_stack(list(kpis.values()))
+    return out
+
+
+def compute_kpis(df: pd.DataFrame) -> dict[str, float | int | None]:
+    """KPIs of one result frame; months as ints, unavailable KPIs as None."""
+    arrays = _frame_arrays([df])
+    kpis = kpis_from_arrays(arrays) if arrays else {}
+    values: dict[str, float | int | None] = {}
+    for key in KPI_LABELS:
+        value = float(kpis[key][0]) if key in kpis else np.nan
+        if np.isnan(value):
+            values[key] = None
+        elif key in INTEGER_KPIS:
+            values[key] = int(value)
+        else:
+            values[key] = value
+    return values
@@ -3,10 +3,35 @@ from __future__ import annotations
 import math
 from typing import Any
 
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import BaseModel, Field, ValidationInfo, field_validator, model_validator
 
 Month = int
 
+_CONVERSION_RATE_FIELDS = (
+    "conv_web_to_lead",
+    "conv_website_lead_to_free",
+    "conv_website_lead_to_pro",
+    "conv_website_lead_to_ent",
+    "direct_contacted_demo_conversion",
+    "direct_demo_appointment_conversion_to_free",
+    "direct_demo_appointment_conversion_to_pro",
+    "direct_demo_appointment_conversion_to_ent",
+    "conv_free_to_pro",
+    "conv_pro_to_ent",
+)
+_CHURN_RATE_FIELDS = ("churn_free", "churn_pro", "churn_ent")
+
+# Caps for realistic business modeling, enforced by the Assumptions validators
+# on top of the Field bounds
+ASSUMPTION_UPPER_BOUNDS: dict[str, float] = {
+    **dict.fromkeys(_CONVERSION_RATE_FIELDS, 0.5),
+    **dict.fromkeys(_CHURN_RATE_FIELDS, 0.3),
+    "cpc_base": 100.0,
+    "months": 120,
+    "starting_cash": 100_000_000,
+    "market_cap_multiple": 100.0,
+}
+
 
 class PricingMilestone(BaseModel):
     product_value_min: float = Field(ge=0, description="Minimum product value to reach this milestone.")
@@ -182,48 +207,51 @@ class Assumptions(BaseModel):
         return self
 
     # Add reasonable upper bounds for critical business metrics
-    @field_validator('conv_web_to_lead', 'conv_website_lead_to_free', 'conv_website_lead_to_pro', 'conv_website_lead_to_ent',
-                     'direct_contacted_demo_conversion', 'direct_demo_appointment_conversion_to_free',
-                     'direct_demo_appointment_conversion_to_pro', 'direct_demo_appointment_conversion_to_ent',
-                     'conv_free_to_pro', 'conv_pro_to_ent')
+    @field_validator(*_CONVERSION_RATE_FIELDS)
     @classmethod
-    def conversion_rates_reasonable_upper_bound(cls, v: float) -> float:
-        if v > 0.5:  # No conversion rate should exceed 50%
-            raise ValueError('Conversion rates must be <= 0.5 (50%) for realistic business modeling')
+    def conversion_rates_reasonable_upper_bound(cls, v: float, info: ValidationInfo) -> float:
+        bound = ASSUMPTION_UPPER_BOUNDS[info.field_name]
+        if v > bound:
+            raise ValueError(
+                f'{info.field_name} must be <= {bound} ({bound:.0%}) for realistic business modeling'
+            )
         return v
 
-    @field_validator('churn_free', 'churn_pro', 'churn_ent')
+    @field_validator(*_CHURN_RATE_FIELDS)
     @classmethod
-    def churn_rates_reasonable_upper_bound(cls, v: float) -> float:
-        if v > 0.3:  # Churn rates shouldn't exceed 30% per month
-            raise ValueError('Churn rates must be <= 0.3 (30%) per month for realistic business modeling')
+    def churn_rates_reasonable_upper_bound(cls, v: float, info: ValidationInfo) -> float:
+        bound = ASSUMPTION_UPPER_BOUNDS[info.field_name]
+        if v > bound:
+            raise ValueError(
+                f'{info.field_name} must be <= {bound} ({bound:.0%}) per month for realistic business modeling'
+            )
         return v
 
     @field_validator('cpc_base')
     @classmethod
     def cpc_reasonable_upper_bound(cls, v: float) -> float:
-        if v > 100:  # CPC shouldn't exceed €100
+        if v > ASSUMPTION_UPPER_BOUNDS["cpc_base"]:
             raise ValueError('CPC must be <= €100 for realistic business modeling')
         return v
 
     @field_validator('months')
     @classmethod
     def months_reasonable_upper_bound(cls, v: int) -> int:
-        if v > 120:  # Max 10 years
+        if v > ASSUMPTION_UPPER_BOUNDS["months"]:
             raise ValueError('Simulation duration must be <= 120 months (10 years)')
         return v
 
     @field_validator('starting_cash')
     @classmethod
     def starting_cash_reasonable_upper_bound(cls, v: float) -> float:
-        if v > 100_000_000:  # Max €100M starting cash
+        if v > ASSUMPTION_UPPER_BOUNDS["starting_cash"]:
             raise ValueError('Starting cash must be <= €100M for realistic business modeling')
         return v
 
     @field_validator('market_cap_multiple')
     @classmethod
     def market_cap_multiple_reasonable_bound(cls, v: float) -> float:
-        if v > 100:  # Max 100x revenue multiple
+        if v > ASSUMPTION_UPPER_BOUNDS["market_cap_multiple"]:
             raise ValueError('Market cap multiple must be <= 100 for realistic business modeling')
         return v
 
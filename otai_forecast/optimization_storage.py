@@ -1,37 +1,307 @@
+"""Stored optimization results in ``data/optimizations``.
+
+Each result is one ``optimization_<assumptions hash>.json`` payload file in
+compact JSON, next to a ``results_<assumptions hash>.npz`` file with the full
+monthly result table of its decisions. The scenario definitions a payload was
+saved with are shared, content-addressed records in ``scenarios/``. Older
+``.yaml`` payloads are still read transparently; convert them once with::
+
+    python -m otai_forecast.optimization_storage migrate
+
+A small JSON catalog (``index.json``) holds the hash, scenario name, saved_at
+and summary KPIs of every payload, so results can be listed and summarized
+without parsing the payloads. Rebuild it with::
+
+    python -m otai_forecast.optimization_storage reindex
+
+Results of assumptions that no configured scenario uses any more are moved to
+``archive/`` (optionally under a size budget) with::
+
+    python -m otai_forecast.optimization_storage compact --max-mb 50
+"""
+
 from __future__ import annotations
 
+import argparse
+import copy
 import hashlib
 import json
-from collections.abc import Iterable
-from datetime import datetime
+import os
+import threading
+import time
+from datetime import UTC, datetime
+from functools import cached_property, lru_cache, partial
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import pandas as pd
 import yaml
 
+from .cache import cached_run_simulation_df, frame_from_npz, frame_to_npz
+from .config import ALL_SCENARIOS
+from .fileio import atomic_write_bytes, atomic_write_text, file_lock
+from .fingerprint import (
+    assumptions_fingerprint,
+    canonical_json,
+    decisions_fingerprint,
+    json_fingerprint,
+)
+from .kpis import compute_kpis
 from .models import Assumptions, MonthlyDecision, ScenarioAssumptions
+from .simulator import ENGINE_VERSION
+from .trial_archive import (
+    compact_trial_history,
+    delete_trial_history,
+    move_trial_history,
+    trial_archive_dir,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    import pandas as pd
 
 
 def assumptions_hash(assumptions: Assumptions) -> str:
-    payload = json.dumps(
-        assumptions.model_dump(mode="json"),
-        sort_keys=True,
-        separators=(",", ":"),
-        ensure_ascii=True,
-    )
-    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return assumptions_fingerprint(assumptions)
+
+
+INDEX_FILENAME = "index.json"
+INDEX_VERSION = 1
+_PAYLOAD_PREFIX = "optimization_"
+_PAYLOAD_SUFFIXES = (".json", ".yaml")
+SCENARIOS_DIRNAME = "scenarios"
+ARCHIVE_DIRNAME = "archive"
+# Payloads reference their scenario definitions by record hash
+_SCENARIO_REFS_KEY = "assumption_scenario_refs"
+_SCENARIO_RECORD_GRACE_S = 3600.0
 
 
 def optimization_path(base_dir: Path, assumption_hash: str) -> Path:
-    return base_dir / f"optimization_{assumption_hash}.yaml"
+    return base_dir / f"{_PAYLOAD_PREFIX}{assumption_hash}.json"
 
 
-def load_optimization(base_dir: Path, assumption_hash: str) -> dict | None:
-    path = optimization_path(base_dir, assumption_hash)
-    if not path.exists():
+def results_path(base_dir: Path, assumption_hash: str) -> Path:
+    return base_dir / f"results_{assumption_hash}.npz"
+
+
+def _legacy_optimization_path(base_dir: Path, assumption_hash: str) -> Path:
+    return base_dir / f"{_PAYLOAD_PREFIX}{assumption_hash}.yaml"
+
+
+def index_path(base_dir: Path) -> Path:
+    return base_dir / INDEX_FILENAME
+
+
+def _lock_path(base_dir: Path, name: str) -> Path:
+    return base_dir / f".{name}.lock"
+
+
+def _payload_lock(base_dir: Path, assumption_hash: str) -> Path:
+    return _lock_path(base_dir, f"{_PAYLOAD_PREFIX}{assumption_hash}")
+
+
+def scenario_record_path(base_dir: Path, record_hash: str) -> Path:
+    return base_dir / SCENARIOS_DIRNAME / f"{record_hash}.json"
+
+
+def _store_scenario_record(base_dir: Path, scenario: dict[str, Any]) -> str:
+    text = canonical_json(scenario)
+    record_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    path = scenario_record_path(base_dir, record_hash)
+    # Content-addressed: an existing record already holds exactly this text.
+    # Touching it keeps compaction from collecting it before the payload lands.
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(path, text)
+    return record_hash
+
+
+def _load_scenario_record(base_dir: Path, record_hash: str) -> dict | None:
+    try:
+        return json.loads(
+            scenario_record_path(base_dir, record_hash).read_text(encoding="utf-8")
+        )
+    except (OSError, ValueError):
         return None
-    return yaml.safe_load(path.read_text(encoding="utf-8"))
+
+
+def _read_raw_payload(path: Path) -> dict:
+    """The payload as stored, with scenario records still as references."""
+    text = path.read_text(encoding="utf-8")
+    payload = json.loads(text) if path.suffix == ".json" else yaml.safe_load(text)
+    return payload if isinstance(payload, dict) else {}
+
+
+@lru_cache(maxsize=1024)
+def _scenario_record_identity(path: Path) -> tuple[str | None, str]:
+    """Name and raw assumptions hash of a scenario record.
+
+    Records are content-addressed, so the result never changes for a path.
+    """
+    record = json.loads(path.read_text(encoding="utf-8"))
+    return record.get("name"), json_fingerprint(record.get("assumptions"))
+
+
+@lru_cache(maxsize=256)
+def _scenario_identity(record_json: str) -> tuple[str, str] | None:
+    """Name and assumptions hash of a scenario, validated once per content."""
+    try:
+        scenario = ScenarioAssumptions(**json.loads(record_json))
+    except (KeyError, TypeError, ValueError):  # ValidationError is a ValueError
+        return None
+    return scenario.name, assumptions_hash(scenario.assumptions)
+
+
+class LazyOptimizationPayload:
+    """A stored payload whose heavy sections are loaded on first access.
+
+    Opening one reads the payload file only. The header (``assumption_hash``,
+    ``saved_at``, ``summary``) is available right away; scenario records are
+    read and ``assumptions``, ``decisions`` and ``scenarios`` are validated
+    when first used. Instances are shared through the payload cache, so
+    treat the returned objects as read-only.
+    """
+
+    def __init__(self, path: Path, raw: dict[str, Any]):
+        self.path = path
+        self._raw = raw
+
+    @property
+    def assumption_hash(self) -> str | None:
+        return self._raw.get("assumption_hash")
+
+    @property
+    def saved_at(self) -> str | None:
+        return self._raw.get("saved_at")
+
+    @property
+    def summary(self) -> dict[str, Any]:
+        summary = self._raw.get("summary")
+        return summary if isinstance(summary, dict) else {}
+
+    @cached_property
+    def scenario_records(self) -> list[dict[str, Any]]:
+        """The embedded scenario definitions as plain dicts."""
+        refs = self._raw.get(_SCENARIO_REFS_KEY)
+        if isinstance(refs, list):
+            records = (_load_scenario_record(self.path.parent, ref) for ref in refs)
+            return [record for record in records if isinstance(record, dict)]
+        scenarios = self._raw.get("assumption_scenarios")
+        if not isinstance(scenarios, list):
+            return []
+        return [scenario for scenario in scenarios if isinstance(scenario, dict)]
+
+    @cached_property
+    def scenario_name(self) -> str | None:
+        """Name of the stored scenario whose assumptions produced the payload."""
+        refs = self._raw.get(_SCENARIO_REFS_KEY)
+        for ref in refs if isinstance(refs, list) else []:
+            try:
+                name, fingerprint = _scenario_record_identity(
+                    scenario_record_path(self.path.parent, ref)
+                )
+            except (OSError, ValueError, AttributeError):
+                continue
+            if fingerprint == self.assumption_hash:
+                return name
+        return _scenario_name(self.scenario_records, self.assumption_hash)
+
+    @cached_property
+    def scenarios(self) -> list[ScenarioAssumptions]:
+        return [ScenarioAssumptions(**record) for record in self.scenario_records]
+
+    @cached_property
+    def assumptions(self) -> Assumptions:
+        return Assumptions(**self._raw["assumptions"])
+
+    @cached_property
+    def _decisions(self) -> tuple[MonthlyDecision, ...]:
+        return tuple(MonthlyDecision(**decision) for decision in self._raw["decisions"])
+
+    @property
+    def decisions(self) -> list[MonthlyDecision]:
+        # A new list each time; the frozen decisions themselves are shared
+        return list(self._decisions)
+
+    @cached_property
+    def decisions_hash(self) -> str:
+        """``decisions_fingerprint`` of the stored decisions."""
+        return decisions_fingerprint(self.decisions)
+
+    def to_dict(self) -> dict[str, Any]:
+        """A deep copy of the full payload, as returned by ``load_optimization``."""
+        payload = copy.deepcopy(self._raw)
+        if payload.pop(_SCENARIO_REFS_KEY, None) is not None:
+            payload["assumption_scenarios"] = copy.deepcopy(self.scenario_records)
+        return payload
+
+
+# Process-wide cache of opened payloads. An entry is valid while the file's
+# (mtime, size, inode) are unchanged; payloads are replaced by atomic rename,
+# so any rewrite changes at least the inode.
+_PAYLOAD_CACHE: dict[Path, tuple[tuple[int, int, int], LazyOptimizationPayload]] = {}
+_PAYLOAD_CACHE_LOCK = threading.Lock()
+
+
+def _stat_key(path: Path) -> tuple[int, int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def _open_payload(path: Path) -> LazyOptimizationPayload:
+    """Open a payload file, reusing the cached instance if it is unchanged.
+
+    Raises FileNotFoundError if ``path`` does not exist.
+    """
+    key = _stat_key(path)
+    with _PAYLOAD_CACHE_LOCK:
+        cached = _PAYLOAD_CACHE.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    payload = LazyOptimizationPayload(path, _read_raw_payload(path))
+    with _PAYLOAD_CACHE_LOCK:
+        _PAYLOAD_CACHE[path] = (key, payload)
+    return payload
+
+
+def _read_payload(path: Path) -> dict:
+    return _open_payload(path).to_dict()
+
+
+def open_optimization(
+    base_dir: Path, assumption_hash: str
+) -> LazyOptimizationPayload | None:
+    """Stored payload for a hash as a ``LazyOptimizationPayload``, or None."""
+    for path in (
+        optimization_path(base_dir, assumption_hash),
+        _legacy_optimization_path(base_dir, assumption_hash),
+    ):
+        try:
+            return _open_payload(path)
+        except FileNotFoundError:
+            continue
+    return None
+
+
+def load_optimization(base_dir: Path, assumption_hash: str) -> dict | None:
+    payload = open_optimization(base_dir, assumption_hash)
+    return None if payload is None else payload.to_dict()
+
+
+def _write_payload(path: Path, payload: dict[str, Any]) -> LazyOptimizationPayload:
+    """Write ``payload`` as compact JSON, its scenarios as shared records."""
+    payload = dict(payload)
+    scenarios = payload.pop("assumption_scenarios", None)
+    if isinstance(scenarios, list):
+        payload[_SCENARIO_REFS_KEY] = [
+            _store_scenario_record(path.parent, scenario) for scenario in scenarios
+        ]
+    atomic_write_text(
+        path, json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+    )
+    return LazyOptimizationPayload(path, payload)
 
 
 def save_optimization(
@@ -54,13 +324,88 @@ def save_optimization(
         scenario_assumptions=scenario_assumptions,
     )
     path = optimization_path(base_dir, assumption_hash)
-    existing = load_optimization(base_dir, assumption_hash)
-    if _existing_beats_payload(existing, payload):
-        return assumption_hash
-    path.write_text(yaml.safe_dump(payload, sort_keys=False), encoding="utf-8")
+    # Compare and write under one lock so concurrent writers cannot replace a
+    # better result; the atomic rename never leaves a truncated payload.
+    with file_lock(_payload_lock(base_dir, assumption_hash)):
+        existing = open_optimization(base_dir, assumption_hash)
+        if _existing_beats_payload(existing, payload):
+            return assumption_hash
+        written = _write_payload(path, payload)
+        _legacy_optimization_path(base_dir, assumption_hash).unlink(missing_ok=True)
+        if len(df) == assumptions.months:
+            save_results(base_dir, assumption_hash, decisions, df)
+        else:
+            results_path(base_dir, assumption_hash).unlink(missing_ok=True)
+        entry = _index_entry(path, written)
+    _update_index(base_dir, {assumption_hash: entry})
     return assumption_hash
 
 
+def save_results(
+    base_dir: Path,
+    assumption_hash: str,
+    decisions: list[MonthlyDecision],
+    df: pd.DataFrame,
+) -> None:
+    """Store the monthly result table of ``decisions``."""
+    meta = {
+        "assumption_hash": assumption_hash,
+        "decisions_hash": decisions_fingerprint(decisions),
+        "engine_version": ENGINE_VERSION,
+    }
+    atomic_write_bytes(
+        results_path(base_dir, assumption_hash), frame_to_npz(df, meta)
+    )
+
+
+def load_results(
+    base_dir: Path,
+    assumption_hash: str,
+    decisions: list[MonthlyDecision],
+) -> pd.DataFrame | None:
+    """Stored monthly results for ``decisions``.
+
+    Returns None if there are none, or if they were computed for other
+    decisions or another ENGINE_VERSION.
+    """
+    try:
+        df, meta = frame_from_npz(results_path(base_dir, assumption_hash))
+    except (OSError, KeyError, ValueError):
+        return None
+    if (
+        meta.get("assumption_hash") != assumption_hash
+        or meta.get("engine_version") != ENGINE_VERSION
+        or meta.get("decisions_hash") != decisions_fingerprint(decisions)
+    ):
+        return None
+    return df
+
+
+def stored_simulation_df(
+    base_dir: Path,
+    assumptions: Assumptions,
+    decisions: list[MonthlyDecision],
+) -> pd.DataFrame:
+    """Monthly results for stored decisions, simulating only on a cache miss.
+
+    A miss (no file, other decisions, engine change) goes through
+    ``cached_run_simulation_df``. The stored results are refreshed if
+    ``decisions`` are the stored ones.
+    """
+    assumption_hash = assumptions_hash(assumptions)
+    df = load_results(base_dir, assumption_hash, decisions)
+    if df is not None:
+        return df
+    df = cached_run_simulation_df(assumptions, decisions)
+    with file_lock(_payload_lock(base_dir, assumption_hash)):
+        payload = open_optimization(base_dir, assumption_hash)
+        if payload is not None and payload.decisions_hash == decisions_fingerprint(
+            decisions
+        ):
+            save_results(base_dir, assumption_hash, decisions, df)
+    return df
+
+
 def _build_payload(
     assumptions: Assumptions,
     decisions: list[MonthlyDecision],
@@ -69,37 +414,455 @@ def _build_payload(
     assumption_hash: str,
     scenario_assumptions: Iterable[ScenarioAssumptions],
 ) -> dict[str, Any]:
+    kpis = compute_kpis(df)
     return {
-        "saved_at": datetime.utcnow().isoformat(),
+        "saved_at": datetime.now(UTC).isoformat(),
         "assumption_hash": assumption_hash,
-        "assumptions": assumptions.model_dump(),
+        "assumptions": assumptions.model_dump(mode="json"),
         "assumption_scenarios": [
-            scenario.model_dump() for scenario in scenario_assumptions
+            scenario.model_dump(mode="json") for scenario in scenario_assumptions
         ],
-        "decisions": [decision.model_dump() for decision in decisions],
+        "decisions": [decision.model_dump(mode="json") for decision in decisions],
         "summary": {
-            "end_market_cap": float(df["market_cap"].iloc[-1]),
-            "end_cash": float(df["cash"].iloc[-1]),
-            "min_cash": float(df["cash"].min()),
+            key: kpis[key] for key in ("end_market_cap", "end_cash", "min_cash")
         },
     }
 
 
-def _existing_beats_payload(existing: dict | None, payload: dict[str, Any]) -> bool:
-    existing_cap = _extract_market_cap(existing)
-    candidate_cap = _extract_market_cap(payload)
+def _existing_beats_payload(
+    existing: LazyOptimizationPayload | None, payload: dict[str, Any]
+) -> bool:
+    existing_cap = None if existing is None else _extract_market_cap(existing.summary)
+    candidate_cap = _extract_market_cap(payload.get("summary"))
     if existing_cap is None or candidate_cap is None:
         return False
     return existing_cap >= candidate_cap
 
 
-def _extract_market_cap(payload: dict | None) -> float | None:
-    if not isinstance(payload, dict):
-        return None
-    summary = payload.get("summary")
+def _extract_market_cap(summary: dict | None) -> float | None:
     if not isinstance(summary, dict):
         return None
     value = summary.get("end_market_cap")
     if isinstance(value, (int, float)):
         return float(value)
     return None
+
+
+def _scenario_name(records: Iterable[Any], assumption_hash: str | None) -> str | None:
+    records = [record for record in records if isinstance(record, dict)]
+    # Records written from a model dump hash like the validated model
+    for record in records:
+        if json_fingerprint(record.get("assumptions")) == assumption_hash:
+            return record.get("name")
+    for record in records:
+        identity = _scenario_identity(canonical_json(record))
+        if identity is not None and identity[1] == assumption_hash:
+            return identity[0]
+    return None
+
+
+def payload_scenario_name(payload: dict) -> str | None:
+    """Name of the stored scenario whose assumptions produced ``payload``."""
+    raw_scenarios = payload.get("assumption_scenarios")
+    if not isinstance(raw_scenarios, list):
+        return None
+    return _scenario_name(raw_scenarios, payload.get("assumption_hash"))
+
+
+def _index_entry(path: Path, payload: LazyOptimizationPayload) -> dict[str, Any]:
+    stat = path.stat()
+    return {
+        "file": path.name,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "scenario_name": payload.scenario_name,
+        "saved_at": payload.saved_at,
+        "summary": payload.summary,
+    }
+
+
+def _payload_files(base_dir: Path) -> dict[str, Path]:
+    """Payload file per assumption hash; JSON wins over a leftover YAML file."""
+    files: dict[str, Path] = {}
+    for suffix in reversed(_PAYLOAD_SUFFIXES):
+        for path in base_dir.glob(f"{_PAYLOAD_PREFIX}*{suffix}"):
+            files[path.stem[len(_PAYLOAD_PREFIX):]] = path
+    return files
+
+
+def _read_index(base_dir: Path) -> dict[str, dict[str, Any]]:
+    try:
+        data = json.loads(index_path(base_dir).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+        return {}
+    entries = data.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+def _write_index(base_dir: Path, entries: dict[str, dict[str, Any]]) -> None:
+    atomic_write_text(
+        index_path(base_dir),
+        json.dumps({"version": INDEX_VERSION, "entries": entries}, indent=1),
+    )
+
+
+def _update_index(base_dir: Path, changed: dict[str, dict[str, Any]]) -> None:
+    with file_lock(_lock_path(base_dir, INDEX_FILENAME)):
+        entries = _read_index(base_dir)
+        entries.update(changed)
+        _write_index(base_dir, entries)
+
+
+def rebuild_index(base_dir: Path) -> dict[str, dict[str, Any]]:
+    """Re-read every payload and rewrite the catalog from scratch."""
+    with file_lock(_lock_path(base_dir, INDEX_FILENAME)):
+        entries = {
+            key: _index_entry(path, _open_payload(path))
+            for key, path in sorted(_payload_files(base_dir).items())
+        }
+        _write_index(base_dir, entries)
+    return entries
+
+
+def load_index(base_dir: Path) -> dict[str, dict[str, Any]]:
+    """Catalog entries keyed by assumption hash.
+
+    Payload files are only stat'ed; files that were added, changed or removed
+    outside ``save_optimization`` (e.g. by a git checkout) are re-read and the
+    catalog is updated.
+    """
+    if not base_dir.exists():
+        return {}
+    entries = _read_index(base_dir)
+    files = _payload_files(base_dir)
+    fresh: dict[str, dict[str, Any]] = {}
+    stale = False
+    for key, path in files.items():
+        entry = entries.get(key)
+        stat = path.stat()
+        if (
+            entry is not None
+            and entry.get("file") == path.name
+            and entry.get("mtime_ns") == stat.st_mtime_ns
+            and entry.get("size") == stat.st_size
+        ):
+            fresh[key] = entry
+            continue
+        fresh[key] = _index_entry(path, _open_payload(path))
+        stale = True
+    if stale or set(entries) != set(fresh):
+        with file_lock(_lock_path(base_dir, INDEX_FILENAME)):
+            _write_index(base_dir, fresh)
+    return fresh
+
+
+def list_optimizations(base_dir: Path) -> list[dict[str, Any]]:
+    """Catalog entries with their ``assumption_hash``, newest first."""
+    return sorted(
+        (
+            {"assumption_hash": key, **entry}
+            for key, entry in load_index(base_dir).items()
+        ),
+        key=lambda entry: entry.get("saved_at") or "",
+        reverse=True,
+    )
+
+
+def load_summary(base_dir: Path, assumption_hash: str) -> dict[str, Any] | None:
+    """Summary KPIs of a stored optimization, read from the catalog."""
+    entry = load_index(base_dir).get(assumption_hash)
+    if entry is None:
+        return None
+    return entry["summary"]
+
+
+def migrate_payloads(base_dir: Path) -> list[str]:
+    """Convert every YAML payload to JSON and remove the YAML file.
+
+    Returns the assumption hashes that were migrated.
+    """
+    migrated = []
+    for assumption_hash, path in sorted(_payload_files(base_dir).items()):
+        if path.suffix != ".yaml":
+            continue
+        with file_lock(_payload_lock(base_dir, assumption_hash)):
+            _write_payload(
+                optimization_path(base_dir, assumption_hash), _read_payload(path)
+            )
+            path.unlink()
+        migrated.append(assumption_hash)
+    rebuild_index(base_dir)
+    return migrated
+
+
+def _tree_size(path: Path) -> int:
+    total = 0
+    for file in path.rglob("*"):
+        try:
+            if file.is_file():
+                total += file.stat().st_size
+        except OSError:
+            continue
+    return total
+
+
+def _artifact_hashes(base_dir: Path) -> set[str]:
+    """Assumption hashes with a payload, results file or trial archive."""
+    hashes = set(_payload_files(base_dir))
+    hashes.update(
+        path.stem[len("results_"):] for path in base_dir.glob("results_*.npz")
+    )
+    hashes.update(
+        path.name[len("trials_"):]
+        for path in base_dir.glob("trials_*")
+        if path.is_dir()
+    )
+    return hashes
+
+
+def _remove_optimization(
+    base_dir: Path, assumption_hash: str, archive_dir: Path | None
+) -> int:
+    """Move everything stored for a hash to ``archive_dir``, or delete it.
+
+    Returns the number of bytes removed from ``base_dir``.
+    """
+    freed = _tree_size(trial_archive_dir(base_dir, assumption_hash))
+    with file_lock(_payload_lock(base_dir, assumption_hash)):
+        for path in (
+            optimization_path(base_dir, assumption_hash),
+            _legacy_optimization_path(base_dir, assumption_hash),
+            results_path(base_dir, assumption_hash),
+        ):
+            if not path.exists():
+                continue
+            freed += path.stat().st_size
+            if archive_dir is None:
+                path.unlink()
+                continue
+            archive_dir.mkdir(parents=True, exist_ok=True)
+            if path.name.startswith(_PAYLOAD_PREFIX):
+                # Rewritten so the archive holds its own scenario records
+                _write_payload(
+                    optimization_path(archive_dir, assumption_hash),
+                    _read_payload(path),
+                )
+                path.unlink()
+            else:
+                path.replace(archive_dir / path.name)
+    if archive_dir is None:
+        delete_trial_history(base_dir, assumption_hash)
+    else:
+        move_trial_history(base_dir, assumption_hash, archive_dir)
+    return freed
+
+
+def _collect_scenario_records(base_dir: Path) -> int:
+    """Delete scenario records no payload references; returns how many."""
+    referenced: set[str] = set()
+    for path in base_dir.glob(f"{_PAYLOAD_PREFIX}*.json"):
+        try:
+            refs = json.loads(path.read_text(encoding="utf-8")).get(_SCENARIO_REFS_KEY)
+        except (OSError, ValueError, AttributeError):
+            continue
+        referenced.update(refs or [])
+    cutoff = time.time() - _SCENARIO_RECORD_GRACE_S
+    removed = 0
+    for path in (base_dir / SCENARIOS_DIRNAME).glob("*.json"):
+        # Recently written records may belong to a payload being saved
+        if path.stem in referenced or path.stat().st_mtime > cutoff:
+            continue
+        path.unlink(missing_ok=True)
+        removed += 1
+    return removed
+
+
+def _budget_candidates(base_dir: Path) -> list[tuple[Callable[[], int], str]]:
+    """Removable data in the order it is given up to meet a size budget.
+
+    Archived optimizations go first, then the results tables (they are
+    recomputed on demand), then trial histories; oldest first within each.
+    Payloads and scenario records are never removed.
+    """
+    archive_dir = base_dir / ARCHIVE_DIRNAME
+    archived = _artifact_hashes(archive_dir) if archive_dir.exists() else set()
+
+    def newest(paths: Iterable[Path]) -> float:
+        return max((p.stat().st_mtime for p in paths if p.exists()), default=0.0)
+
+    candidates = [
+        (
+            0,
+            newest(archive_dir.glob(f"*{h}*")),
+            partial(_remove_optimization, archive_dir, h, None),
+            f"archived {h}",
+        )
+        for h in archived
+    ]
+    candidates += [
+        (1, path.stat().st_mtime, partial(_unlink_size, path), path.name)
+        for path in base_dir.glob("results_*.npz")
+    ]
+    candidates += [
+        (
+            2,
+            newest(path.iterdir()),
+            partial(delete_trial_history, base_dir, path.name[len("trials_"):]),
+            path.name,
+        )
+        for path in base_dir.glob("trials_*")
+        if path.is_dir()
+    ]
+    candidates.sort(key=lambda c: (c[0], c[1]))
+    return [(remove, name) for _, _, remove, name in candidates]
+
+
+def _unlink_size(path: Path) -> int:
+    try:
+        size = path.stat().st_size
+        path.unlink()
+    except FileNotFoundError:
+        return 0
+    return size
+
+
+def compact_optimizations(
+    base_dir: Path,
+    *,
+    keep: Iterable[str] | None = None,
+    delete_orphans: bool = False,
+    max_bytes: int | None = None,
+) -> dict[str, Any]:
+    """Garbage-collect and compact an optimization directory.
+
+    - Results whose assumption hash is not in ``keep`` are orphans and are
+      moved to ``archive/`` (or deleted with ``delete_orphans``). ``keep=None``
+      keeps everything.
+    - Remaining payloads are rewritten as JSON that references content-addressed
+      scenario records in ``scenarios/`` instead of embedding every scenario;
+      unreferenced records are deleted.
+    - Trial histories are merged into one chunk each.
+    - With ``max_bytes``, archived results, results tables and trial
+      histories are dropped (see ``_budget_candidates``) until the directory
+      fits.
+
+    Returns a report of what was done.
+    """
+    bytes_before = _tree_size(base_dir)
+    orphans = (
+        []
+        if keep is None
+        else sorted(_artifact_hashes(base_dir) - set(keep))
+    )
+    archive_dir = None if delete_orphans else base_dir / ARCHIVE_DIRNAME
+    for assumption_hash in orphans:
+        _remove_optimization(base_dir, assumption_hash, archive_dir)
+
+    rewritten = []
+    for assumption_hash, path in sorted(_payload_files(base_dir).items()):
+        with file_lock(_payload_lock(base_dir, assumption_hash)):
+            if path.suffix == ".json":
+                raw = json.loads(path.read_text(encoding="utf-8"))
+                # Already compact unless it still embeds its scenarios
+                if not isinstance(raw, dict) or "assumption_scenarios" not in raw:
+                    continue
+            _write_payload(
+                optimization_path(base_dir, assumption_hash), _read_payload(path)
+            )
+            if path.suffix != ".json":
+                path.unlink()
+        rewritten.append(assumption_hash)
+    records_removed = _collect_scenario_records(base_dir)
+
+    for path in base_dir.glob("trials_*"):
+        if path.is_dir():
+            compact_trial_history(base_dir, path.name[len("trials_"):])
+
+    dropped = []
+    if max_bytes is not None:
+        size = _tree_size(base_dir)
+        for remove, name in _budget_candidates(base_dir):
+            if size <= max_bytes:
+                break
+            size -= remove()
+            dropped.append(name)
+
+    archive = base_dir / ARCHIVE_DIRNAME
+    if archive.exists():
+        records_removed += _collect_scenario_records(archive)
+
+    rebuild_index(base_dir)
+    return {
+        "orphans": orphans,
+        "archived": archive_dir is not None,
+        "rewritten": rewritten,
+        "scenario_records_removed": records_removed,
+        "dropped": dropped,
+        "bytes_before": bytes_before,
+        "bytes_after": _tree_size(base_dir),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Maintain stored optimizations.")
+    parser.add_argument(
+        "--dir",
+        type=Path,
+        default=Path(__file__).resolve().parent.parent / "data" / "optimizations",
+        help="optimization directory",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("reindex", help="rebuild index.json from the payloads")
+    commands.add_parser("migrate", help="convert YAML payloads to JSON")
+    compact = commands.add_parser(
+        "compact",
+        help="archive results of unknown scenarios, deduplicate scenario "
+        "definitions and enforce a size budget",
+    )
+    compact.add_argument(
+        "--keep-all",
+        action="store_true",
+        help="keep results that match no configured scenario",
+    )
+    compact.add_argument(
+        "--delete",
+        action="store_true",
+        help="delete orphaned results instead of archiving them",
+    )
+    compact.add_argument(
+        "--max-mb", type=float, default=None, help="size budget for the directory"
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "reindex":
+        entries = rebuild_index(args.dir)
+        print(f"Indexed {len(entries)} optimizations in {index_path(args.dir)}")
+    elif args.command == "migrate":
+        migrated = migrate_payloads(args.dir)
+        print(f"Migrated {len(migrated)} YAML payloads to JSON in {args.dir}")
+    elif args.command == "compact":
+        report = compact_optimizations(
+            args.dir,
+            keep=(
+                None
+                if args.keep_all
+                else [assumptions_hash(s.assumptions) for s in ALL_SCENARIOS]
+            ),
+            delete_orphans=args.delete,
+            max_bytes=None if args.max_mb is None else int(args.max_mb * 2**20),
+        )
+        action = "archived" if report["archived"] else "deleted"
+        print(
+            f"{len(report['orphans'])} orphaned results {action}, "
+            f"{len(report['rewritten'])} payloads rewritten, "
+            f"{report['scenario_records_removed']} scenario records removed, "
+            f"{len(report['dropped'])} items dropped for the size budget; "
+            f"{report['bytes_before'] / 2**20:.2f} MiB -> "
+            f"{report['bytes_after'] / 2**20:.2f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
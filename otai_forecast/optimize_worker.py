@@ -0,0 +1,191 @@
+"""Optimization workers that share one Optuna journal file per assumptions hash.
+
+Start any number of workers, on any host that can reach the journal file::
+
+    python -m otai_forecast.optimize_worker --study <assumptions_hash> --trials 200
+
+Each worker attaches to the study ``otai_<hash>``, evaluates trials and appends
+them to the journal under the journal's file lock, and to the trial archive
+(see ``trial_archive``) in ``--optimization-dir`` (default
+``data/optimizations``). Once enough trials are in, collect the best one into
+the same directory::
+
+    python -m otai_forecast.optimize_worker --study <assumptions_hash> --collect
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+import optuna
+from optuna.storages.journal import (
+    JournalFileBackend,
+    JournalFileOpenLock,
+    JournalStorage,
+)
+
+from .config import (
+    ALL_SCENARIOS,
+    OPTIMIZER_KNOT_CONFIG,
+    OPTIMIZER_NUM_KNOTS,
+    RUN_BASE_DECISION,
+    WARM_START_KNOTS,
+    build_base_decisions,
+)
+from .decision_optimizer import (
+    best_feasible_trial,
+    decisions_from_study,
+    is_feasible,
+    optimize_study,
+)
+from .models import Assumptions
+from .optimization_storage import assumptions_hash, open_optimization, save_optimization
+from .trial_archive import TrialArchive
+
+OPTIMIZATION_DIR = Path(__file__).resolve().parent.parent / "data" / "optimizations"
+STUDY_DIR = OPTIMIZATION_DIR / "studies"
+
+
+def study_name_for(assumption_hash: str) -> str:
+    return f"otai_{assumption_hash}"
+
+
+def journal_path(assumption_hash: str, study_dir: Path = STUDY_DIR) -> Path:
+    """Default journal of a study; ``study_dir`` is ``<optimization_dir>/studies``."""
+    return study_dir / f"study_{assumption_hash}.journal"
+
+
+def journal_storage(path: Path) -> JournalStorage:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # The open(O_EXCL) lock also works on network filesystems and on Windows,
+    # where the default symlink lock is unreliable.
+    return JournalStorage(
+        JournalFileBackend(str(path), lock_obj=JournalFileOpenLock(str(path)))
+    )
+
+
+def resolve_assumptions(
+    assumption_hash: str,
+    optimization_dir: Path = OPTIMIZATION_DIR,
+) -> Assumptions:
+    """Find the assumptions for a hash among the scenarios or stored results."""
+    for scenario in ALL_SCENARIOS:
+        if assumptions_hash(scenario.assumptions) == assumption_hash:
+            return scenario.assumptions
+    payload = open_optimization(optimization_dir, assumption_hash)
+    if payload is not None:
+        return payload.assumptions
+    raise LookupError(f"No scenario or stored optimization for {assumption_hash}.")
+
+
+def run_worker(
+    assumption_hash: str,
+    *,
+    trials: int,
+    journal: Path | None = None,
+    n_jobs: int = 1,
+    seed: int | None = None,
+    optimization_dir: Path = OPTIMIZATION_DIR,
+) -> optuna.Study:
+    """Evaluate ``trials`` more trials of the shared study for ``assumption_hash``.
+
+    Workers default to ``seed=None`` so that concurrent workers do not propose
+    the same parameters. Trials are archived under ``optimization_dir``, which
+    also holds the journal unless ``journal`` is given.
+    """
+    a = resolve_assumptions(assumption_hash, optimization_dir)
+    with TrialArchive(optimization_dir, assumption_hash) as archive:
+        return optimize_study(
+            a,
+            build_base_decisions(a.months, RUN_BASE_DECISION),
+            max_evals=trials,
+            seed=seed,
+            study_name=study_name_for(assumption_hash),
+            storage=journal_storage(
+                journal or journal_path(assumption_hash, optimization_dir / "studies")
+            ),
+            n_jobs=n_jobs,
+            num_knots=OPTIMIZER_NUM_KNOTS,
+            knot_config=OPTIMIZER_KNOT_CONFIG,
+            warm_start_knots=WARM_START_KNOTS,
+            callbacks=[archive],
+        )
+
+
+def collect_best(
+    assumption_hash: str,
+    *,
+    journal: Path | None = None,
+    optimization_dir: Path = OPTIMIZATION_DIR,
+) -> str:
+    """Replay the best trial of the shared study and store it via save_optimization."""
+    study = optuna.load_study(
+        study_name=study_name_for(assumption_hash),
+        storage=journal_storage(
+            journal or journal_path(assumption_hash, optimization_dir / "studies")
+        ),
+    )
+    a = Assumptions(**study.user_attrs["assumptions"])
+    decisions, df = decisions_from_study(
+        study,
+        a,
+        build_base_decisions(a.months, RUN_BASE_DECISION),
+        num_knots=study.user_attrs["num_knots"],
+    )
+    return save_optimization(
+        a,
+        decisions,
+        df,
+        base_dir=optimization_dir,
+        scenario_assumptions=ALL_SCENARIOS,
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--study", required=True, help="assumptions hash")
+    parser.add_argument("--trials", type=int, default=100)
+    parser.add_argument("--jobs", type=int, default=1, help="threads per worker")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--journal", type=Path, default=None)
+    parser.add_argument(
+        "--optimization-dir",
+        type=Path,
+        default=OPTIMIZATION_DIR,
+        help="where trials are archived and the best trial is saved",
+    )
+    parser.add_argument(
+        "--collect",
+        action="store_true",
+        help="save the best trial instead of running trials",
+    )
+    args = parser.parse_args(argv)
+
+    if args.collect:
+        saved = collect_best(
+            args.study, journal=args.journal, optimization_dir=args.optimization_dir
+        )
+        print(f"Saved best trial to {saved}")
+        return
+    study = run_worker(
+        args.study,
+        trials=args.trials,
+        journal=args.journal,
+        n_jobs=args.jobs,
+        seed=args.seed,
+        optimization_dir=args.optimization_dir,
+    )
+    complete = study.get_trials(
+        deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,)
+    )
+    best = best_feasible_trial(study) if complete else None
+    if best is None or not is_feasible(best):
+        summary = "no feasible trial yet"
+    else:
+        summary = f"best feasible value {best.value:,.0f}"
+    print(f"{len(study.trials)} trials in study, {summary}")
+
+
+if __name__ == "__main__":
+    main()
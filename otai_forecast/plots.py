@@ -7,6 +7,9 @@ import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from .cache import LRUCache
+from .fingerprint import dataframe_fingerprint
+
 PLOTLY_TEMPLATE = "plotly_white"
 PLOTLY_COLORWAY = [
     "#2563EB",
@@ -30,6 +33,161 @@ def _safe_divide(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
     return (numerator / denominator.replace(0, np.nan)).fillna(0)
 
 
+# Result columns the derived plot metrics are computed from
+PLOT_METRIC_INPUTS = (
+    "ads_clicks",
+    "ads_spend",
+    "cash",
+    "churn_pro",
+    "conv_web_to_lead",
+    "costs_ex_tax",
+    "dev_spend",
+    "direct_candidate_outreach_spend",
+    "ent_active",
+    "free_active",
+    "leads_total",
+    "market_cap",
+    "net_cashflow",
+    "new_direct_leads",
+    "new_ent",
+    "new_pro",
+    "organic_marketing_spend",
+    "partner_spend",
+    "pro_active",
+    "revenue_ent",
+    "revenue_pro",
+    "revenue_total",
+    "sales_spend",
+)
+
+PLOT_METRICS_CACHE_ENTRIES = 32
+
+_plot_metrics_cache = LRUCache(PLOT_METRICS_CACHE_ENTRIES)
+
+
+def _derive_plot_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    revenue = _series_or_zeros(df, "revenue_total")
+    net_cashflow = _series_or_zeros(df, "net_cashflow")
+    pro_active = _series_or_zeros(df, "pro_active")
+    ent_active = _series_or_zeros(df, "ent_active")
+
+    total_spend = (
+        _series_or_zeros(df, "ads_spend")
+        + _series_or_zeros(df, "organic_marketing_spend")
+        + _series_or_zeros(df, "dev_spend")
+        + _series_or_zeros(df, "partner_spend")
+        + _series_or_zeros(df, "direct_candidate_outreach_spend")
+    )
+    burn_rate = -net_cashflow.clip(upper=0)
+
+    # Results without per-tier revenue are split 70/30
+    if "revenue_pro" in df.columns and "revenue_ent" in df.columns:
+        revenue_pro = df["revenue_pro"]
+        revenue_ent = df["revenue_ent"]
+    else:
+        revenue_pro = revenue * 0.7
+        revenue_ent = revenue * 0.3
+
+    # Customer acquisition cost and lifetime value
+    new_pro = df["new_pro"] if "new_pro" in df.columns else pro_active.diff().fillna(0)
+    new_ent = df["new_ent"] if "new_ent" in df.columns else ent_active.diff().fillna(0)
+    new_customers = new_pro + new_ent
+    if "sales_spend" in df.columns:
+        cac = _safe_divide(df["sales_spend"], new_customers)
+    else:
+        cac = revenue * 0.2
+    active_paid = pro_active + ent_active
+    revenue_per_paid = _safe_divide(revenue, active_paid)
+    if "churn_pro" in df.columns:
+        ltv_pro = _safe_divide(revenue_per_paid, df["churn_pro"])
+    else:
+        ltv_pro = revenue_per_paid * 24
+    ltv = _safe_divide(ltv_pro * pro_active + ltv_pro * 5 * ent_active, active_paid)
+
+    # Per-user economics over all active users
+    total_users = _series_or_zeros(df, "free_active") + pro_active + ent_active
+    arpu = _safe_divide(revenue, total_users)
+    if "costs_ex_tax" in df.columns:
+        cost_per_user = _safe_divide(df["costs_ex_tax"], total_users)
+        margin_per_user = arpu - cost_per_user
+    else:
+        cost_per_user = arpu * 0.7
+        margin_per_user = arpu * 0.3
+
+    revenue_growth = revenue.pct_change().fillna(0)
+    profit_margin = _safe_divide(net_cashflow, revenue)
+
+    # Leads by channel; the rest of the total counts as organic
+    conv_web_to_lead = (
+        df["conv_web_to_lead"] if "conv_web_to_lead" in df.columns else 0.03
+    )
+    ads_leads = _series_or_zeros(df, "ads_clicks") * conv_web_to_lead
+    direct_leads = _series_or_zeros(df, "new_direct_leads")
+    organic_leads = (
+        _series_or_zeros(df, "leads_total") - ads_leads - direct_leads
+    ).clip(lower=0)
+
+    # Months of cash at the current burn; -1 divides months without burn
+    cash_months = _safe_divide(
+        _series_or_zeros(df, "cash"), -net_cashflow.clip(upper=0).replace(0, 1)
+    )
+    health_score = (
+        np.clip(cash_months / 24 * 100, 0, 100) * 0.4
+        + np.clip(revenue_growth * 100 + 50, 0, 100) * 0.3
+        + np.clip(profit_margin * 100 + 50, 0, 100) * 0.3
+    )
+
+    return pd.DataFrame(
+        {
+            "total_spend": total_spend,
+            "burn_rate": burn_rate,
+            "revenue_pro": revenue_pro,
+            "revenue_ent": revenue_ent,
+            "new_customers": new_customers,
+            "cac": cac,
+            "active_paid": active_paid,
+            "ltv": ltv,
+            "ltv_cac_ratio": _safe_divide(ltv, cac),
+            "total_users": total_users,
+            "arpu": arpu,
+            "cost_per_user": cost_per_user,
+            "margin_per_user": margin_per_user,
+            "margin_pct": _safe_divide(margin_per_user, arpu),
+            "revenue_growth": revenue_growth,
+            "revenue_growth_acceleration": revenue_growth.diff().fillna(0),
+            "paid_user_growth": active_paid.pct_change().fillna(0),
+            "cash_growth": _series_or_zeros(df, "cash").pct_change().fillna(0),
+            "market_cap_growth": (
+                _series_or_zeros(df, "market_cap").pct_change().fillna(0)
+            ),
+            "profit_margin": profit_margin,
+            "ads_leads": ads_leads,
+            "direct_leads": direct_leads,
+            "organic_leads": organic_leads,
+            "cash_months": cash_months,
+            "health_score": health_score,
+        },
+        index=df.index,
+    )
+
+
+def compute_plot_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    """Derived series the plots share (burn rate, CAC, LTV, ARPU, growth, ...).
+
+    One row per row of ``df``. Computed once per distinct input, keyed by a
+    fingerprint of the ``PLOT_METRIC_INPUTS`` columns, and kept in memory,
+    so the figures of one view do not each rederive them. The returned frame
+    is shared between callers and must not be modified.
+    """
+    inputs = df[[column for column in PLOT_METRIC_INPUTS if column in df.columns]]
+    key = dataframe_fingerprint(inputs)
+    metrics = _plot_metrics_cache.get(key)
+    if metrics is None:
+        metrics = _derive_plot_metrics(df)
+        _plot_metrics_cache.put(key, metrics)
+    return metrics
+
+
 def _apply_currency_axis(
     fig: go.Figure,
     *,
@@ -141,19 +299,13 @@ def _add_traces_from_fig(
 
 def plot_cash_debt_spend(df: pd.DataFrame) -> go.Figure:
     """Plot cash position, debt, and spend over time."""
-    total_spend = (
-        _series_or_zeros(df, "ads_spend")
-        + _series_or_zeros(df, "organic_marketing_spend")
-        + _series_or_zeros(df, "dev_spend")
-        + _series_or_zeros(df, "partner_spend")
-        + _series_or_zeros(df, "direct_candidate_outreach_spend")
-    )
+    metrics = compute_plot_metrics(df)
 
     fig = make_subplots(specs=[[{"secondary_y": True}]])
     fig.add_trace(
         go.Bar(
             x=df["month"],
-            y=total_spend,
+            y=metrics["total_spend"],
             name="Total Spend",
             marker_color="#F97316",
             opacity=0.4,
@@ -837,19 +989,13 @@ def plot_user_growth_stacked(df: pd.DataFrame) -> go.Figure:
 
 def plot_revenue_breakdown(df: pd.DataFrame) -> go.Figure:
     """Plot revenue breakdown by tier using stacked bars."""
-    revenue_total = _series_or_zeros(df, "revenue_total")
-    if "revenue_pro" in df.columns and "revenue_ent" in df.columns:
-        revenue_pro = _series_or_zeros(df, "revenue_pro")
-        revenue_ent = _series_or_zeros(df, "revenue_ent")
-    else:
-        revenue_pro = revenue_total * 0.7
-        revenue_ent = revenue_total * 0.3
+    metrics = compute_plot_metrics(df)
 
     fig = go.Figure()
     fig.add_trace(
         go.Bar(
             x=df["month"],
-            y=revenue_pro,
+            y=metrics["revenue_pro"],
             name="Pro Revenue",
             marker_color="#10B981",
         )
@@ -857,7 +1003,7 @@ def plot_revenue_breakdown(df: pd.DataFrame) -> go.Figure:
     fig.add_trace(
         go.Bar(
             x=df["month"],
-            y=revenue_ent,
+            y=metrics["revenue_ent"],
             name="Enterprise Revenue",
             marker_color="#EF4444",
         )
@@ -876,7 +1022,7 @@ def plot_revenue_breakdown(df: pd.DataFrame) -> go.Figure:
 
 def plot_cash_burn_rate(df: pd.DataFrame) -> go.Figure:
     """Plot cash burn rate with runway analysis."""
-    burn_rate = -_series_or_zeros(df, "net_cashflow").clip(upper=0)
+    metrics = compute_plot_metrics(df)
     fig = make_subplots(specs=[[{"secondary_y": True}]])
     fig.add_trace(
         go.Scatter(
@@ -891,7 +1037,7 @@ def plot_cash_burn_rate(df: pd.DataFrame) -> go.Figure:
     fig.add_trace(
         go.Bar(
             x=df["month"],
-            y=burn_rate,
+            y=metrics["burn_rate"],
             name="Burn Rate",
             marker_color="#EF4444",
             opacity=0.6,
@@ -952,43 +1098,13 @@ def plot_conversion_funnel(df: pd.DataFrame) -> go.Figure:
 
 def plot_ltv_cac_analysis(df: pd.DataFrame) -> go.Figure:
     """Plot LTV vs CAC analysis over time."""
-    new_pro = (
-        df["new_pro"]
-        if "new_pro" in df.columns
-        else _series_or_zeros(df, "pro_active").diff().fillna(0)
-    )
-    new_ent = (
-        df["new_ent"]
-        if "new_ent" in df.columns
-        else _series_or_zeros(df, "ent_active").diff().fillna(0)
-    )
-    total_new_customers = new_pro + new_ent
-    if "sales_spend" in df.columns:
-        cac = _safe_divide(_series_or_zeros(df, "sales_spend"), total_new_customers)
-    else:
-        cac = _series_or_zeros(df, "revenue_total") * 0.2
-
-    active_paid = _series_or_zeros(df, "pro_active") + _series_or_zeros(df, "ent_active")
-    avg_monthly_revenue = _safe_divide(_series_or_zeros(df, "revenue_total"), active_paid)
-
-    if "churn_pro" in df.columns:
-        ltv_pro = _safe_divide(avg_monthly_revenue, _series_or_zeros(df, "churn_pro"))
-    else:
-        ltv_pro = avg_monthly_revenue * 24
-    ltv_ent = ltv_pro * 5
-    ltv = _safe_divide(
-        ltv_pro * _series_or_zeros(df, "pro_active")
-        + ltv_ent * _series_or_zeros(df, "ent_active"),
-        active_paid,
-    )
-
-    ltv_cac_ratio = _safe_divide(ltv, cac)
+    metrics = compute_plot_metrics(df)
 
     fig = make_subplots(specs=[[{"secondary_y": True}]])
     fig.add_trace(
         go.Scatter(
             x=df["month"],
-            y=ltv,
+            y=metrics["ltv"],
             name="LTV",
             mode="lines+markers",
             line=dict(color="#10B981", width=3),
@@ -998,7 +1114,7 @@ def plot_ltv_cac_analysis(df: pd.DataFrame) -> go.Figure:
     fig.add_trace(
         go.Scatter(
             x=df["month"],
-            y=cac,
+            y=metrics["cac"],
             name="CAC",
             mode="lines+markers",
             line=dict(color="#EF4444", width=3),
@@ -1008,7 +1124,7 @@ def plot_ltv_cac_analysis(df: pd.DataFrame) -> go.Figure:
     fig.add_trace(
         go.Scatter(
             x=df["month"],
-            y=ltv_cac_ratio,
+            y=metrics["ltv_cac_ratio"],
             name="LTV:CAC Ratio",
             mode="lines+markers",
             line=dict(color="#8B5CF6", width=2, dash="dot"),
@@ -1039,24 +1155,13 @@ def plot_ltv_cac_analysis(df: pd.DataFrame) -> go.Figure:
 
 def plot_unit_economics(df: pd.DataFrame) -> go.Figure:
     """Plot detailed unit economics including ARPU, costs, and margins."""
-    total_users = (
-        _series_or_zeros(df, "free_active")
-        + _series_or_zeros(df, "pro_active")
-        + _series_or_zeros(df, "ent_active")
-    )
-    arpu = _safe_divide(_series_or_zeros(df, "revenue_total"), total_users)
-    if "costs_ex_tax" in df.columns:
-        cost_per_user = _safe_divide(_series_or_zeros(df, "costs_ex_tax"), total_users)
-        margin_per_user = arpu - cost_per_user
-    else:
-        cost_per_user = arpu * 0.7
-        margin_per_user = arpu * 0.3
-    margin_pct = _safe_divide(margin_per_user, arpu)
+    metrics = compute_plot_metrics(df)
+    margin_pct = metrics["margin_pct"]
 
     # Scale values to be more visible (multiply by 1000)
-    arpu_scaled = arpu * 1000
-    cost_per_user_scaled = cost_per_user * 1000
-    margin_per_user_scaled = margin_per_user * 1000
+    arpu_scaled = metrics["arpu"] * 1000
+    cost_per_user_scaled = metrics["cost_per_user"] * 1000
+    margin_per_user_scaled = metrics["margin_per_user"] * 1000
 
     fig = make_subplots(specs=[[{"secondary_y": True}]])
     fig.add_trace(
@@ -1113,22 +1218,17 @@ def plot_unit_economics(df: pd.DataFrame) -> go.Figure:
 
 def plot_growth_metrics_heatmap(df: pd.DataFrame) -> go.Figure:
     """Plot growth metrics as a heatmap for quick insights."""
-    metrics = {
-        "Revenue Growth": _series_or_zeros(df, "revenue_total").pct_change().fillna(0),
-        "User Growth": (
-            _series_or_zeros(df, "pro_active") + _series_or_zeros(df, "ent_active")
-        )
-        .pct_change()
-        .fillna(0),
-        "Cash Growth": _series_or_zeros(df, "cash").pct_change().fillna(0),
-        "Market Cap Growth": _series_or_zeros(df, "market_cap").pct_change().fillna(0),
-        "Net Cashflow (K€)": _series_or_zeros(df, "net_cashflow") / 1000,
-        "Profit Margin": _safe_divide(
-            _series_or_zeros(df, "net_cashflow"),
-            _series_or_zeros(df, "revenue_total"),
-        ),
-    }
-    metrics_df = pd.DataFrame(metrics)
+    metrics = compute_plot_metrics(df)
+    metrics_df = pd.DataFrame(
+        {
+            "Revenue Growth": metrics["revenue_growth"],
+            "User Growth": metrics["paid_user_growth"],
+            "Cash Growth": metrics["cash_growth"],
+            "Market Cap Growth": metrics["market_cap_growth"],
+            "Net Cashflow (K€)": _series_or_zeros(df, "net_cashflow") / 1000,
+            "Profit Margin": metrics["profit_margin"],
+        }
+    )
     normalized = (metrics_df - metrics_df.mean()) / metrics_df.std().replace(0, np.nan)
     normalized = normalized.fillna(0)
 
@@ -1165,16 +1265,9 @@ def plot_customer_acquisition_channels(df: pd.DataFrame) -> go.Figure:
     """Plot customer acquisition channels over time."""
     fig = go.Figure()
     if "ads_clicks" in df.columns:
-        conv_web_to_lead = (
-            df["conv_web_to_lead"] if "conv_web_to_lead" in df.columns else 0.03
-        )
-        ads_leads = _series_or_zeros(df, "ads_clicks") * conv_web_to_lead
-        direct_leads = _series_or_zeros(df, "new_direct_leads")
-        organic_leads = (
-            _series_or_zeros(df, "leads_total") - ads_leads - direct_leads
-        ).clip(lower=0)
+        metrics = compute_plot_metrics(df)
         for series, label, color in zip(
-            [organic_leads, ads_leads, direct_leads],
+            [metrics["organic_leads"], metrics["ads_leads"], metrics["direct_leads"]],
             ["Organic", "Paid Ads", "Direct Outreach"],
             ["#10B981", "#2563EB", "#EF4444"],
             strict=True,
@@ -1213,19 +1306,7 @@ def plot_customer_acquisition_channels(df: pd.DataFrame) -> go.Figure:
 
 def plot_financial_health_score(df: pd.DataFrame) -> go.Figure:
     """Plot a simplified financial health score."""
-    cash_months = _safe_divide(
-        _series_or_zeros(df, "cash"),
-        -_series_or_zeros(df, "net_cashflow").clip(upper=0).replace(0, 1),
-    )
-    cash_score = np.clip(cash_months / 24 * 100, 0, 100)
-    revenue_growth = _series_or_zeros(df, "revenue_total").pct_change().fillna(0)
-    growth_score = np.clip(revenue_growth * 100 + 50, 0, 100)
-    profit_margin = _safe_divide(
-        _series_or_zeros(df, "net_cashflow"),
-        _series_or_zeros(df, "revenue_total"),
-    )
-    profitability_score = np.clip(profit_margin * 100 + 50, 0, 100)
-    health_score = cash_score * 0.4 + growth_score * 0.3 + profitability_score * 0.3
+    health_score = compute_plot_metrics(df)["health_score"]
 
     fig = go.Figure()
     fig.add_trace(
@@ -1460,8 +1541,9 @@ def plot_growth_insights(df: pd.DataFrame, save_path: str | None = None) -> go.F
             line_width=0,
         )
 
-    revenue_growth = _series_or_zeros(df, "revenue_total").pct_change().fillna(0)
-    acceleration = revenue_growth.diff().fillna(0)
+    metrics = compute_plot_metrics(df)
+    revenue_growth = metrics["revenue_growth"]
+    acceleration = metrics["revenue_growth_acceleration"]
     fig.add_trace(
         go.Scatter(
             x=df["month"],
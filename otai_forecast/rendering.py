@@ -0,0 +1,289 @@
+"""PNG rendering of plotly figures with an on-disk image cache.
+
+Rendering through kaleido takes far longer than building a figure, so
+``render_plots_png`` keys every image by the plot function, a fingerprint of
+the input DataFrame, the render settings and the plotting code, and keeps the
+PNGs in ``data/cache/charts``. Re-exporting unchanged data never starts
+kaleido::
+
+    images = render_plots_png({"Cash": plot_cash_position}, df, scale=2)
+
+Cache misses are rendered by ``chart_renderer``, a long-lived pool of worker
+processes that each keep a warm kaleido instance, so exports do not pay a
+cold start and renders run in parallel up to the pool size.
+``render_plot_sets_png`` renders the plots of several frames in one batch.
+
+Reports that draw the figures in the browser use ``figures_json`` instead,
+which skips kaleido entirely and caches the plotly JSON the same way.
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import os
+import threading
+import time
+import warnings
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from pathlib import Path
+
+import kaleido
+import numpy as np
+import pandas as pd
+import plotly
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from . import plots
+from .cache import DiskLRUCache
+from .fingerprint import dataframe_fingerprint, json_fingerprint
+
+CHART_CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / "cache" / "charts"
+CHART_CACHE_MAX_BYTES = 256 * 2**20
+FIGURE_CACHE_MAX_BYTES = 64 * 2**20
+RENDER_PROCESSES = min(4, os.cpu_count() or 1)
+
+PlotFunction = Callable[[pd.DataFrame], go.Figure | None]
+
+# Any edit to the plotting code invalidates every cached image
+_PLOTS_SOURCE_HASH = hashlib.sha256(Path(plots.__file__).read_bytes()).hexdigest()
+
+chart_cache = DiskLRUCache(CHART_CACHE_DIR, CHART_CACHE_MAX_BYTES, suffix=".png")
+figure_cache = DiskLRUCache(CHART_CACHE_DIR, FIGURE_CACHE_MAX_BYTES, suffix=".json")
+
+
+def _render_figure(fig_json: str, settings: dict) -> tuple[bytes, float]:
+    started = time.perf_counter()
+    png = pio.to_image(pio.from_json(fig_json, skip_invalid=True), **settings)
+    return png, time.perf_counter() - started
+
+
+def _warm_up() -> None:
+    """Start kaleido once per worker instead of on every figure.
+
+    kaleido 1.x launches a new browser per ``to_image`` call unless its sync
+    server is running; kaleido 0.2.x keeps its own subprocess alive. The
+    server is only started after a first render succeeded, because it hangs
+    instead of raising when no browser is installed.
+    """
+    try:
+        pio.to_image(go.Figure(), format="png", width=10, height=10)
+    except Exception:
+        return  # Surfaces with the first real render
+    start_sync_server = getattr(kaleido, "start_sync_server", None)
+    if start_sync_server is not None:
+        warnings.filterwarnings("ignore", message="The kopts argument is ignored")
+        start_sync_server(silence_warnings=True)
+
+
+class ChartRenderer:
+    """Renders figures to PNG in a fixed pool of warm worker processes.
+
+    The pool is started on first use and kept for the life of the process.
+    ``processes=0`` renders in the calling thread instead. Per-image render
+    latencies (seconds, inside the worker) are kept for ``stats``.
+    """
+
+    def __init__(self, processes: int = RENDER_PROCESSES, history: int = 1000):
+        self.processes = processes
+        self.latencies: deque[float] = deque(maxlen=history)
+        self._pool: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.processes, initializer=_warm_up
+                )
+            return self._pool
+
+    def render_many(self, figs: Iterable[go.Figure], **settings) -> list[bytes]:
+        """PNG bytes for ``figs``, in order; ``settings`` go to ``pio.to_image``.
+
+        Each figure is handed to the pool as soon as ``figs`` yields it, so a
+        generator that builds figures overlaps building with rendering.
+        """
+        if self.processes == 0:
+            results = [_render_figure(fig.to_json(), settings) for fig in figs]
+        else:
+            executor = None
+            futures = []
+            try:
+                for fig in figs:
+                    executor = executor or self._executor()
+                    futures.append(
+                        executor.submit(_render_figure, fig.to_json(), settings)
+                    )
+                results = [future.result() for future in futures]
+            except BrokenProcessPool:
+                # A crashed worker breaks the pool; start a fresh one next time
+                self.shutdown()
+                raise
+        self.latencies.extend(latency for _, latency in results)
+        return [png for png, _ in results]
+
+    def render(self, fig: go.Figure, **settings) -> bytes:
+        return self.render_many([fig], **settings)[0]
+
+    def stats(self) -> dict[str, float]:
+        """Count and mean, median, 95th percentile and max render latency."""
+        latencies = np.array(self.latencies)
+        if latencies.size == 0:
+            return {"images": 0}
+        return {
+            "images": int(latencies.size),
+            "mean_s": float(latencies.mean()),
+            "p50_s": float(np.percentile(latencies, 50)),
+            "p95_s": float(np.percentile(latencies, 95)),
+            "max_s": float(latencies.max()),
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+chart_renderer = ChartRenderer()
+atexit.register(chart_renderer.shutdown)
+
+
+def _plot_id(plot_fn: Callable) -> str:
+    if isinstance(plot_fn, partial):
+        arguments = [repr(arg) for arg in plot_fn.args]
+        arguments += [
+            f"{key}={value!r}" for key, value in sorted(plot_fn.keywords.items())
+        ]
+        return f"{_plot_id(plot_fn.func)}({', '.join(arguments)})"
+    return f"{plot_fn.__module__}.{plot_fn.__qualname__}"
+
+
+def chart_key(
+    name: str,
+    plot_fn: PlotFunction,
+    data_fingerprint: str,
+    settings: dict,
+) -> str:
+    return json_fingerprint(
+        {
+            "name": name,
+            "plot": _plot_id(plot_fn),
+            "plots_source": _PLOTS_SOURCE_HASH,
+            "plotly": plotly.__version__,
+            "data": data_fingerprint,
+            "settings": settings,
+        }
+    )
+
+
+def render_plots_png(
+    plot_fns: dict[str, PlotFunction],
+    df: pd.DataFrame,
+    *,
+    width: int | None = None,
+    height: int | None = None,
+    scale: float = 2,
+    cache: DiskLRUCache | None = chart_cache,
+    renderer: ChartRenderer | None = None,
+) -> dict[str, bytes]:
+    """PNG bytes of ``plot_fn(df)`` per name, in the order of ``plot_fns``.
+
+    Cached images are returned without calling the plot function; the rest
+    are built, rendered by ``renderer`` (default ``chart_renderer``) and
+    stored. Plots that return None are left out. Pass ``cache=None`` to
+    always render.
+    """
+    return render_plot_sets_png(
+        plot_fns,
+        [df],
+        width=width,
+        height=height,
+        scale=scale,
+        cache=cache,
+        renderer=renderer,
+    )[0]
+
+
+def render_plot_sets_png(
+    plot_fns: dict[str, PlotFunction],
+    dfs: Sequence[pd.DataFrame],
+    *,
+    width: int | None = None,
+    height: int | None = None,
+    scale: float = 2,
+    cache: DiskLRUCache | None = chart_cache,
+    renderer: ChartRenderer | None = None,
+) -> list[dict[str, bytes]]:
+    """``render_plots_png`` for each of ``dfs``, rendered as one batch.
+
+    The figures of all frames go to the renderer together, which keeps every
+    pool worker busy instead of waiting for each frame's slowest image.
+    """
+    settings = {"format": "png", "width": width, "height": height, "scale": scale}
+    images: list[dict[str, bytes]] = [{} for _ in dfs]
+    missing: list[tuple[int, str, str, PlotFunction]] = []
+    for i, df in enumerate(dfs):
+        data_fingerprint = dataframe_fingerprint(df)
+        for name, plot_fn in plot_fns.items():
+            key = chart_key(name, plot_fn, data_fingerprint, settings)
+            png = None if cache is None else cache.get(key)
+            if png is None:
+                missing.append((i, name, key, plot_fn))
+            else:
+                images[i][name] = png
+
+    pending: list[tuple[int, str, str]] = []
+
+    def build() -> Iterator[go.Figure]:
+        for i, name, key, plot_fn in missing:
+            fig = plot_fn(dfs[i])
+            if fig is not None:
+                pending.append((i, name, key))
+                yield fig
+
+    renderer = chart_renderer if renderer is None else renderer
+    rendered = renderer.render_many(build(), **settings)
+    for (i, name, key), png in zip(pending, rendered, strict=True):
+        if cache is not None:
+            cache.put(key, png)
+        images[i][name] = png
+    return [
+        {name: frame_images[name] for name in plot_fns if name in frame_images}
+        for frame_images in images
+    ]
+
+
+def figures_json(
+    plot_fns: dict[str, PlotFunction],
+    df: pd.DataFrame,
+    *,
+    cache: DiskLRUCache | None = figure_cache,
+) -> dict[str, str]:
+    """Plotly JSON of ``plot_fn(df)`` per name, in the order of ``plot_fns``.
+
+    Cached like ``render_plots_png``, for reports that draw the figures with
+    plotly.js. Plots that return None are left out.
+    """
+    settings = {"format": "json"}
+    data_fingerprint = dataframe_fingerprint(df)
+    figures: dict[str, str] = {}
+    for name, plot_fn in plot_fns.items():
+        key = chart_key(name, plot_fn, data_fingerprint, settings)
+        data = None if cache is None else cache.get(key)
+        if data is not None:
+            figures[name] = data.decode()
+            continue
+        fig = plot_fn(df)
+        if fig is None:
+            continue
+        figures[name] = fig.to_json()
+        if cache is not None:
+            cache.put(key, figures[name].encode())
+    return figures
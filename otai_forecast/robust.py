@@ -0,0 +1,84 @@
+"""Monte Carlo assumption draws and risk measures for robust optimization."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from .models import ASSUMPTION_UPPER_BOUNDS, Assumptions
+
+ROBUST_METRICS = ("percentile", "cvar")
+
+
+def _upper_bound(field: str) -> float:
+    """Tightest of the field's ``le`` constraint and its validator cap."""
+    bound = ASSUMPTION_UPPER_BOUNDS.get(field, np.inf)
+    for meta in Assumptions.model_fields[field].metadata:
+        le = getattr(meta, "le", None)
+        if le is not None:
+            bound = min(bound, float(le))
+    return bound
+
+
+def sample_assumption_draws(
+    base: Assumptions,
+    n_draws: int,
+    *,
+    uncertainty: dict[str, float],
+    seed: int = 0,
+) -> list[Assumptions]:
+    """Sample assumption draws around ``base``.
+
+    Each field in ``uncertainty`` is multiplied by an independent mean-one
+    lognormal factor with the given sigma, then clipped to the field's valid
+    range. The same ``seed`` always yields the same draws, so every optimizer
+    trial is scored against identical futures (common random numbers).
+
+    Args:
+        base: Point-estimate assumptions to perturb
+        n_draws: Number of draws to sample
+        uncertainty: Mapping of assumption field name to lognormal sigma
+        seed: Random seed for the draws
+
+    Returns:
+        List of validated Assumptions, one per draw
+    """
+    if n_draws < 1:
+        raise ValueError("n_draws must be at least 1.")
+    unknown = set(uncertainty) - set(Assumptions.model_fields)
+    if unknown:
+        raise ValueError(f"Unknown assumption fields: {sorted(unknown)}")
+
+    rng = np.random.default_rng(seed)
+    fields = list(uncertainty)
+    sigmas = np.array([uncertainty[field] for field in fields], dtype=float)
+    factors = np.exp(
+        rng.standard_normal((n_draws, len(fields))) * sigmas - 0.5 * sigmas**2
+    )
+    base_values = np.array([getattr(base, field) for field in fields], dtype=float)
+    upper = np.array([_upper_bound(field) for field in fields])
+    values = np.clip(base_values * factors, 0.0, upper)
+
+    base_dump = base.model_dump()
+    return [
+        Assumptions.model_validate(
+            {**base_dump, **dict(zip(fields, row.tolist(), strict=True))}
+        )
+        for row in values
+    ]
+
+
+def robust_value(values: np.ndarray, metric: str, level: float) -> float:
+    """Aggregate per-draw outcomes into one risk-adjusted value.
+
+    ``percentile`` returns the ``level`` quantile; ``cvar`` returns the mean of
+    the outcomes at or below that quantile (the lower tail).
+    """
+    if metric not in ROBUST_METRICS:
+        raise ValueError(f"robust_metric must be one of {ROBUST_METRICS}.")
+    if not 0.0 < level <= 1.0:
+        raise ValueError("robust_level must be in (0, 1].")
+    values = np.asarray(values, dtype=float)
+    threshold = float(np.quantile(values, level))
+    if metric == "percentile":
+        return threshold
+    return float(values[values <= threshold].mean())
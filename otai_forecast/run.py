@@ -1,86 +1,91 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from otai_forecast.config import (
     ALL_SCENARIOS,
     OPTIMIZER_KNOT_CONFIG,
     OPTIMIZER_NUM_KNOTS,
+    OPTIMIZER_REFINEMENT_STAGES,
+    ROBUST_LEVEL,
+    ROBUST_METRIC,
+    ROBUST_NUM_DRAWS,
+    ROBUST_SEED,
+    ROBUST_UNCERTAINTY,
     RUN_BASE_DECISION,
     SCENARIO_ASSUMPTIONS,
     WARM_START_KNOTS,
     build_base_decisions,
 )
-from otai_forecast.decision_optimizer import (
-    choose_best_decisions_by_market_cap,
-    run_simulation_df,
-)
+from otai_forecast.decision_optimizer import choose_best_decisions_by_market_cap
 from otai_forecast.export import export_scenarios, export_simple_budget
-from otai_forecast.models import Assumptions, MonthlyDecision, ScenarioAssumptions
 from otai_forecast.optimization_storage import (
     assumptions_hash,
-    load_optimization,
+    open_optimization,
     save_optimization,
+    stored_simulation_df,
 )
+from otai_forecast.robust import sample_assumption_draws
+from otai_forecast.trial_archive import TrialArchive
 
-OPTIMIZATION_DIR = Path(__file__).resolve().parent.parent / "data" / "optimizations"
-
+if TYPE_CHECKING:
+    from otai_forecast.models import ScenarioAssumptions
 
-def _scenario_name_from_payload(
-        payload: dict,
-        default_name: str,
-) -> str:
-    raw_scenarios = payload.get("assumption_scenarios")
-    if not isinstance(raw_scenarios, list):
-        return default_name
-    for scenario in raw_scenarios:
-        if not isinstance(scenario, dict):
-            continue
-        try:
-            scenario_obj = ScenarioAssumptions(**scenario)
-        except Exception:
-            continue
-        if assumptions_hash(scenario_obj.assumptions) == payload.get("assumption_hash"):
-            return scenario_obj.name
-    return default_name
-
-
-def _load_payload_results(payload: dict) -> tuple[Assumptions, list[MonthlyDecision]]:
-    assumptions = Assumptions(**payload["assumptions"])
-    decisions = [MonthlyDecision(**decision) for decision in payload["decisions"]]
-    return assumptions, decisions
+OPTIMIZATION_DIR = Path(__file__).resolve().parent.parent / "data" / "optimizations"
 
 
 def run(
         *,
         use_existing_results: bool = False,
         scenarios: list[ScenarioAssumptions] | None = None,
+        robust: bool = False,
+        coarse_to_fine: bool = False,
 ) -> None:
     scenario_results = []
 
     for scenario in (scenarios or ALL_SCENARIOS):
         assumptions = scenario.assumptions
         assumption_key = assumptions_hash(assumptions)
-        payload = load_optimization(OPTIMIZATION_DIR, assumption_key)
+        payload = open_optimization(OPTIMIZATION_DIR, assumption_key)
 
         if use_existing_results:
             if payload is None:
                 raise FileNotFoundError(
                     f"No stored optimization found for {scenario.name} ({assumption_key})."
                 )
-            assumptions, decisions = _load_payload_results(payload)
+            assumptions, decisions = payload.assumptions, payload.decisions
+            df = stored_simulation_df(OPTIMIZATION_DIR, assumptions, decisions)
         else:
             # Create simple constant decisions - optimizer will find the optimal values
             base_decisions = build_base_decisions(assumptions.months, RUN_BASE_DECISION)
-
-            decisions, df = choose_best_decisions_by_market_cap(
-                assumptions,
-                base_decisions,
-                num_knots=OPTIMIZER_NUM_KNOTS,
-                knot_config=OPTIMIZER_KNOT_CONFIG,
-                max_evals=1000,
-                warm_start_knots=WARM_START_KNOTS,
+            assumption_draws = (
+                sample_assumption_draws(
+                    assumptions,
+                    ROBUST_NUM_DRAWS,
+                    uncertainty=ROBUST_UNCERTAINTY,
+                    seed=ROBUST_SEED,
+                )
+                if robust
+                else None
             )
+
+            with TrialArchive(OPTIMIZATION_DIR, assumption_key) as archive:
+                decisions, df = choose_best_decisions_by_market_cap(
+                    assumptions,
+                    base_decisions,
+                    num_knots=OPTIMIZER_NUM_KNOTS,
+                    knot_config=OPTIMIZER_KNOT_CONFIG,
+                    max_evals=1000,
+                    warm_start_knots=WARM_START_KNOTS,
+                    assumption_draws=assumption_draws,
+                    robust_metric=ROBUST_METRIC,
+                    robust_level=ROBUST_LEVEL,
+                    refinement_stages=(
+                        OPTIMIZER_REFINEMENT_STAGES if coarse_to_fine else None
+                    ),
+                    callbacks=[archive],
+                )
             save_optimization(
                 assumptions,
                 decisions,
@@ -89,12 +94,7 @@ def run(
                 scenario_assumptions=ALL_SCENARIOS,
             )
 
-        df = run_simulation_df(assumptions, decisions)
-        scenario_name = (
-            _scenario_name_from_payload(payload, scenario.name)
-            if payload
-            else scenario.name
-        )
+        scenario_name = (payload and payload.scenario_name) or scenario.name
 
         scenario_results.append(
             {
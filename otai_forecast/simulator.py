@@ -3,10 +3,24 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
+import pandas as pd
+
 from .compute import run_simulation, run_simulation_rows
 
 if TYPE_CHECKING:
-    from .models import Assumptions, MonthlyCalculated, MonthlyDecisions
+    import numpy as np
+
+    from .models import (
+        Assumptions,
+        MonthlyCalculated,
+        MonthlyDecision,
+        MonthlyDecisions,
+    )
+
+# Bump whenever simulation output changes for the same inputs (compute.py and
+# its batch mirror batch_compute.py, the market cap columns, ...) so that
+# stored monthly results are recomputed.
+ENGINE_VERSION = 1
 
 
 @dataclass
@@ -27,3 +41,51 @@ def simulate(a: Assumptions, decisions: MonthlyDecisions) -> list[MonthlyCalcula
 
 def simulate_rows(a: Assumptions, decisions: MonthlyDecisions) -> list[dict]:
     return run_simulation_rows(a, decisions)
+
+
+def compute_market_cap(
+        revenue: pd.Series | pd.DataFrame,
+        cash: pd.Series | pd.DataFrame,
+        debt: pd.Series | pd.DataFrame,
+        market_cap_multiple: float | np.ndarray,
+) -> tuple[pd.Series | pd.DataFrame, pd.Series | pd.DataFrame]:
+    """Compute TTM revenue and market cap month by month.
+
+    Works column-wise on DataFrames, so one call can value many simulated paths.
+    """
+    revenue_ttm = revenue.rolling(window=12, min_periods=1).sum()
+
+    # Calculate revenue growth rate (6-month average for stability)
+    revenue_growth = revenue.pct_change().rolling(window=6, min_periods=1).mean()
+
+    # Growth multiplier: higher growth increases the market cap multiple
+    growth_multiplier = 1 + 2 * revenue_growth.clip(lower=-0.5, upper=1)  # Between 0.5x and 3x
+
+    # Cash burn penalty: burning cash reduces the multiple
+    cash_change = cash.diff().fillna(0)
+    burn_penalty = 1 - 0.2 * (cash_change < 0).astype(float) * (-cash_change / revenue_ttm).clip(upper=0.5)
+
+    # Dynamic market cap multiple based on growth and profitability
+    dynamic_multiple = market_cap_multiple * growth_multiplier * burn_penalty
+
+    # Enterprise value: apply dynamic multiple to revenue
+    enterprise_value = revenue_ttm * dynamic_multiple
+
+    # Net cash position: cash minus 2x debt (debt is more punitive)
+    net_cash = 0.1 * cash - 0.5 * debt
+
+    # Final market cap: enterprise value plus net cash
+    return revenue_ttm, enterprise_value + net_cash
+
+
+def add_market_cap_columns(df: pd.DataFrame, a: Assumptions) -> pd.DataFrame:
+    df = df.copy()
+    df["revenue_ttm"], df["market_cap"] = compute_market_cap(
+        df["revenue_total"], df["cash"], df["debt"], a.market_cap_multiple
+    )
+    return df
+
+
+def run_simulation_df(a: Assumptions, decisions: list[MonthlyDecision]) -> pd.DataFrame:
+    df = pd.DataFrame(Simulator(a=a, decisions=decisions).run_rows())
+    return add_market_cap_columns(df, a)
@@ -0,0 +1,273 @@
+"""Append-only archive of every optimizer trial, per assumptions hash.
+
+Trials are buffered by an Optuna callback and written as immutable chunk
+files to ``trials_<assumptions hash>/`` next to the stored optimization::
+
+    with TrialArchive(OPTIMIZATION_DIR, assumption_hash) as archive:
+        study.optimize(objective, n_trials=1000, callbacks=[archive])
+
+Each chunk holds the knot vectors, objective values, constraint violations,
+states and timings of its trials as a few columnar arrays, so concurrent
+workers can append without coordination and ``load_trial_history`` only has
+to read and concatenate a handful of files.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import threading
+import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+import optuna
+import pandas as pd
+
+from .fileio import atomic_write_bytes, file_lock
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+STATES = [state.name for state in optuna.trial.TrialState]
+_CHUNK_GLOB = "chunk_*.npz"
+_ARRAYS = (
+    "study",
+    "number",
+    "state",
+    "value",
+    "constraints",
+    "datetime_start",
+    "datetime_complete",
+    "params",
+)
+
+
+def trial_archive_dir(base_dir: Path, assumption_hash: str) -> Path:
+    return base_dir / f"trials_{assumption_hash}"
+
+
+def _archive_lock(directory: Path) -> Path:
+    return directory.parent / f".{directory.name}.lock"
+
+
+def _timestamp(value) -> float:
+    return np.nan if value is None else value.timestamp()
+
+
+def _chunk_from_trials(trials: list[tuple[str, optuna.trial.FrozenTrial]]) -> dict:
+    study_names = list(dict.fromkeys(study for study, _ in trials))
+    param_names = list(
+        dict.fromkeys(name for _, trial in trials for name in trial.params)
+    )
+    params = np.full((len(trials), len(param_names)), np.nan)
+    constraints = np.full((len(trials), 2), np.nan)
+    for row, (_, trial) in enumerate(trials):
+        for col, name in enumerate(param_names):
+            params[row, col] = trial.params.get(name, np.nan)
+        if "constraints" in trial.user_attrs:
+            constraints[row] = trial.user_attrs["constraints"]
+    return {
+        "study_names": study_names,
+        "param_names": param_names,
+        "study": np.array([study_names.index(s) for s, _ in trials], dtype=np.int32),
+        "number": np.array([t.number for _, t in trials], dtype=np.int64),
+        "state": np.array(
+            [STATES.index(t.state.name) for _, t in trials], dtype=np.int8
+        ),
+        "value": np.array(
+            [np.nan if t.value is None else t.value for _, t in trials], dtype=float
+        ),
+        "constraints": constraints,
+        "datetime_start": np.array([_timestamp(t.datetime_start) for _, t in trials]),
+        "datetime_complete": np.array(
+            [_timestamp(t.datetime_complete) for _, t in trials]
+        ),
+        "params": params,
+    }
+
+
+def _merge_chunks(chunks: list[dict]) -> dict:
+    """Concatenate chunks, aligning their study and parameter names."""
+    if len(chunks) == 1:
+        return chunks[0]
+    study_names = list(dict.fromkeys(n for c in chunks for n in c["study_names"]))
+    param_names = list(dict.fromkeys(n for c in chunks for n in c["param_names"]))
+    n_rows = sum(len(c["number"]) for c in chunks)
+    params = np.full((n_rows, len(param_names)), np.nan)
+    studies = np.empty(n_rows, dtype=np.int32)
+    row = 0
+    for chunk in chunks:
+        n = len(chunk["number"])
+        cols = [param_names.index(name) for name in chunk["param_names"]]
+        params[row:row + n, cols] = chunk["params"]
+        codes = np.array(
+            [study_names.index(s) for s in chunk["study_names"]], dtype=np.int32
+        )
+        studies[row:row + n] = codes[chunk["study"]]
+        row += n
+    merged = {"study_names": study_names, "param_names": param_names}
+    merged.update(
+        {
+            key: np.concatenate([c[key] for c in chunks])
+            for key in _ARRAYS
+            if key not in ("study", "params")
+        }
+    )
+    merged["study"] = studies
+    merged["params"] = params
+    return merged
+
+
+def _write_chunk(path: Path, chunk: dict) -> None:
+    meta = {"study_names": chunk["study_names"], "param_names": chunk["param_names"]}
+    buffer = io.BytesIO()
+    np.savez(
+        buffer,
+        __meta__=np.array(json.dumps(meta)),
+        **{key: chunk[key] for key in _ARRAYS},
+    )
+    atomic_write_bytes(path, buffer.getvalue())
+
+
+def _read_chunk(path: Path) -> dict:
+    with np.load(path, allow_pickle=False) as data:
+        chunk = {key: data[key] for key in _ARRAYS}
+        chunk.update(json.loads(str(data["__meta__"])))
+    return chunk
+
+
+def _new_chunk_name() -> str:
+    # Unique, time-ordered names let any number of writers append
+    return f"chunk_{time.time_ns():020d}_{os.getpid()}_{threading.get_ident()}.npz"
+
+
+class TrialArchive:
+    """Optuna callback that appends finished trials to the archive in chunks.
+
+    Thread-safe, so it can be used with ``n_jobs > 1``. Buffered trials are
+    written every ``chunk_size`` trials and on ``flush``/context exit.
+    """
+
+    def __init__(self, base_dir: Path, assumption_hash: str, chunk_size: int = 500):
+        self.directory = trial_archive_dir(base_dir, assumption_hash)
+        self.chunk_size = chunk_size
+        self._buffer: list[tuple[str, optuna.trial.FrozenTrial]] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, study: optuna.Study, trial: optuna.trial.FrozenTrial) -> None:
+        with self._lock:
+            self._buffer.append((study.study_name, trial))
+            if len(self._buffer) >= self.chunk_size:
+                self._write_buffer()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._buffer:
+                self._write_buffer()
+
+    def __enter__(self) -> TrialArchive:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.flush()
+
+    def _write_buffer(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        _write_chunk(
+            self.directory / _new_chunk_name(), _chunk_from_trials(self._buffer)
+        )
+        self._buffer = []
+
+
+def load_trial_history(base_dir: Path, assumption_hash: str) -> pd.DataFrame:
+    """All archived trials for an assumptions hash, in the order they were written.
+
+    One row per trial with ``study``, ``number``, ``state``, ``value``,
+    ``constraint_cash``, ``constraint_liquidity``, ``datetime_start``,
+    ``datetime_complete``, ``duration_s`` and one column per knot parameter
+    (NaN where a trial did not use that parameter, e.g. coarser stages).
+    """
+    directory = trial_archive_dir(base_dir, assumption_hash)
+    chunks = []
+    if directory.exists():
+        with file_lock(_archive_lock(directory)):
+            chunks = [_read_chunk(path) for path in sorted(directory.glob(_CHUNK_GLOB))]
+    if not chunks:
+        chunks = [_chunk_from_trials([])]
+    merged = _merge_chunks(chunks)
+    start = pd.to_datetime(merged["datetime_start"], unit="s", utc=True)
+    complete = pd.to_datetime(merged["datetime_complete"], unit="s", utc=True)
+    df = pd.DataFrame(merged["params"], columns=merged["param_names"], copy=False)
+    # Inserting into the parameter frame avoids copying the (trials x knots) block
+    columns = {
+        "study": pd.Categorical.from_codes(
+            merged["study"], categories=merged["study_names"]
+        ),
+        "number": merged["number"],
+        "state": pd.Categorical.from_codes(merged["state"], categories=STATES),
+        "value": merged["value"],
+        "constraint_cash": merged["constraints"][:, 0],
+        "constraint_liquidity": merged["constraints"][:, 1],
+        "datetime_start": start,
+        "datetime_complete": complete,
+        "duration_s": (complete - start).total_seconds(),
+    }
+    for position, (name, values) in enumerate(columns.items()):
+        df.insert(position, name, values)
+    return df
+
+
+def compact_trial_history(base_dir: Path, assumption_hash: str) -> int:
+    """Merge all chunks of an archive into one; returns the number merged.
+
+    Writers can keep appending meanwhile: only the chunks that were read are
+    replaced, and readers wait on the same lock.
+    """
+    directory = trial_archive_dir(base_dir, assumption_hash)
+    with file_lock(_archive_lock(directory)):
+        paths = sorted(directory.glob(_CHUNK_GLOB))
+        if len(paths) < 2:
+            return len(paths)
+        merged = _merge_chunks([_read_chunk(path) for path in paths])
+        # Replacing the oldest chunk keeps the merged trials first in order
+        _write_chunk(paths[0], merged)
+        for path in paths[1:]:
+            path.unlink()
+    return len(paths)
+
+
+def move_trial_history(base_dir: Path, assumption_hash: str, dest_dir: Path) -> bool:
+    """Move an archive to ``dest_dir`` (e.g. an archive of orphaned results).
+
+    Returns False if there is no archive for ``assumption_hash``.
+    """
+    directory = trial_archive_dir(base_dir, assumption_hash)
+    with file_lock(_archive_lock(directory)):
+        if not directory.exists():
+            return False
+        target = trial_archive_dir(dest_dir, assumption_hash)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists():
+            # Keep the chunks archived earlier next to the new ones
+            for path in directory.glob(_CHUNK_GLOB):
+                path.replace(target / path.name)
+            directory.rmdir()
+        else:
+            directory.replace(target)
+    return True
+
+
+def delete_trial_history(base_dir: Path, assumption_hash: str) -> int:
+    """Delete an archive; returns the number of bytes freed."""
+    directory = trial_archive_dir(base_dir, assumption_hash)
+    freed = 0
+    with file_lock(_archive_lock(directory)):
+        if not directory.exists():
+            return 0
+        for path in directory.iterdir():
+            freed += path.stat().st_size
+            path.unlink()
+        directory.rmdir()
+    return freed
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import sys
-import tempfile
 from collections.abc import Callable, Iterable
 from pathlib import Path
 
@@ -16,16 +15,17 @@ from otai_forecast.config import (
     SCENARIO_ASSUMPTIONS,
     build_base_decisions, OPTIMIZER_NUM_KNOTS,
 )
-from otai_forecast.decision_optimizer import (
-    choose_best_decisions_by_market_cap,
-    run_simulation_df,
-)
-from otai_forecast.export import export
+from otai_forecast.decision_optimizer import choose_best_decisions_by_market_cap
+from otai_forecast.export_jobs import export_queue
+from otai_forecast.kpis import compute_kpis
 from otai_forecast.models import Assumptions, MonthlyDecision, ScenarioAssumptions
 from otai_forecast.optimization_storage import (
+    LazyOptimizationPayload,
     assumptions_hash,
-    load_optimization,
+    load_index,
+    open_optimization,
     save_optimization,
+    stored_simulation_df,
 )
 from otai_forecast.plots import (
     plot_cash_burn_rate,
@@ -44,6 +44,7 @@ from otai_forecast.plots import (
     plot_unit_economics,
     plot_user_growth_stacked,
 )
+from otai_forecast.trial_archive import TrialArchive
 
 sys.path.append(str(Path(__file__).parent))
 
@@ -66,16 +67,16 @@ def _scenario_map(
     return {scenario.name: scenario for scenario in scenarios}
 
 
-def _load_scenario_assumptions(payload: dict | None) -> list[ScenarioAssumptions]:
+def _load_scenario_assumptions(
+        payload: LazyOptimizationPayload | None,
+) -> list[ScenarioAssumptions]:
     if payload is None:
         return list(ALL_SCENARIOS)
-    raw_scenarios = payload.get("assumption_scenarios")
-    if not isinstance(raw_scenarios, list) or not raw_scenarios:
+    raw_scenarios = payload.scenario_records
+    if not raw_scenarios:
         return list(ALL_SCENARIOS)
     scenarios: list[ScenarioAssumptions] = []
     for scenario in raw_scenarios:
-        if not isinstance(scenario, dict):
-            continue
         try:
             scenarios.append(ScenarioAssumptions(**scenario))
         except Exception:
@@ -83,16 +84,13 @@ def _load_scenario_assumptions(payload: dict | None) -> list[ScenarioAssumptions
     return scenarios or list(ALL_SCENARIOS)
 
 
-def _apply_optimization_payload(payload: dict) -> None:
-    assumptions = Assumptions(**payload["assumptions"])
-    decisions = [
-        MonthlyDecision(**decision)
-        for decision in payload["decisions"]
-    ]
+def _apply_optimization_payload(payload: LazyOptimizationPayload) -> None:
+    assumptions = payload.assumptions
+    decisions = payload.decisions
     st.session_state.assumptions = assumptions
     st.session_state.decisions = decisions
-    st.session_state.df = run_simulation_df(assumptions, decisions)
-    st.session_state.assumption_key = payload.get("assumption_hash") or assumptions_hash(
+    st.session_state.df = stored_simulation_df(OPTIMIZATION_DIR, assumptions, decisions)
+    st.session_state.assumption_key = payload.assumption_hash or assumptions_hash(
         assumptions
     )
     st.session_state.scenario_assumptions = _load_scenario_assumptions(payload)
@@ -113,7 +111,7 @@ def _activate_scenario(scenario: ScenarioAssumptions) -> None:
     st.session_state.selected_scenario_name = scenario.name
     assumption_key = assumptions_hash(scenario.assumptions)
     st.session_state.assumption_key = assumption_key
-    payload = load_optimization(OPTIMIZATION_DIR, assumption_key)
+    payload = open_optimization(OPTIMIZATION_DIR, assumption_key)
     if payload:
         _apply_optimization_payload(payload)
         return
@@ -193,22 +191,61 @@ def _render_plotly(fig: object) -> None:
     )
 
 
+@st.fragment(run_every=1.0)
+def _export_job_progress(key: str) -> None:
+    job = export_queue.get(key)
+    if job is not None and job.status in ("queued", "running"):
+        st.info(f"Preparing report ({job.status})...")
+        return
+    # Finished: rerun the page so the download button replaces this
+    st.rerun()
+
+
+def _render_export_controls(
+        df: pd.DataFrame,
+        assumptions: Assumptions | None,
+        decisions: list[MonthlyDecision] | None,
+) -> None:
+    """Export on request in the background; offer the file once it is ready."""
+    key = export_queue.key(df, assumptions, decisions)
+    job = export_queue.get(key)
+    if job is None or (job.status == "done" and not job.path.exists()):
+        if st.button("📊 Prepare Complete Report"):
+            job = export_queue.submit(df, assumptions, decisions)
+        else:
+            return
+    if job.status in ("queued", "running"):
+        _export_job_progress(key)
+    elif job.status == "failed":
+        st.error("Report export failed.")
+        with st.expander("Details"):
+            st.code(job.error or "")
+        if st.button("Retry export"):
+            export_queue.submit(df, assumptions, decisions)
+            st.rerun()
+    else:
+        st.download_button(
+            label="📊 Download Complete Report",
+            data=job.read_bytes(),
+            file_name="OTAI_Simulation_Report.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        )
+        if job.duration_s is not None:
+            st.caption(f"Prepared in {job.duration_s:.1f}s")
+
+
 def _build_scenario_summary(
     scenarios: Iterable[ScenarioAssumptions],
 ) -> pd.DataFrame:
     rows: list[dict[str, str]] = []
+    index = load_index(OPTIMIZATION_DIR)
     for scenario in scenarios:
-        payload = load_optimization(
-            OPTIMIZATION_DIR,
-            assumptions_hash(scenario.assumptions),
-        )
+        entry = index.get(assumptions_hash(scenario.assumptions))
         end_market_cap = None
-        if isinstance(payload, dict):
-            summary = payload.get("summary")
-            if isinstance(summary, dict):
-                value = summary.get("end_market_cap")
-                if isinstance(value, (int, float)):
-                    end_market_cap = float(value)
+        if entry is not None:
+            value = entry["summary"].get("end_market_cap")
+            if isinstance(value, (int, float)):
+                end_market_cap = float(value)
         rows.append(
             {
                 "Scenario": scenario.name,
@@ -345,7 +382,7 @@ def main():
         st.session_state.assumption_key = assumptions_hash(selected_scenario.assumptions)
 
     if "df" not in st.session_state:
-        payload = load_optimization(OPTIMIZATION_DIR, st.session_state.assumption_key)
+        payload = open_optimization(OPTIMIZATION_DIR, st.session_state.assumption_key)
         if payload:
             _apply_optimization_payload(payload)
         else:
@@ -426,7 +463,9 @@ def main():
         a = selected_scenario.assumptions
 
         if run_opt:
-            with st.spinner("Running optimization..."):
+            with st.spinner("Running optimization..."), TrialArchive(
+                OPTIMIZATION_DIR, assumptions_hash(a)
+            ) as archive:
                 base_decisions = build_base_decisions(a.months, DEFAULT_DECISION)
                 decisions, df = choose_best_decisions_by_market_cap(
                     a,
@@ -435,6 +474,7 @@ def main():
                     knot_lows=OPTIMIZER_KNOT_LOWS,
                     knot_highs=OPTIMIZER_KNOT_HIGHS,
                     max_evals=int(max_evals),
+                    callbacks=[archive],
                 )
                 st.session_state.df = df
                 st.session_state.decisions = decisions
@@ -524,53 +564,46 @@ def main():
         # KPIs
         st.header("📊 Key Performance Indicators")
 
+        kpis = compute_kpis(df)
         col1, col2, col3, col4 = st.columns(4)
 
         with col1:
-            end_cash = df["cash"].iloc[-1]
-            st.metric("End Cash", f"€{end_cash:,.0f}")
+            st.metric("End Cash", f"€{kpis['end_cash']:,.0f}")
 
         with col2:
-            min_cash = df["cash"].min()
-            st.metric("Min Cash", f"€{min_cash:,.0f}")
+            st.metric("Min Cash", f"€{kpis['min_cash']:,.0f}")
 
         with col3:
-            end_pro = df["pro_active"].iloc[-1]
-            end_ent = df["ent_active"].iloc[-1]
-            st.metric("End Pro/Ent", f"{int(end_pro)}/{int(end_ent)}")
+            end_pro = int(kpis["end_pro_active"])
+            end_ent = int(kpis["end_ent_active"])
+            st.metric("End Pro/Ent", f"{end_pro}/{end_ent}")
 
         with col4:
-            end_pv = df["product_value"].iloc[-1]
-            st.metric("End Product Value", f"{end_pv:,.2f}")
+            st.metric("End Product Value", f"{kpis['end_product_value']:,.2f}")
 
         col1, col2 = st.columns(2)
 
         with col1:
-            end_revenue_ttm = df["revenue_ttm"].iloc[-1]
-            st.metric("End TTM Revenue", f"€{end_revenue_ttm:,.0f}")
+            st.metric("End TTM Revenue", f"€{kpis['end_revenue_ttm']:,.0f}")
 
         with col2:
-            end_market_cap = df["market_cap"].iloc[-1]
-            st.metric("End Market Cap", f"€{end_market_cap:,.0f}")
+            st.metric("End Market Cap", f"€{kpis['end_market_cap']:,.0f}")
 
         # Additional KPIs
         col1, col2, col3, col4 = st.columns(4)
 
         with col1:
-            total_revenue = df["revenue_total"].sum()
-            st.metric("Total Revenue", f"€{total_revenue:,.0f}")
+            st.metric("Total Revenue", f"€{kpis['total_revenue']:,.0f}")
 
         with col2:
-            total_costs = df["costs_ex_tax"].sum()
-            st.metric("Total Costs (ex tax)", f"€{total_costs:,.0f}")
+            st.metric("Total Costs (ex tax)", f"€{kpis['total_costs_ex_tax']:,.0f}")
 
         with col3:
-            total_profit = df["profit_bt"].sum() - df["tax"].sum()
+            total_profit = kpis["total_profit_after_tax"]
             st.metric("Total Profit (after tax)", f"€{total_profit:,.0f}")
 
         with col4:
-            total_leads = df["leads_total"].sum()
-            st.metric("Total Leads", f"{total_leads:,.0f}")
+            st.metric("Total Leads", f"{kpis['total_leads']:,.0f}")
 
         # Charts
         st.header("📈 Visualizations")
@@ -691,23 +724,8 @@ def main():
         a = st.session_state.get("assumptions")
         decisions = st.session_state.get("decisions")
 
-        with tempfile.TemporaryDirectory() as td:
-            out_path_report = str(Path(td) / "OTAI_Simulation_Report.xlsx")
-
-            export(
-                df, out_path=out_path_report, assumptions=a, monthly_decisions=decisions
-            )
-
-            with open(out_path_report, "rb") as f:
-                b_report = f.read()
-
         with col1:
-            st.download_button(
-                label="📊 Download Complete Report",
-                data=b_report,
-                file_name="OTAI_Simulation_Report.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            )
+            _render_export_controls(df, a, decisions)
 
     with tab_docs:
         # Read and display the documentation markdown
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import os
+import unittest.mock
+
+import pytest
+
+from otai_forecast import cache as cache_module
+from otai_forecast.cache import SimulationCache
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _isolated_simulation_cache(tmp_path_factory: pytest.TempPathFactory):
+    """Keep cached simulation results out of the repository's data/cache."""
+    directory = tmp_path_factory.mktemp("simulations")
+    with (
+        unittest.mock.patch.dict(
+            os.environ, {"OTAI_SIMULATION_CACHE_DIR": str(directory)}
+        ),
+        unittest.mock.patch.object(
+            cache_module, "simulation_cache", SimulationCache(directory)
+        ),
+    ):
+        yield
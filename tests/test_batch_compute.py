@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+
+from otai_forecast.batch_compute import BATCH_COLUMNS
+from otai_forecast.config import (
+    DEFAULT_ASSUMPTIONS,
+    ROBUST_UNCERTAINTY,
+    SCENARIO_ASSUMPTIONS,
+)
+from otai_forecast.decision_optimizer import run_simulation_batch, run_simulation_df
+from otai_forecast.models import MonthlyDecision
+from otai_forecast.robust import sample_assumption_draws
+
+
+class TestBatchCompute(unittest.TestCase):
+    def setUp(self) -> None:
+        self.decisions = [
+            MonthlyDecision(
+                ads_budget=500.0 + 100.0 * i,
+                seo_budget=800.0,
+                dev_budget=3000.0 + 500.0 * i,
+                partner_budget=400.0 if i % 2 else 0.0,
+                outreach_budget=1500.0 if i < 12 else 0.0,
+            )
+            for i in range(DEFAULT_ASSUMPTIONS.months)
+        ]
+
+    def test_batch_matches_scalar_simulation(self) -> None:
+        draws = [
+            SCENARIO_ASSUMPTIONS["conservative_no_inv"].assumptions,
+            SCENARIO_ASSUMPTIONS["realistic_inv"].assumptions,
+            SCENARIO_ASSUMPTIONS["optimistic_no_inv"].assumptions,
+            *sample_assumption_draws(
+                DEFAULT_ASSUMPTIONS, 6, uncertainty=ROBUST_UNCERTAINTY, seed=7
+            ),
+        ]
+        out = run_simulation_batch(draws, self.decisions)
+        self.assertTrue(out["valid"].all())
+        for j, a in enumerate(draws):
+            df = run_simulation_df(a, self.decisions)
+            # Every batch column, so a formula changed in only one engine fails
+            for column in [*BATCH_COLUMNS, "revenue_ttm", "market_cap"]:
+                np.testing.assert_allclose(
+                    out[column][:, j],
+                    df[column].to_numpy(),
+                    rtol=1e-9,
+                    atol=1e-6,
+                    err_msg=f"{column} differs for draw {j}",
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from otai_forecast.benchmark import compare, main, run_case, run_cases
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_run_case_is_deterministic(self) -> None:
+        first = run_case("conservative_no_inv", "tpe", 0, 8)
+        second = run_case("conservative_no_inv", "tpe", 0, 8)
+
+        self.assertEqual(first["best_so_far"], second["best_so_far"])
+        self.assertEqual(len(first["best_so_far"]), 8)
+        self.assertEqual(len(first["elapsed_s"]), 8)
+        self.assertEqual(first["elapsed_s"], sorted(first["elapsed_s"]))
+
+        rows = compare({"runs": [first]}, {"runs": [second]})
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["best_change"], 0.0)
+
+    def test_smaller_budgets_are_prefixes_of_one_run(self) -> None:
+        short, full = run_cases("conservative_no_inv", "tpe", 0, [4, 8])
+        alone = run_case("conservative_no_inv", "tpe", 0, 4)
+
+        self.assertEqual([short["budget"], full["budget"]], [4, 8])
+        self.assertEqual(short["best_so_far"], alone["best_so_far"])
+        self.assertEqual(short["best_so_far"], full["best_so_far"][:4])
+        self.assertEqual(short["final_best"], alone["final_best"])
+        self.assertEqual(short["feasibility"], alone["feasibility"])
+        self.assertLessEqual(short["wall_time_s"], full["wall_time_s"])
+
+    def test_compare_zero_old_median_is_not_applicable(self) -> None:
+        run = {
+            "scenario": "s",
+            "sampler": "tpe",
+            "budget": 8,
+            "final_best": 0.0,
+            "wall_time_s": 1.0,
+        }
+        rows = compare({"runs": [run]}, {"runs": [{**run, "final_best": 5.0}]})
+        self.assertIsNone(rows[0]["best_change"])
+
+        with tempfile.TemporaryDirectory() as td:
+            old, new = Path(td) / "old.json", Path(td) / "new.json"
+            old.write_text(json.dumps({"runs": [run]}), encoding="utf-8")
+            new.write_text(json.dumps({"runs": [run]}), encoding="utf-8")
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                main(["--compare", str(old), str(new)])
+        self.assertIn("(n/a)", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+import unittest.mock
+from pathlib import Path
+
+import pandas as pd
+
+from otai_forecast import cache as cache_module
+from otai_forecast.cache import (
+    DiskLRUCache,
+    LRUCache,
+    SimulationCache,
+    cached_run_simulation_df,
+    frame_from_npz,
+    frame_to_npz,
+)
+from otai_forecast.config import (
+    DEFAULT_ASSUMPTIONS,
+    RUN_BASE_DECISION,
+    build_base_decisions,
+)
+from otai_forecast.decision_optimizer import run_simulation_df
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self) -> None:
+        lru = LRUCache(2)
+        lru.put("a", 1)
+        lru.put("b", 2)
+        self.assertEqual(lru.get("a"), 1)
+        lru.put("c", 3)
+        self.assertIsNone(lru.get("b"))
+        self.assertEqual(lru.get("a"), 1)
+        self.assertEqual(lru.get("c"), 3)
+        self.assertEqual((lru.hits, lru.misses), (3, 1))
+
+
+class TestDiskLRUCache(unittest.TestCase):
+    def test_evicts_least_recently_used_over_budget(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            disk = DiskLRUCache(Path(td), max_bytes=350, low_water=1.0)
+            for i, key in enumerate(("a", "b", "c")):
+                disk.put(key, bytes(100))
+                # Distinct, ordered last-use times regardless of clock resolution
+                os.utime(disk.path(key), (i, i))
+            self.assertIsNotNone(disk.get("a"))
+            disk.put("d", bytes(100))
+
+            self.assertEqual(disk.evictions, 1)
+            self.assertFalse(disk.path("b").exists())
+            for key in ("a", "c", "d"):
+                self.assertTrue(disk.path(key).exists())
+            self.assertLessEqual(disk.size(), 350)
+            self.assertIsNone(disk.get("b"))
+            self.assertEqual((disk.hits, disk.misses), (1, 1))
+
+
+class TestSimulationCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.a = DEFAULT_ASSUMPTIONS
+        self.decisions = build_base_decisions(self.a.months, RUN_BASE_DECISION)
+        self.df = run_simulation_df(self.a, self.decisions)
+
+    def test_memory_then_disk_hits(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            cache = SimulationCache(Path(td))
+            self.assertIsNone(cache.get(self.a, self.decisions))
+            cache.put(self.a, self.decisions, self.df)
+
+            cached = cache.get(self.a, self.decisions)
+            pd.testing.assert_frame_equal(cached, self.df)
+            cached["cash"] = 0.0
+            pd.testing.assert_frame_equal(cache.get(self.a, self.decisions), self.df)
+
+            # A fresh cache (e.g. another process) reads the disk tier
+            restarted = SimulationCache(Path(td))
+            pd.testing.assert_frame_equal(
+                restarted.get(self.a, self.decisions), self.df
+            )
+            self.assertEqual(cache.stats()["memory_hits"], 2)
+            self.assertEqual(cache.stats()["misses"], 1)
+            self.assertEqual(restarted.stats()["disk_hits"], 1)
+
+            with unittest.mock.patch.object(cache_module, "ENGINE_VERSION", -1):
+                self.assertIsNone(restarted.get(self.a, self.decisions))
+
+    def test_cached_run_simulation_df_simulates_once(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            cache = SimulationCache(Path(td))
+            with unittest.mock.patch.object(
+                cache_module, "run_simulation_df", return_value=self.df
+            ) as simulate:
+                for _ in range(3):
+                    df = cached_run_simulation_df(self.a, self.decisions, cache=cache)
+                    pd.testing.assert_frame_equal(df, self.df)
+            simulate.assert_called_once()
+
+
+class TestFrameNpz(unittest.TestCase):
+    def test_round_trips_missing_values_in_object_columns(self) -> None:
+        df = pd.DataFrame({
+            "month": [0, 1, 2],
+            "revenue": [1.5, float("nan"), 3.0],
+            "name": ["a", None, "nan"],
+            "milestones": [float("nan"), "[]", None],
+        })
+        loaded, meta = frame_from_npz(frame_to_npz(df, {"table": "t"}))
+        self.assertEqual(meta["table"], "t")
+        pd.testing.assert_frame_equal(
+            loaded[["month", "revenue"]], df[["month", "revenue"]]
+        )
+        self.assertEqual(loaded["name"].tolist(), ["a", None, "nan"])
+        self.assertEqual(loaded["milestones"].tolist(), [None, "[]", None])
+
+    def test_rejects_non_string_objects(self) -> None:
+        df = pd.DataFrame({"mixed": ["a", 1]})
+        with self.assertRaisesRegex(TypeError, "'mixed'"):
+            frame_to_npz(df, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
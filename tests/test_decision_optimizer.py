@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import unittest
+
+import optuna
+
+from otai_forecast.config import (
+    DEFAULT_ASSUMPTIONS,
+    RUN_BASE_DECISION,
+    build_base_decisions,
+)
+from otai_forecast.decision_optimizer import (
+    LEVER_NAMES,
+    best_feasible_trial,
+    feasibility_stats,
+    knots_from_params,
+    optimize_coarse_to_fine,
+    optimize_study,
+    resample_knots,
+)
+
+optuna.logging.set_verbosity(optuna.logging.WARNING)
+
+
+def _trial(value: float, constraints: list[float]) -> optuna.trial.FrozenTrial:
+    return optuna.trial.create_trial(
+        value=value,
+        params={},
+        distributions={},
+        user_attrs={"constraints": constraints},
+    )
+
+
+class TestConstraints(unittest.TestCase):
+    def test_best_feasible_trial_skips_infeasible(self) -> None:
+        study = optuna.create_study(direction="maximize")
+        study.add_trials(
+            [
+                _trial(10.0, [0.5, -1.0]),
+                _trial(5.0, [-0.1, -0.2]),
+                _trial(7.0, [0.0, -0.3]),
+            ]
+        )
+        self.assertEqual(best_feasible_trial(study).value, 7.0)
+
+        stats = feasibility_stats(study)
+        self.assertEqual(stats["n_complete"], 3)
+        self.assertEqual(stats["n_feasible"], 2)
+        self.assertAlmostEqual(stats["feasible_fraction"], 2 / 3)
+        self.assertEqual(stats["n_cash_violations"], 1)
+        self.assertEqual(stats["n_liquidity_violations"], 0)
+        self.assertEqual(stats["best_feasible_value"], 7.0)
+
+    def test_best_feasible_trial_falls_back_to_least_violation(self) -> None:
+        study = optuna.create_study(direction="maximize")
+        study.add_trials([_trial(10.0, [2.0, 1.0]), _trial(1.0, [0.5, 0.1])])
+        self.assertEqual(best_feasible_trial(study).value, 1.0)
+        self.assertIsNone(feasibility_stats(study)["best_feasible_value"])
+
+    def test_optimize_study_records_feasibility(self) -> None:
+        a = DEFAULT_ASSUMPTIONS
+        study = optimize_study(
+            a,
+            build_base_decisions(a.months, RUN_BASE_DECISION),
+            max_evals=6,
+            n_jobs=1,
+            num_knots=3,
+        )
+        stats = study.user_attrs["feasibility"]
+        self.assertGreater(stats["n_complete"], 0)
+        for trial in study.get_trials(states=(optuna.trial.TrialState.COMPLETE,)):
+            self.assertEqual(len(trial.user_attrs["constraints"]), 2)
+
+    def test_shared_study_enqueues_warm_start_once(self) -> None:
+        a = DEFAULT_ASSUMPTIONS
+        storage = optuna.storages.InMemoryStorage()
+        warm_start = {name: [1.0, 1.0, 1.0] for name in LEVER_NAMES}
+        for _ in range(2):
+            study = optimize_study(
+                a,
+                build_base_decisions(a.months, RUN_BASE_DECISION),
+                max_evals=2,
+                study_name="shared",
+                storage=storage,
+                n_jobs=1,
+                num_knots=3,
+                warm_start_knots=warm_start,
+            )
+        enqueued = [t for t in study.trials if "fixed_params" in t.system_attrs]
+        self.assertEqual(len(study.trials), 4)
+        self.assertEqual(len(enqueued), 1)
+
+
+class TestCoarseToFine(unittest.TestCase):
+    def test_resample_knots_keeps_coarse_knots(self) -> None:
+        self.assertEqual(resample_knots([1.0, 3.0, 2.0], 5), [1.0, 2.0, 3.0, 2.5, 2.0])
+        self.assertEqual(resample_knots([1.0, 2.0, 3.0, 2.5, 2.0], 3), [1.0, 3.0, 2.0])
+
+    def test_each_stage_warm_starts_from_previous_best(self) -> None:
+        a = DEFAULT_ASSUMPTIONS
+        studies = optimize_coarse_to_fine(
+            a,
+            build_base_decisions(a.months, RUN_BASE_DECISION),
+            stages=[(3, 4), (5, 3)],
+            n_jobs=1,
+        )
+        self.assertEqual([s.user_attrs["num_knots"] for s in studies], [3, 5])
+        self.assertEqual([len(s.trials) for s in studies], [4, 3])
+
+        coarse_best = knots_from_params(best_feasible_trial(studies[0]).params, 3)
+        fine_start = knots_from_params(studies[1].trials[0].params, 5)
+        for name, knots in coarse_best.items():
+            for got, expected in zip(fine_start[name], resample_knots(knots, 5)):
+                self.assertAlmostEqual(got, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import base64
+import json
+import re
+import tempfile
+import unittest
+import unittest.mock
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+
+from otai_forecast import rendering
+from otai_forecast.cache import frame_from_npz
+from otai_forecast.config import (
+    DEFAULT_ASSUMPTIONS,
+    RUN_BASE_DECISION,
+    build_base_decisions,
+)
+from otai_forecast.decision_optimizer import run_simulation_df
+from otai_forecast.excel import append_frame, cell_factory, column_widths
+from otai_forecast.export import (
+    _build_tables,
+    _write_excel_report,
+    export_bundle,
+    export_html,
+    export_scenarios,
+    export_simple_budget,
+)
+
+
+def _simulation() -> tuple:
+    a = DEFAULT_ASSUMPTIONS
+    decisions = build_base_decisions(a.months, RUN_BASE_DECISION)
+    return a, decisions, run_simulation_df(a, decisions)
+
+
+class TestExcelHelpers(unittest.TestCase):
+    def test_column_widths_fit_header_and_values(self) -> None:
+        df = pd.DataFrame({"a": [1.5, np.nan], "long_header": ["x", "yyyyy"]})
+        self.assertEqual(
+            column_widths(df, min_width=1, max_width=42),
+            [len("1.5") + 2, len("long_header") + 2],
+        )
+        self.assertEqual(column_widths(df, min_width=20, max_width=42), [20, 20])
+
+    def test_numeric_widths_match_str(self) -> None:
+        values = [1e20, -1e-7, 278.8228057820961, np.nan]
+        df = pd.DataFrame({"f": values, "i": [1, -250000, 3, 4]})
+        longest = max(len(str(v)) for v in values[:-1])
+        self.assertEqual(
+            column_widths(df, min_width=0, max_width=100),
+            [longest + 2, len("-250000") + 2],
+        )
+
+    def test_append_frame_writes_missing_values_as_empty_cells(self) -> None:
+        df = pd.DataFrame({"a": [1.0, np.nan], "b": ["x", None]})
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Data")
+        body = cell_factory(ws, number_format="0.00")
+        append_frame(ws, df, [body, body])
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "data.xlsx"
+            wb.save(path)
+            rows = list(load_workbook(path)["Data"].iter_rows(values_only=True))
+        self.assertEqual(rows, [(1.0, "x"), (None, None)])
+
+
+class TestWriteExcelReport(unittest.TestCase):
+    def test_streams_long_tables_with_titles_and_formats(self) -> None:
+        a, decisions, df = _simulation()
+        df = pd.concat([df] * 5, ignore_index=True)
+
+        with tempfile.TemporaryDirectory() as td:
+            out_path = str(Path(td) / "report.xlsx")
+            _write_excel_report(
+                tables=_build_tables(df, a, decisions),
+                out_path=out_path,
+            )
+            wb = load_workbook(out_path)
+
+        self.assertEqual(wb.sheetnames[0], "Dashboard_KPIs")
+        self.assertIn("Monthly_Full", wb.sheetnames)
+        ws = wb["Finance"]
+        self.assertEqual(
+            ws["A1"].value, "Financial Performance - Revenue, Costs & Cash Flow"
+        )
+        header = [cell.value for cell in ws[2]]
+        self.assertEqual(header[0], "month")
+        self.assertEqual(ws.max_row, len(df) + 2)
+        self.assertEqual(ws.freeze_panes, "A3")
+        cash = header.index("cash") + 1
+        self.assertAlmostEqual(
+            ws.cell(row=ws.max_row, column=cash).value, df["cash"].iloc[-1]
+        )
+        self.assertEqual(ws.cell(row=3, column=cash).number_format, '#,##0.00" €"')
+        self.assertEqual(ws.cell(row=3, column=cash).style, "report_money")
+        self.assertEqual(ws["A2"].style, "report_header")
+        self.assertTrue(wb["Dashboard_KPIs"]["A3"].font.b)
+
+
+class TestExportScenarios(unittest.TestCase):
+    def test_assembles_prepared_scenarios(self) -> None:
+        a, decisions, df = _simulation()
+        scenarios = [
+            {"name": "base", "df": df, "assumptions": a, "decisions": decisions},
+            {"name": "more cash", "df": df.assign(cash=df["cash"] + 1)},
+        ]
+        with (
+            tempfile.TemporaryDirectory() as td,
+            unittest.mock.patch(
+                "otai_forecast.rendering.render_plot_sets_png", return_value=[{}, {}]
+            ) as render,
+        ):
+            out_path = str(Path(td) / "report.xlsx")
+            export_scenarios(scenarios, out_path)
+            wb = load_workbook(out_path)
+
+        # The plots of all scenarios are rendered as one batch
+        render.assert_called_once()
+        self.assertEqual(len(render.call_args.args[1]), 2)
+        self.assertIn("Plots_Basic_S2", wb.sheetnames)
+        self.assertEqual(
+            wb["Plots_Basic_S2"]["A1"].value, "Basic Visualization Plots - more cash"
+        )
+        ws = wb["Finance"]
+        self.assertEqual(ws["A2"].value, "Scenario")
+        scenario_names = {row[0] for row in ws.iter_rows(min_row=3, values_only=True)}
+        self.assertEqual(scenario_names, {"base", "more cash"})
+        comparison = wb["Overview_Comparison"]
+        self.assertEqual(
+            [cell.value for cell in comparison[2]], ["Metric", "base", "more cash"]
+        )
+
+
+class TestExportSimpleBudget(unittest.TestCase):
+    def test_formats_plan_columns_by_kind(self) -> None:
+        a, _, df = _simulation()
+        with (
+            tempfile.TemporaryDirectory() as td,
+            unittest.mock.patch(
+                "otai_forecast.rendering.render_plots_png", return_value={}
+            ),
+        ):
+            out_path = str(Path(td) / "budget.xlsx")
+            export_simple_budget(df, a, out_path=out_path)
+            wb = load_workbook(out_path)
+
+        self.assertEqual(
+            wb.sheetnames, ["Overview", "Detailed Monthly Plan", "Assumptions"]
+        )
+        ws = wb["Detailed Monthly Plan"]
+        header = [cell.value for cell in ws[2]]
+        formats = dict(zip(header, (cell.number_format for cell in ws[3])))
+        self.assertEqual(formats["Month"], "General")
+        self.assertEqual(formats["Cash (€)"], '#,##0" €"')
+        self.assertEqual(formats["Partners"], "#,##0.0")
+        self.assertEqual(ws.max_row, len(df) + 2)
+        self.assertEqual(wb["Overview"]["A2"].style, "budget_header")
+
+
+class TestExportHtml(unittest.TestCase):
+    def test_embeds_figures_for_lazy_drawing(self) -> None:
+        a, decisions, df = _simulation()
+        scenarios = [
+            {"name": "base", "df": df, "assumptions": a, "decisions": decisions},
+            {"name": "<more> cash", "df": df.assign(cash=df["cash"] + 1)},
+        ]
+        with (
+            tempfile.TemporaryDirectory() as td,
+            # figures_json binds the module's figure_cache as its default
+            unittest.mock.patch.object(
+                rendering.figure_cache, "directory", Path(td) / "figures"
+            ),
+            unittest.mock.patch.object(rendering, "render_plots_png") as render,
+        ):
+            out_path = str(Path(td) / "report.html")
+            export_html(scenarios, out_path, include_plotlyjs="cdn")
+            document = Path(out_path).read_text()
+            self.assertEqual(len(list((Path(td) / "figures").glob("*.json"))), 2 * 21)
+
+        render.assert_not_called()
+        self.assertIn("cdn.plot.ly/plotly-", document)
+        self.assertIn("&lt;more&gt; cash", document)
+        self.assertIn("Ending cash (€)", document)
+        self.assertIn("Revenue, Costs &amp; Cash Flow", document)
+        figures = dict(
+            re.findall(
+                r'<script type="application/json" id="([^"]+)">(.*?)</script>',
+                document,
+                flags=re.S,
+            )
+        )
+        self.assertEqual(len(figures), 2 * 21)
+        placeholders = re.findall(r'class="plot" data-figure="([^"]+)"', document)
+        self.assertEqual(sorted(placeholders), sorted(figures))
+        cash = json.loads(figures["fig-2-Cash_Position"])["data"][0]["y"]
+        # plotly encodes numeric arrays as base64 typed arrays
+        cash = np.frombuffer(base64.b64decode(cash["bdata"]), dtype=cash["dtype"])
+        self.assertEqual(cash[-1], df["cash"].iloc[-1] + 1)
+
+
+class TestExportBundle(unittest.TestCase):
+    def test_writes_tables_and_manifest(self) -> None:
+        a, decisions, df = _simulation()
+        scenarios = [
+            {"name": "base", "df": df, "assumptions": a, "decisions": decisions},
+            {"name": "copy", "df": df.assign(cash=df["cash"] + 1)},
+        ]
+        with tempfile.TemporaryDirectory() as td:
+            out_dir = Path(export_bundle(scenarios, str(Path(td) / "bundle")))
+            manifest = json.loads((out_dir / "manifest.json").read_text())
+            monthly, _ = frame_from_npz(out_dir / "monthly.npz")
+            monthly_csv = pd.read_csv(out_dir / "monthly.csv.gz")
+            kpis, _ = frame_from_npz(out_dir / "kpis.npz")
+            assumptions, _ = frame_from_npz(out_dir / "assumptions.npz")
+
+        self.assertEqual([s["name"] for s in manifest["scenarios"]], ["base", "copy"])
+        self.assertEqual(
+            set(manifest["tables"]), {"monthly", "kpis", "decisions", "assumptions"}
+        )
+        self.assertEqual(manifest["tables"]["decisions"]["rows"], len(decisions))
+        self.assertEqual(manifest["tables"]["monthly"]["rows"], 2 * len(df))
+
+        self.assertEqual(list(monthly.columns), ["scenario", *df.columns])
+        self.assertEqual(monthly["scenario"].tolist(), [0] * len(df) + [1] * len(df))
+        second = monthly[monthly["scenario"] == 1].drop(columns="scenario")
+        pd.testing.assert_frame_equal(
+            second.reset_index(drop=True), scenarios[1]["df"]
+        )
+        np.testing.assert_allclose(monthly_csv["cash"], monthly["cash"])
+        self.assertEqual(kpis["end_cash"].iloc[1], df["cash"].iloc[-1] + 1)
+
+        self.assertEqual(assumptions["scenario"].tolist(), [0])
+        milestones = json.loads(assumptions["pricing_milestones"].iloc[0])
+        self.assertEqual(len(milestones), len(a.pricing_milestones))
+
+    def test_rejects_mismatched_result_columns(self) -> None:
+        _, _, df = _simulation()
+        scenarios = [
+            {"name": "a", "df": df},
+            {"name": "b", "df": df.drop(columns="cash")},
+        ]
+        with tempfile.TemporaryDirectory() as td, self.assertRaises(ValueError):
+            export_bundle(scenarios, td)
+
+
+if __name__ == "__main__":
+    unittest.main()
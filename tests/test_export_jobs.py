@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import tempfile
+import time
+import unittest
+import unittest.mock
+from pathlib import Path
+
+import pandas as pd
+
+from otai_forecast import export_jobs
+from otai_forecast.cache import DiskLRUCache
+from otai_forecast.export_jobs import ExportJob, ExportJobQueue
+
+
+def _fake_export(df: pd.DataFrame, out_path: str, **kwargs) -> None:
+    Path(out_path).write_bytes(b"report:" + str(len(df)).encode())
+
+
+def _wait(job: ExportJob, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while job.status in ("queued", "running"):
+        if time.monotonic() > deadline:
+            raise AssertionError(f"export job still {job.status}")
+        time.sleep(0.01)
+
+
+class TestExportJobQueue(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.cache = DiskLRUCache(Path(self._tmp.name), 2**20, suffix=".xlsx")
+        self.df = pd.DataFrame({"month": [0, 1, 2], "revenue": [1.0, 2.0, 3.0]})
+
+    def _queue(self) -> ExportJobQueue:
+        queue = ExportJobQueue(self.cache)
+        self.addCleanup(queue.shutdown)
+        return queue
+
+    def test_submit_runs_once_and_caches_report(self) -> None:
+        queue = self._queue()
+        with unittest.mock.patch.object(
+            export_jobs.export_module, "export", side_effect=_fake_export
+        ) as export:
+            job = queue.submit(self.df)
+            _wait(job)
+            self.assertIs(queue.submit(self.df.copy()), job)
+
+        export.assert_called_once()
+        self.assertEqual(job.status, "done")
+        self.assertEqual(job.read_bytes(), b"report:3")
+        self.assertIsNotNone(job.duration_s)
+
+        # A new process finds the finished report on disk
+        restarted = self._queue()
+        cached = restarted.get(ExportJobQueue.key(self.df))
+        self.assertIsNotNone(cached)
+        self.assertEqual(cached.status, "done")
+
+    def test_different_results_get_different_jobs(self) -> None:
+        other = self.df.assign(revenue=self.df["revenue"] * 2)
+        self.assertNotEqual(ExportJobQueue.key(self.df), ExportJobQueue.key(other))
+
+    def test_failed_job_is_retried(self) -> None:
+        queue = self._queue()
+        with unittest.mock.patch.object(
+            export_jobs.export_module, "export", side_effect=ValueError("boom")
+        ):
+            failed = queue.submit(self.df)
+            _wait(failed)
+        self.assertEqual(failed.status, "failed")
+        self.assertIn("boom", failed.error)
+        self.assertFalse(failed.path.exists())
+
+        with unittest.mock.patch.object(
+            export_jobs.export_module, "export", side_effect=_fake_export
+        ):
+            retried = queue.submit(self.df)
+            _wait(retried)
+        self.assertIsNot(retried, failed)
+        self.assertEqual(retried.status, "done")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import gc
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from otai_forecast import fingerprint
+from otai_forecast.config import (
+    DEFAULT_ASSUMPTIONS,
+    RUN_BASE_DECISION,
+    build_base_decisions,
+)
+from otai_forecast.fingerprint import (
+    assumptions_fingerprint,
+    dataframe_fingerprint,
+    decisions_fingerprint,
+)
+
+
+class TestFingerprint(unittest.TestCase):
+    def test_assumptions_fingerprint_is_memoized_per_instance(self) -> None:
+        a = DEFAULT_ASSUMPTIONS.model_copy(update={"months": 30})
+        first = assumptions_fingerprint(a)
+        with mock.patch.object(
+            fingerprint, "_compute_assumptions_fingerprint"
+        ) as compute:
+            self.assertEqual(assumptions_fingerprint(a), first)
+            compute.assert_not_called()
+
+    def test_equal_assumptions_share_fingerprint(self) -> None:
+        a = DEFAULT_ASSUMPTIONS
+        copy = a.model_copy()
+        self.assertIsNot(copy, a)
+        self.assertEqual(assumptions_fingerprint(copy), assumptions_fingerprint(a))
+        changed = a.model_copy(update={"months": a.months + 1})
+        self.assertNotEqual(
+            assumptions_fingerprint(changed), assumptions_fingerprint(a)
+        )
+
+    def test_cache_entry_dropped_with_instance(self) -> None:
+        a = DEFAULT_ASSUMPTIONS.model_copy(update={"months": 31})
+        key = id(a)
+        assumptions_fingerprint(a)
+        self.assertIn(key, fingerprint._ASSUMPTIONS_FINGERPRINTS)
+        del a
+        gc.collect()
+        self.assertNotIn(key, fingerprint._ASSUMPTIONS_FINGERPRINTS)
+
+    def test_decisions_fingerprint_tracks_budgets(self) -> None:
+        decisions = build_base_decisions(12, RUN_BASE_DECISION)
+        same = build_base_decisions(12, RUN_BASE_DECISION)
+        self.assertEqual(decisions_fingerprint(decisions), decisions_fingerprint(same))
+        changed = list(decisions)
+        changed[5] = changed[5].model_copy(
+            update={"ads_budget": changed[5].ads_budget + 1.0}
+        )
+        self.assertNotEqual(
+            decisions_fingerprint(changed), decisions_fingerprint(decisions)
+        )
+
+    def test_dataframe_fingerprint_tracks_content(self) -> None:
+        df = pd.DataFrame({"month": [0, 1], "cash": [1.0, 2.0], "label": ["a", "b"]})
+        fingerprint_ = dataframe_fingerprint(df)
+        self.assertEqual(dataframe_fingerprint(df.copy()), fingerprint_)
+        for changed in (
+            df.assign(cash=[1.0, 2.5]),
+            df.assign(label=["a", "c"]),
+            df.assign(month=[0.0, 1.0]),
+            df.rename(columns={"cash": "debt"}),
+            df.iloc[::-1],
+        ):
+            self.assertNotEqual(dataframe_fingerprint(changed), fingerprint_)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from otai_forecast.config import (
+    DEFAULT_ASSUMPTIONS,
+    RUN_BASE_DECISION,
+    build_base_decisions,
+)
+from otai_forecast.decision_optimizer import run_simulation_batch, run_simulation_df
+from otai_forecast.kpis import (
+    KPI_LABELS,
+    compute_kpis,
+    kpis_from_arrays,
+    kpis_from_frames,
+)
+
+
+class TestKpis(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        a = DEFAULT_ASSUMPTIONS
+        cls.assumptions = a
+        cls.decisions = build_base_decisions(a.months, RUN_BASE_DECISION)
+        cls.df = run_simulation_df(a, cls.decisions)
+
+    def test_single_run_matches_frame(self) -> None:
+        df = self.df.assign(cash=self.df["cash"] - 1e9 * (self.df["month"] >= 5))
+        kpis = compute_kpis(df)
+
+        self.assertEqual(list(kpis), list(KPI_LABELS))
+        self.assertEqual(kpis["months"], len(df))
+        self.assertEqual(kpis["end_cash"], df["cash"].iloc[-1])
+        self.assertEqual(kpis["min_cash"], df["cash"].min())
+        self.assertEqual(kpis["min_cash_month"], int(df["month"][df["cash"].idxmin()]))
+        self.assertEqual(kpis["first_negative_cash_month"], 5)
+        self.assertAlmostEqual(kpis["total_revenue"], df["revenue_total"].sum())
+        self.assertAlmostEqual(
+            kpis["avg_revenue_last_3_months"], df["revenue_total"].tail(3).mean()
+        )
+        self.assertAlmostEqual(
+            kpis["total_profit_after_tax"], (df["profit_bt"] - df["tax"]).sum()
+        )
+        self.assertEqual(kpis["end_market_cap"], df["market_cap"].iloc[-1])
+        self.assertIsInstance(kpis["months"], int)
+
+    def test_missing_columns_and_short_runs_are_none(self) -> None:
+        kpis = compute_kpis(self.df[["month", "cash"]].head(2))
+        self.assertEqual(kpis["months"], 2)
+        self.assertIsNone(kpis["first_negative_cash_month"])
+        self.assertIsNone(kpis["total_revenue"])
+        self.assertIsNone(kpis["avg_revenue_last_3_months"])
+        self.assertTrue(all(v is None for v in compute_kpis(self.df.head(0)).values()))
+
+    def test_batch_matches_single_runs(self) -> None:
+        frames = [self.df, self.df.assign(cash=self.df["cash"] + 1), self.df.head(5)]
+        table = kpis_from_frames(frames)
+
+        self.assertEqual(list(table.columns), list(KPI_LABELS))
+        for i, df in enumerate(frames):
+            expected = pd.Series(compute_kpis(df), dtype=float, name=i)
+            pd.testing.assert_series_equal(table.iloc[i], expected)
+
+    def test_months_first_arrays_from_batch_simulation(self) -> None:
+        out = run_simulation_batch([self.assumptions] * 2, self.decisions)
+        kpis = kpis_from_arrays(out, months_axis=0)
+
+        self.assertEqual(kpis["end_cash"].shape, (2,))
+        np.testing.assert_allclose(kpis["end_cash"], out["cash"][-1])
+        np.testing.assert_allclose(kpis["end_market_cap"], out["market_cap"][-1])
+        np.testing.assert_allclose(kpis["min_cash"], out["cash"].min(axis=0))
+
+
+if __name__ == "__main__":
+    unittest.main()
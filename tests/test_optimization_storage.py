@@ -2,17 +2,61 @@ from __future__ import annotations
 
 import tempfile
 import unittest
+import unittest.mock
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
 from pathlib import Path
 
+import optuna
 import pandas as pd
+import yaml
 
-from otai_forecast.config import ALL_SCENARIOS, DEFAULT_ASSUMPTIONS
+from otai_forecast import optimization_storage
+from otai_forecast.config import (
+    ALL_SCENARIOS,
+    DEFAULT_ASSUMPTIONS,
+    RUN_BASE_DECISION,
+    build_base_decisions,
+)
+from otai_forecast.decision_optimizer import run_simulation_df
 from otai_forecast.models import MonthlyDecision
 from otai_forecast.optimization_storage import (
     assumptions_hash,
+    compact_optimizations,
+    index_path,
+    list_optimizations,
+    load_index,
     load_optimization,
+    load_results,
+    load_summary,
+    migrate_payloads,
+    open_optimization,
+    optimization_path,
+    rebuild_index,
+    results_path,
     save_optimization,
+    stored_simulation_df,
 )
+from otai_forecast.trial_archive import TrialArchive, trial_archive_dir
+
+
+def _save_market_cap(base_dir: str, market_cap: float) -> None:
+    decisions = [
+        MonthlyDecision(
+            ads_budget=0.0,
+            seo_budget=0.0,
+            dev_budget=0.0,
+            partner_budget=0.0,
+            outreach_budget=0.0,
+        )
+    ]
+    save_optimization(
+        DEFAULT_ASSUMPTIONS,
+        decisions,
+        pd.DataFrame({"market_cap": [market_cap], "cash": [1.0]}),
+        base_dir=Path(base_dir),
+        scenario_assumptions=ALL_SCENARIOS,
+    )
 
 
 class TestOptimizationStorage(unittest.TestCase):
@@ -78,3 +122,304 @@ class TestOptimizationStorage(unittest.TestCase):
             payload = load_optimization(base_dir, assumption_key)
             self.assertIsNotNone(payload)
             self.assertEqual(payload["summary"]["end_market_cap"], 120.0)
+
+    def test_index_tracks_saved_optimizations(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            base_dir = Path(td)
+            assumption_key = save_optimization(
+                self.assumptions,
+                self.decisions,
+                self._make_df(market_cap=100.0, cash=10.0),
+                base_dir=base_dir,
+                scenario_assumptions=ALL_SCENARIOS,
+            )
+            self.assertTrue(index_path(base_dir).exists())
+            self.assertEqual(
+                load_summary(base_dir, assumption_key)["end_market_cap"], 100.0
+            )
+            (entry,) = list_optimizations(base_dir)
+            self.assertEqual(entry["assumption_hash"], assumption_key)
+
+            save_optimization(
+                self.assumptions,
+                self.decisions,
+                self._make_df(market_cap=120.0, cash=10.0),
+                base_dir=base_dir,
+            )
+            self.assertEqual(
+                load_summary(base_dir, assumption_key)["end_market_cap"], 120.0
+            )
+
+            optimization_path(base_dir, assumption_key).unlink()
+            self.assertEqual(load_index(base_dir), {})
+            self.assertIsNone(load_summary(base_dir, assumption_key))
+
+    def test_rebuild_index_reads_payloads(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            base_dir = Path(td)
+            assumption_key = save_optimization(
+                self.assumptions,
+                self.decisions,
+                self._make_df(market_cap=100.0, cash=10.0),
+                base_dir=base_dir,
+            )
+            index_path(base_dir).unlink()
+            entries = rebuild_index(base_dir)
+            self.assertEqual(list(entries), [assumption_key])
+            self.assertEqual(entries[assumption_key]["summary"]["min_cash"], 10.0)
+
+    def _write_legacy_yaml(self, base_dir: Path, market_cap: float) -> str:
+        assumption_key = assumptions_hash(self.assumptions)
+        payload = {
+            "assumption_hash": assumption_key,
+            "assumptions": self.assumptions.model_dump(),
+            "decisions": [decision.model_dump() for decision in self.decisions],
+            "summary": {"end_market_cap": market_cap},
+        }
+        (base_dir / f"optimization_{assumption_key}.yaml").write_text(
+            yaml.safe_dump(payload, sort_keys=False), encoding="utf-8"
+        )
+        return assumption_key
+
+    def test_legacy_yaml_payload_is_read_and_migrated(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            base_dir = Path(td)
+            assumption_key = self._write_legacy_yaml(base_dir, 100.0)
+            legacy = load_optimization(base_dir, assumption_key)
+            self.assertEqual(legacy["summary"]["end_market_cap"], 100.0)
+            summary = load_summary(base_dir, assumption_key)
+            self.assertEqual(summary["end_market_cap"], 100.0)
+
+            self.assertEqual(migrate_payloads(base_dir), [assumption_key])
+            self.assertEqual(
+                [p.name for p in base_dir.glob("optimization_*")],
+                [optimization_path(base_dir, assumption_key).name],
+            )
+            self.assertEqual(load_optimization(base_dir, assumption_key), legacy)
+            summary = load_summary(base_dir, assumption_key)
+            self.assertEqual(summary["end_market_cap"], 100.0)
+
+    def test_save_replaces_legacy_yaml(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            base_dir = Path(td)
+            assumption_key = self._write_legacy_yaml(base_dir, 100.0)
+            save_optimization(
+                self.assumptions,
+                self.decisions,
+                self._make_df(market_cap=90.0, cash=10.0),
+                base_dir=base_dir,
+            )
+            self.assertFalse(optimization_path(base_dir, assumption_key).exists())
+
+            save_optimization(
+                self.assumptions,
+                self.decisions,
+                self._make_df(market_cap=120.0, cash=10.0),
+                base_dir=base_dir,
+            )
+            self.assertEqual(
+                [p.name for p in base_dir.glob("optimization_*")],
+                [optimization_path(base_dir, assumption_key).name],
+            )
+            payload = load_optimization(base_dir, assumption_key)
+            self.assertEqual(payload["summary"]["end_market_cap"], 120.0)
+
+    def test_concurrent_saves_keep_best(self) -> None:
+        market_caps = [float(v) for v in range(1, 25)]
+        with tempfile.TemporaryDirectory() as td:
+            with ProcessPoolExecutor(max_workers=6) as pool:
+                list(pool.map(_save_market_cap, [td] * len(market_caps), market_caps))
+
+            base_dir = Path(td)
+            assumption_key = assumptions_hash(self.assumptions)
+            payload = load_optimization(base_dir, assumption_key)
+            self.assertEqual(payload["summary"]["end_market_cap"], max(market_caps))
+            summary = load_summary(base_dir, assumption_key)
+            self.assertEqual(summary["end_market_cap"], max(market_caps))
+            self.assertEqual(list(base_dir.glob("*.tmp")), [])
+
+    def test_monthly_results_are_stored_with_the_payload(self) -> None:
+        decisions = build_base_decisions(self.assumptions.months, RUN_BASE_DECISION)
+        df = run_simulation_df(self.assumptions, decisions)
+        with tempfile.TemporaryDirectory() as td:
+            base_dir = Path(td)
+            assumption_key = save_optimization(
+                self.assumptions, decisions, df, base_dir=base_dir
+            )
+            stored = load_results(base_dir, assumption_key, decisions)
+            pd.testing.assert_frame_equal(stored, df)
+            self.assertIsNone(load_results(base_dir, assumption_key, decisions[:-1]))
+
+            with unittest.mock.patch.object(
+                optimization_storage, "cached_run_simulation_df"
+            ) as simulate:
+                loaded = stored_simulation_df(base_dir, self.assumptions, decisions)
+            simulate.assert_not_called()
+            pd.testing.assert_frame_equal(loaded, df)
+
+            with (
+                unittest.mock.patch.object(optimization_storage, "ENGINE_VERSION", -1),
+                # The refresh compares fingerprints without copying the payload
+                unittest.mock.patch.object(
+                    optimization_storage.LazyOptimizationPayload,
+                    "to_dict",
+                    side_effect=AssertionError("payload copied"),
+                ),
+            ):
+                self.assertIsNone(load_results(base_dir, assumption_key, decisions))
+                loaded = stored_simulation_df(base_dir, self.assumptions, decisions)
+                pd.testing.assert_frame_equal(loaded, df)
+                self.assertIsNotNone(load_results(base_dir, assumption_key, decisions))
+
+    def test_invalid_scenario_records_have_no_identity(self) -> None:
+        identity = optimization_storage._scenario_identity
+        self.assertIsNone(identity("[1, 2]"))
+        self.assertIsNone(identity('{"name": "broken"}'))
+        with (
+            unittest.mock.patch.object(
+                optimization_storage,
+                "ScenarioAssumptions",
+                side_effect=RuntimeError("bug"),
+            ),
+            self.assertRaises(RuntimeError),
+        ):
+            identity('{"name": "unexpected"}')
+
+    def test_compact_dedupes_scenarios_and_archives_orphans(self) -> None:
+        orphan = ALL_SCENARIOS[1].assumptions
+        with tempfile.TemporaryDirectory() as td:
+            base_dir = Path(td)
+            for assumptions in (self.assumptions, orphan):
+                save_optimization(
+                    assumptions,
+                    self.decisions,
+                    self._make_df(market_cap=100.0, cash=10.0),
+                    base_dir=base_dir,
+                    scenario_assumptions=ALL_SCENARIOS,
+                )
+            kept = assumptions_hash(self.assumptions)
+            orphaned = assumptions_hash(orphan)
+            records = list((base_dir / "scenarios").glob("*.json"))
+            self.assertEqual(len(records), len(ALL_SCENARIOS))
+            payload = load_optimization(base_dir, kept)
+            self.assertEqual(
+                payload["assumption_scenarios"],
+                [s.model_dump(mode="json") for s in ALL_SCENARIOS],
+            )
+
+            report = compact_optimizations(base_dir, keep=[kept])
+            self.assertEqual(report["orphans"], [orphaned])
+            self.assertIsNone(load_optimization(base_dir, orphaned))
+            self.assertEqual(load_optimization(base_dir, kept), payload)
+            self.assertEqual(set(load_index(base_dir)), {kept})
+            archived = load_optimization(base_dir / "archive", orphaned)
+            self.assertEqual(archived["summary"]["end_market_cap"], 100.0)
+            self.assertEqual(
+                archived["assumption_scenarios"], payload["assumption_scenarios"]
+            )
+
+    def test_compact_rewrites_legacy_payloads(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            base_dir = Path(td)
+            assumption_key = self._write_legacy_yaml(base_dir, 100.0)
+            legacy = load_optimization(base_dir, assumption_key)
+            report = compact_optimizations(base_dir)
+            self.assertEqual(report["rewritten"], [assumption_key])
+            self.assertEqual(load_optimization(base_dir, assumption_key), legacy)
+            self.assertEqual(compact_optimizations(base_dir)["rewritten"], [])
+
+    def test_compact_enforces_size_budget(self) -> None:
+        decisions = build_base_decisions(self.assumptions.months, RUN_BASE_DECISION)
+        df = run_simulation_df(self.assumptions, decisions)
+        with tempfile.TemporaryDirectory() as td:
+            base_dir = Path(td)
+            assumption_key = save_optimization(
+                self.assumptions, decisions, df, base_dir=base_dir
+            )
+            with TrialArchive(base_dir, assumption_key) as archive:
+                study = optuna.create_study(direction="maximize")
+                study.optimize(
+                    lambda t: t.suggest_float("x", 0, 1),
+                    n_trials=5,
+                    callbacks=[archive],
+                )
+            payload_path = optimization_path(base_dir, assumption_key)
+
+            report = compact_optimizations(
+                base_dir, max_bytes=3 * payload_path.stat().st_size
+            )
+            # Results tables go before trial histories; payloads always stay
+            self.assertEqual(
+                report["dropped"], [results_path(base_dir, assumption_key).name]
+            )
+            self.assertTrue(trial_archive_dir(base_dir, assumption_key).exists())
+
+            compact_optimizations(base_dir, max_bytes=0)
+            self.assertFalse(trial_archive_dir(base_dir, assumption_key).exists())
+            self.assertIsNotNone(load_optimization(base_dir, assumption_key))
+
+    def test_open_optimization_defers_sections(self) -> None:
+        scenario = ALL_SCENARIOS[2]
+        with tempfile.TemporaryDirectory() as td:
+            base_dir = Path(td)
+            assumption_key = save_optimization(
+                scenario.assumptions,
+                self.decisions,
+                self._make_df(market_cap=100.0, cash=10.0),
+                base_dir=base_dir,
+                scenario_assumptions=ALL_SCENARIOS,
+            )
+            with unittest.mock.patch.object(
+                optimization_storage, "_load_scenario_record"
+            ) as load_record, unittest.mock.patch.object(
+                optimization_storage, "Assumptions"
+            ) as validate:
+                payload = open_optimization(base_dir, assumption_key)
+                self.assertEqual(payload.assumption_hash, assumption_key)
+                self.assertEqual(payload.summary["end_market_cap"], 100.0)
+                saved_at = datetime.fromisoformat(payload.saved_at)
+                self.assertEqual(saved_at.utcoffset(), timedelta(0))
+            load_record.assert_not_called()
+            validate.assert_not_called()
+
+            self.assertEqual(payload.scenario_name, scenario.name)
+            self.assertEqual(payload.assumptions, scenario.assumptions)
+            self.assertEqual(payload.decisions, self.decisions)
+            self.assertEqual(payload.scenarios, ALL_SCENARIOS)
+            self.assertEqual(
+                payload.to_dict(), load_optimization(base_dir, assumption_key)
+            )
+            self.assertIsNone(open_optimization(base_dir, "missing"))
+
+    def test_open_optimization_is_cached_until_the_file_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            base_dir = Path(td)
+            assumption_key = save_optimization(
+                self.assumptions,
+                self.decisions,
+                self._make_df(market_cap=100.0, cash=10.0),
+                base_dir=base_dir,
+            )
+            first = open_optimization(base_dir, assumption_key)
+            with unittest.mock.patch.object(
+                optimization_storage, "_read_raw_payload"
+            ) as read:
+                again = open_optimization(base_dir, assumption_key)
+            read.assert_not_called()
+            self.assertIs(again, first)
+            self.assertIs(again.assumptions, first.assumptions)
+            self.assertIsNot(again.decisions, first.decisions)
+
+            payload = load_optimization(base_dir, assumption_key)
+            payload["summary"]["end_market_cap"] = 0.0
+            self.assertEqual(first.summary["end_market_cap"], 100.0)
+
+            save_optimization(
+                self.assumptions,
+                self.decisions,
+                self._make_df(market_cap=120.0, cash=10.0),
+                base_dir=base_dir,
+            )
+            updated = open_optimization(base_dir, assumption_key)
+            self.assertIsNot(updated, first)
+            self.assertEqual(updated.summary["end_market_cap"], 120.0)
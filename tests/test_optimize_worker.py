@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import subprocess
+import sys
+import tempfile
+import unittest
+import unittest.mock
+from pathlib import Path
+
+import optuna
+
+from otai_forecast import optimize_worker
+from otai_forecast.config import DEFAULT_ASSUMPTIONS
+from otai_forecast.optimization_storage import assumptions_hash, load_optimization
+from otai_forecast.optimize_worker import collect_best, journal_storage, study_name_for
+from otai_forecast.trial_archive import trial_archive_dir
+
+
+class TestOptimizeWorker(unittest.TestCase):
+    def test_concurrent_workers_share_journal(self) -> None:
+        assumption_hash = assumptions_hash(DEFAULT_ASSUMPTIONS)
+        with tempfile.TemporaryDirectory() as td:
+            journal = Path(td) / "study.journal"
+            command = [
+                sys.executable,
+                "-m",
+                "otai_forecast.optimize_worker",
+                "--study",
+                assumption_hash,
+                "--trials",
+                "6",
+                "--journal",
+                str(journal),
+                "--optimization-dir",
+                td,
+            ]
+            workers = [subprocess.Popen(command) for _ in range(2)]
+            for worker in workers:
+                self.assertEqual(worker.wait(timeout=300), 0)
+
+            study = optuna.load_study(
+                study_name=study_name_for(assumption_hash),
+                storage=journal_storage(journal),
+            )
+            self.assertEqual(len(study.trials), 12)
+            self.assertTrue(any(trial_archive_dir(Path(td), assumption_hash).iterdir()))
+
+            saved = collect_best(
+                assumption_hash, journal=journal, optimization_dir=Path(td)
+            )
+            self.assertEqual(saved, assumption_hash)
+            payload = load_optimization(Path(td), assumption_hash)
+            self.assertIsNotNone(payload)
+            self.assertEqual(len(payload["decisions"]), DEFAULT_ASSUMPTIONS.months)
+
+    def test_main_reports_best_feasible_trial(self) -> None:
+        def trial(value: float, constraints: list[float]) -> optuna.trial.FrozenTrial:
+            return optuna.trial.create_trial(
+                value=value, user_attrs={"constraints": constraints}
+            )
+
+        cases = [
+            ([], "2 trials in study, no feasible trial yet"),
+            ([trial(9.0, [1.0, 0.0])], "3 trials in study, no feasible trial yet"),
+            (
+                [trial(9.0, [1.0, 0.0]), trial(5.0, [0.0, -1.0])],
+                "4 trials in study, best feasible value 5",
+            ),
+        ]
+        for trials, expected in cases:
+            study = optuna.create_study(direction="maximize")
+            study.add_trials(trials)
+            study.enqueue_trial({})
+            study.enqueue_trial({})
+            out = io.StringIO()
+            with (
+                self.subTest(expected=expected),
+                unittest.mock.patch.object(
+                    optimize_worker, "run_worker", return_value=study
+                ),
+                contextlib.redirect_stdout(out),
+            ):
+                optimize_worker.main(["--study", "abc"])
+                self.assertEqual(out.getvalue().strip(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
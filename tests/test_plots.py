@@ -7,6 +7,7 @@ import plotly.graph_objects as go
 import pytest
 
 from otai_forecast.plots import (
+    compute_plot_metrics,
     plot_cash_burn_rate,
     plot_cash_position,
     plot_conversion_funnel,
@@ -137,3 +138,38 @@ def test_dashboard_functions(sample_df, tmp_path):
     fig = plot_growth_insights(sample_df, save_path=str(save_path))
     assert isinstance(fig, go.Figure)
     assert save_path.exists()
+
+
+def test_plot_metrics(sample_df):
+    """Test the shared derived metrics against the raw columns."""
+    metrics = compute_plot_metrics(sample_df)
+    assert list(metrics.index) == list(sample_df.index)
+    pd.testing.assert_series_equal(
+        metrics["burn_rate"],
+        -sample_df["net_cashflow"].clip(upper=0),
+        check_names=False,
+    )
+    pd.testing.assert_series_equal(
+        metrics["revenue_growth"],
+        sample_df["revenue_total"].pct_change().fillna(0),
+        check_names=False,
+    )
+    paid = sample_df["pro_active"] + sample_df["ent_active"]
+    cac = sample_df["sales_spend"] / (sample_df["new_pro"] + sample_df["new_ent"])
+    assert metrics["active_paid"].tolist() == paid.tolist()
+    assert metrics["cac"].tolist() == pytest.approx(cac.tolist())
+
+
+def test_plot_metrics_cached_per_data(sample_df):
+    """Test that equal data shares one metrics frame and changed data does not."""
+    metrics = compute_plot_metrics(sample_df)
+    assert compute_plot_metrics(sample_df.copy()) is metrics
+    # Columns the metrics do not depend on do not matter
+    assert compute_plot_metrics(sample_df.assign(debt=1.0)) is metrics
+
+    changed = sample_df.assign(revenue_total=sample_df["revenue_total"] * 2)
+    changed_metrics = compute_plot_metrics(changed)
+    assert changed_metrics is not metrics
+    assert changed_metrics["arpu"].iloc[-1] == pytest.approx(
+        2 * metrics["arpu"].iloc[-1]
+    )
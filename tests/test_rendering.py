@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+import unittest.mock
+from functools import partial
+from pathlib import Path
+
+import pandas as pd
+
+from otai_forecast import rendering
+from otai_forecast.cache import DiskLRUCache
+from otai_forecast.plots import plot_cash_position, plot_revenue_split
+from otai_forecast.rendering import (
+    ChartRenderer,
+    render_plot_sets_png,
+    render_plots_png,
+)
+
+
+def _df(cash: float) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "month": range(6),
+            "cash": [cash + i for i in range(6)],
+            "revenue_subscription": [10.0] * 6,
+            "revenue_support": [1.0] * 6,
+            "revenue_partner": [2.0] * 6,
+            "revenue_total": [13.0] * 6,
+        }
+    )
+
+
+class TestRenderPlotsPng(unittest.TestCase):
+    def setUp(self) -> None:
+        self.plot_fns = {
+            "Cash": plot_cash_position,
+            "Split": partial(plot_revenue_split, embedded=True),
+            "Empty": lambda df: None,
+        }
+        self.renderer = ChartRenderer(processes=0)
+
+    def _render(self, cache: DiskLRUCache, df: pd.DataFrame, **settings) -> dict:
+        return render_plots_png(
+            self.plot_fns, df, cache=cache, renderer=self.renderer, **settings
+        )
+
+    def test_unchanged_data_skips_rendering(self) -> None:
+        with tempfile.TemporaryDirectory() as td, unittest.mock.patch.object(
+            rendering.pio, "to_image", side_effect=lambda fig, **kw: b"png"
+        ) as to_image:
+            cache = DiskLRUCache(Path(td), 2**20, suffix=".png")
+            images = self._render(cache, _df(100.0))
+            self.assertEqual(list(images), ["Cash", "Split"])
+            self.assertEqual(to_image.call_count, 2)
+
+            self.assertEqual(self._render(cache, _df(100.0)), images)
+            self.assertEqual(to_image.call_count, 2)
+
+            self._render(cache, _df(200.0))
+            self.assertEqual(to_image.call_count, 4)
+            self._render(cache, _df(100.0), scale=1)
+            self.assertEqual(to_image.call_count, 6)
+
+    def test_cached_plots_are_not_rebuilt(self) -> None:
+        plot = unittest.mock.Mock(wraps=plot_cash_position, __module__="tests")
+        plot.__qualname__ = "plot"
+        with tempfile.TemporaryDirectory() as td, unittest.mock.patch.object(
+            rendering.pio, "to_image", return_value=b"png"
+        ):
+            cache = DiskLRUCache(Path(td), 2**20, suffix=".png")
+            for _ in range(3):
+                render_plots_png(
+                    {"Cash": plot}, _df(1.0), cache=cache, renderer=self.renderer
+                )
+        plot.assert_called_once()
+
+    def test_plot_sets_render_in_one_batch(self) -> None:
+        dfs = [_df(1.0), _df(2.0), _df(3.0)]
+        with tempfile.TemporaryDirectory() as td, unittest.mock.patch.object(
+            rendering.pio, "to_image", side_effect=lambda fig, **kw: fig.to_json().encode()
+        ):
+            cache = DiskLRUCache(Path(td), 2**20, suffix=".png")
+            with unittest.mock.patch.object(
+                self.renderer, "render_many", wraps=self.renderer.render_many
+            ) as render_many:
+                image_sets = render_plot_sets_png(
+                    self.plot_fns, dfs, cache=cache, renderer=self.renderer
+                )
+            render_many.assert_called_once()
+            self.assertEqual(len(self.renderer.latencies), 6)
+            for df, images in zip(dfs, image_sets, strict=True):
+                self.assertEqual(self._render(None, df), images)
+
+    def test_renderer_reports_latency(self) -> None:
+        figs = [plot_cash_position(_df(float(i))) for i in range(3)]
+        with unittest.mock.patch.object(
+            rendering.pio, "to_image", side_effect=lambda fig, **kw: kw["format"]
+        ) as to_image:
+            pngs = self.renderer.render_many(figs, format="png", scale=2)
+        self.assertEqual(pngs, ["png"] * 3)
+        self.assertEqual(to_image.call_args.kwargs, {"format": "png", "scale": 2})
+        stats = self.renderer.stats()
+        self.assertEqual(stats["images"], 3)
+        self.assertLessEqual(stats["p50_s"], stats["max_s"])
+        self.assertEqual(ChartRenderer(processes=0).stats(), {"images": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import unittest
+import unittest.mock
+
+import numpy as np
+import pydantic
+
+from otai_forecast.config import DEFAULT_ASSUMPTIONS, ROBUST_UNCERTAINTY
+from otai_forecast.models import ASSUMPTION_UPPER_BOUNDS, Assumptions
+from otai_forecast.robust import robust_value, sample_assumption_draws
+
+
+class TestRobust(unittest.TestCase):
+    def test_draws_are_reproducible_and_valid(self) -> None:
+        first = sample_assumption_draws(
+            DEFAULT_ASSUMPTIONS, 8, uncertainty=ROBUST_UNCERTAINTY, seed=3
+        )
+        second = sample_assumption_draws(
+            DEFAULT_ASSUMPTIONS, 8, uncertainty=ROBUST_UNCERTAINTY, seed=3
+        )
+        self.assertEqual(first, second)
+        self.assertEqual(len({a.conv_web_to_lead for a in first}), 8)
+        for a in first:
+            self.assertLessEqual(a.churn_pro, 0.3)
+            self.assertEqual(a.starting_cash, DEFAULT_ASSUMPTIONS.starting_cash)
+
+    def test_draws_clipped_to_validator_caps(self) -> None:
+        capped = [field for field in ASSUMPTION_UPPER_BOUNDS if field != "months"]
+        base = DEFAULT_ASSUMPTIONS.model_copy(
+            update={field: 0.9 * ASSUMPTION_UPPER_BOUNDS[field] for field in capped}
+        )
+        draws = sample_assumption_draws(
+            base, 20, uncertainty=dict.fromkeys(capped, 0.5), seed=1
+        )
+        for field in capped:
+            values = [getattr(a, field) for a in draws]
+            self.assertEqual(max(values), ASSUMPTION_UPPER_BOUNDS[field], field)
+
+    def test_validators_use_each_fields_cap(self) -> None:
+        values = DEFAULT_ASSUMPTIONS.model_dump()
+        with unittest.mock.patch.dict(
+            ASSUMPTION_UPPER_BOUNDS, {"conv_website_lead_to_free": 0.9}
+        ):
+            Assumptions(**{**values, "conv_website_lead_to_free": 0.8})
+            with self.assertRaisesRegex(
+                pydantic.ValidationError, "conv_website_lead_to_free must be <= 0.9"
+            ):
+                Assumptions(**{**values, "conv_website_lead_to_free": 0.95})
+            with self.assertRaisesRegex(
+                pydantic.ValidationError, "conv_free_to_pro must be <= 0.5"
+            ):
+                Assumptions(**{**values, "conv_free_to_pro": 0.8})
+
+    def test_unknown_field_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            sample_assumption_draws(DEFAULT_ASSUMPTIONS, 2, uncertainty={"nope": 0.1})
+
+    def test_robust_value(self) -> None:
+        values = np.arange(1.0, 11.0)
+        self.assertAlmostEqual(robust_value(values, "percentile", 0.5), 5.5)
+        self.assertAlmostEqual(robust_value(values, "cvar", 0.2), 1.5)
+        with self.assertRaises(ValueError):
+            robust_value(values, "mean", 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
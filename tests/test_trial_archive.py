@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import optuna
+
+from otai_forecast.config import (
+    DEFAULT_ASSUMPTIONS,
+    RUN_BASE_DECISION,
+    build_base_decisions,
+)
+from otai_forecast.decision_optimizer import optimize_coarse_to_fine
+from otai_forecast.trial_archive import (
+    TrialArchive,
+    compact_trial_history,
+    load_trial_history,
+    trial_archive_dir,
+)
+
+optuna.logging.set_verbosity(optuna.logging.WARNING)
+
+
+class TestTrialArchive(unittest.TestCase):
+    def test_archive_records_every_trial(self) -> None:
+        a = DEFAULT_ASSUMPTIONS
+        with tempfile.TemporaryDirectory() as td:
+            base_dir = Path(td)
+            with TrialArchive(base_dir, "abc", chunk_size=4) as archive:
+                studies = optimize_coarse_to_fine(
+                    a,
+                    build_base_decisions(a.months, RUN_BASE_DECISION),
+                    stages=[(3, 6), (5, 5)],
+                    n_jobs=1,
+                    callbacks=[archive],
+                )
+            chunks = list(trial_archive_dir(base_dir, "abc").glob("chunk_*.npz"))
+            self.assertEqual(len(chunks), 3)
+
+            history = load_trial_history(base_dir, "abc")
+            self.assertEqual(len(history), 11)
+            self.assertEqual(
+                list(history["study"].unique()), [s.study_name for s in studies]
+            )
+            self.assertEqual(history["ads_knot_0"].notna().sum(), 11)
+            self.assertEqual(history["ads_knot_4"].notna().sum(), 5)
+
+            complete = history[history["state"] == "COMPLETE"]
+            expected = [
+                t.value
+                for s in studies
+                for t in s.trials
+                if t.state == optuna.trial.TrialState.COMPLETE
+            ]
+            self.assertEqual(complete["value"].tolist(), expected)
+            self.assertTrue(history["constraint_cash"].notna().all())
+            self.assertTrue((history["duration_s"] >= 0).all())
+
+            self.assertEqual(compact_trial_history(base_dir, "abc"), 3)
+            self.assertEqual(
+                len(list(trial_archive_dir(base_dir, "abc").glob("chunk_*.npz"))), 1
+            )
+            compacted = load_trial_history(base_dir, "abc")
+            self.assertTrue(compacted.equals(history))
+
+    def test_missing_archive_is_empty(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            history = load_trial_history(Path(td), "missing")
+            self.assertTrue(history.empty)
+            self.assertIn("constraint_liquidity", history.columns)
+
+
+if __name__ == "__main__":
+    unittest.main()